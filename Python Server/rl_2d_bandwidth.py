@@ -0,0 +1,181 @@
+from rl_2d_net import (PKT_SNAPSHOT, SNAPSHOT, SNAPSHOT_PARTIAL, SNAPSHOT_ENTITY, S_TICK, S_ACK, S_TIME,
+                       S_P1, S_P2, S_GK1, S_GK2, S_BALL, S_TIME_LEFT, E_P1, E_P2, E_GK1,
+                       E_GK2, E_BALL, E_ALL)
+
+# --- PER-CLIENT BANDWIDTH BUDGET ---
+# Each client reports (INPUT_FEEDBACK) the newest snapshot it got and how many
+# it has received. From that the server keeps, per client, an RTT estimate,
+# the queueing delay (RTT above the lowest RTT seen) and the snapshot loss.
+# When a link shows loss or a growing queue the client's budget steps down a
+# level; after a while of clean feedback it steps back up.
+#
+# The levels are the budget: each one costs fewer bytes per second than the
+# one above (python rl_2d_bandwidth.py prints them). The first steps thin the
+# detail: the goalkeeper farthest from the client's car first, then the near
+# one, then the opponent go out only in every Nth snapshot, as a
+# PKT_SNAPSHOT_PARTIAL, and the client's SnapshotAssembler extrapolates them
+# in between. The last steps thin the rate too, a snapshot every 2nd and then
+# every 3rd tick, which the jitter buffer covers by interpolating over the
+# gaps. Every snapshot that does go out carries the ball and the client's
+# own car.
+
+# (send every N ticks, then in every N of those snapshots: opponent car, near keeper, far keeper)
+LEVELS = ((1, 1, 1, 1), (1, 1, 1, 2), (1, 1, 2, 4), (1, 2, 4, 8), (2, 1, 2, 4), (3, 1, 2, 4))
+LOSS_HIGH = 0.05        # Step down above this snapshot loss
+LOSS_LOW = 0.01         # ...and only step up below this
+QUEUE_HIGH = 0.030      # Seconds of queueing delay that count as congestion
+QUEUE_LOW = 0.010
+STEP_DOWN_COOLDOWN = 0.5    # Seconds between two step downs (let the queue drain)
+STEP_UP_AFTER = 2.0     # Seconds of clean feedback before stepping up
+LOSS_WINDOW = 0.5       # Seconds per loss measurement
+MIN_RTT_CREEP = 0.002   # Lets the base RTT follow a route that got slower for good
+HISTORY = 256           # Ticks of send times kept for RTT samples
+ENTITY_OFFSETS = (S_P1, S_P2, S_GK1, S_GK2, S_BALL)
+
+
+class LinkBudget:
+    """ Server side estimate of one client's link, and the detail it can take """
+    def __init__(self):
+        self.sent_tick = [-1] * HISTORY
+        self.sent_time = [0.0] * HISTORY
+        self.sent_count = [0] * HISTORY     # Snapshots sent up to and including that tick
+        self.sent = 0
+        self.level = 0
+        self.send_rate = 0.0    # Snapshot bytes per second, measured over LOSS_WINDOW
+        self.rate_start = None
+        self.rate_bytes = 0
+        self.rtt = 0.0
+        self.min_rtt = None
+        self.queue_delay = 0.0
+        self.loss = 0.0
+
+        self.loss_start = None
+        self.loss_sent = 0
+        self.loss_received = 0
+        self.last_step = 0.0
+        self.clean_since = None
+
+    def on_send(self, tick, now, size=0):
+        self.sent += 1
+        if self.rate_start is None: self.rate_start = now
+        elif now - self.rate_start >= LOSS_WINDOW:
+            self.send_rate = self.rate_bytes / (now - self.rate_start)
+            self.rate_start, self.rate_bytes = now, 0
+        self.rate_bytes += size
+        i = tick % HISTORY
+        self.sent_tick[i] = tick
+        self.sent_time[i] = now
+        self.sent_count[i] = self.sent
+
+    def on_feedback(self, tick, received, hold, now):
+        """ Takes one INPUT_FEEDBACK report; returns True if the level changed """
+        i = tick % HISTORY
+        if self.sent_tick[i] != tick: return False     # Too old (or not ours)
+        rtt = now - self.sent_time[i] - hold
+        if rtt < 0: rtt = 0.0
+        self.rtt += (rtt - self.rtt) * 0.2
+        if self.min_rtt is None or rtt < self.min_rtt: self.min_rtt = rtt
+        else: self.min_rtt += MIN_RTT_CREEP * (rtt - self.min_rtt)
+        self.queue_delay += ((rtt - self.min_rtt) - self.queue_delay) * 0.2
+
+        # Loss over the snapshots sent up to the newest one the client has seen
+        sent = self.sent_count[i]
+        if self.loss_start is None:
+            self.loss_start, self.loss_sent, self.loss_received = now, sent, received
+        elif now - self.loss_start >= LOSS_WINDOW:
+            expected = sent - self.loss_sent
+            got = (received - self.loss_received) & 0xFFFF
+            if expected > 0: self.loss = max(0.0, 1.0 - got / expected)
+            self.loss_start, self.loss_sent, self.loss_received = now, sent, received
+        return self._adapt(now)
+
+    def _adapt(self, now):
+        if self.loss > LOSS_HIGH or self.queue_delay > QUEUE_HIGH:
+            self.clean_since = None
+            if self.level < len(LEVELS) - 1 and now - self.last_step >= STEP_DOWN_COOLDOWN:
+                self.level += 1
+                self.last_step = now
+                return True
+        elif self.loss < LOSS_LOW and self.queue_delay < QUEUE_LOW:
+            if self.clean_since is None: self.clean_since = now
+            if self.level > 0 and now - self.clean_since >= STEP_UP_AFTER:
+                self.level -= 1
+                self.last_step = now
+                self.clean_since = now
+                return True
+        else:
+            self.clean_since = None
+        return False
+
+    def entity_mask(self, tick, slot, far_keeper):
+        """ E_* bits to send this tick, 0 to skip the tick; far_keeper is E_GK1 or E_GK2 """
+        if self.level == 0: return E_ALL
+        send_every, opponent_every, near_every, far_every = LEVELS[self.level]
+        if tick % send_every: return 0
+        n = tick // send_every
+        mask = E_BALL | (E_P1 if slot == 1 else E_P2)
+        if n % opponent_every == 0: mask |= E_P2 if slot == 1 else E_P1
+        if n % near_every == 0: mask |= E_GK1 + E_GK2 - far_keeper
+        if n % far_every == 0: mask |= far_keeper
+        return mask
+
+
+def snapshot_size(mask):
+    """ Payload bytes of the snapshot entity_mask asked for """
+    if mask == E_ALL: return SNAPSHOT.size
+    if mask == 0: return 0
+    return SNAPSHOT_PARTIAL.size + SNAPSHOT_ENTITY.size * bin(mask).count('1')
+
+
+class SnapshotAssembler:
+    """ Client side: turns full and partial snapshots into SNAPSHOT-layout tuples """
+    def __init__(self):
+        self.state = [0.0] * (S_TIME_LEFT + 1)
+        self.base = [[0.0] * 4 for _ in ENTITY_OFFSETS]     # Last received (x, y, vx, vy)
+        self.base_tick = [-1] * len(ENTITY_OFFSETS)
+
+    def full(self, snap):
+        """ Remembers a full snapshot as the baseline, returns it unchanged """
+        tick = snap[S_TICK]
+        for k, i in enumerate(ENTITY_OFFSETS):
+            if tick >= self.base_tick[k]:
+                self.base[k][:] = snap[i:i+4]
+                self.base_tick[k] = tick
+        return snap
+
+    def partial(self, buf, nbytes):
+        """ Decodes a PKT_SNAPSHOT_PARTIAL, or None until every entity has a baseline """
+        if nbytes < SNAPSHOT_PARTIAL.size: return None
+        _, tick, ack, server_time, mask, time_left = SNAPSHOT_PARTIAL.unpack_from(buf)
+        state = self.state
+        state[0], state[S_TICK], state[S_ACK], state[S_TIME] = PKT_SNAPSHOT, tick, ack, server_time
+        state[S_TIME_LEFT] = time_left
+        offset = SNAPSHOT_PARTIAL.size
+        bit = 1
+        for k, i in enumerate(ENTITY_OFFSETS):
+            if mask & bit:
+                if nbytes < offset + SNAPSHOT_ENTITY.size: return None
+                state[i], state[i+1], state[i+2], state[i+3] = SNAPSHOT_ENTITY.unpack_from(buf, offset)
+                offset += SNAPSHOT_ENTITY.size
+                if tick >= self.base_tick[k]:
+                    self.base[k][:] = state[i:i+4]
+                    self.base_tick[k] = tick
+            else:
+                if self.base_tick[k] < 0: return None
+                # Not sent this tick: carry the last one forward at its velocity
+                x, y, vx, vy = self.base[k]
+                dt = tick - self.base_tick[k]
+                state[i], state[i+1], state[i+2], state[i+3] = x + vx * dt, y + vy * dt, vx, vy
+            bit <<= 1
+        return tuple(state)
+
+
+if __name__ == "__main__":
+    # Bytes per second for one client at each level. Run: python rl_2d_bandwidth.py
+    budget = LinkBudget()
+    for level in range(len(LEVELS)):
+        budget.level = level
+        masks = [budget.entity_mask(tick, 1, E_GK2) for tick in range(600)]
+        total = sum(snapshot_size(mask) for mask in masks)
+        packets = sum(1 for mask in masks if mask)
+        print(f"[BANDWIDTH] level {level}: {total / 10:.0f} B/s in {packets / 10:.0f} snapshots/s (+ UDP/IP headers)")
@@ -1,13 +1,32 @@
 import pygame
 import socket
-import pickle
 import time
 import math
 import sys
-from rl_2d_game_objects import * # --- NETWORK CONFIGURATION ---
-SERVER_IP = "192.168.18.44"  # Replace with Server IP
+import select
+import threading
+from collections import deque
+from rl_2d_game_objects import *
+from rl_2d_net import *
+from rl_2d_reliable import ReliableChannel
+from rl_2d_netsim import SimulatedSocket
+from rl_2d_prediction import Predictor
+from rl_2d_jitter import SnapshotBuffer
+from rl_2d_clock import ClockSync
+from rl_2d_deadreckon import DeadReckoning
+from rl_2d_netgraph import CountingSocket, NetStats, NetGraph
+from rl_2d_discovery import discover
+from rl_2d_bandwidth import SnapshotAssembler
+
+# --- NETWORK CONFIGURATION ---
+SERVER_IP = None  # None = join the best server on the LAN (rl_2d_discovery), or e.g. "192.168.18.44"
 PORT = 5555
-INTERPOLATION_DELAY = 0.1 
+MATCHMAKER_ADDR = None  # e.g. ("192.168.18.44", 5560) to queue through rl_2d_matchmaker
+GAME_MODE = "SOCCER"    # Mode to queue for (matchmaker only)
+NET_PROFILE = None  # e.g. "WIFI", "4G", "BAD_HOTEL" to simulate a bad link (rl_2d_netsim)
+INPUT_HEARTBEAT = 0.1   # Seconds between input packets while the keys don't change
+INPUT_RATE = 60         # Input frames per second, sampled by the network thread
+NET_GRAPH_KEY = pygame.K_F3  # Toggles the net graph overlay
 
 pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -15,6 +34,7 @@ pygame.display.set_caption("Rocket Soccer Online")
 clock = pygame.time.Clock()
 FONT = pygame.font.SysFont(None, 36)
 BIG_FONT = pygame.font.SysFont(None, 70)
+SMALL_FONT = pygame.font.SysFont(None, 20)
 
 # --- MENU FUNCTION (For Host Only) ---
 def main_menu():
@@ -49,19 +69,124 @@ def main_menu():
 # --- UDP SETUP ---
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 sock.setblocking(False)
+if NET_PROFILE:
+    sock = SimulatedSocket(sock, NET_PROFILE)
+sock = CountingSocket(sock)  # Bandwidth for the net graph
 
-# LOGIC: If Localhost, we assume you are Host (P1) and show Menu
-if SERVER_IP == "127.0.0.1" or SERVER_IP == "localhost":
-    duration = main_menu()
-    # Send Config Packet
-    config_packet = {"config_duration": duration}
-    sock.sendto(pickle.dumps(config_packet), (SERVER_IP, PORT))
-    print(f"Sent config: {duration}s")
-else:
-    # If remote, just join
-    sock.sendto(pickle.dumps({'up':False}), (SERVER_IP, PORT))
+def find_match(duration):
+    """ Queues at the matchmaker until it hands back (server_ip, port, token, slot) """
+    join_packet = MM_JOIN.pack(PKT_MM_JOIN, MODE_IDS.index(GAME_MODE), duration)
+    last_join = 0
+    while True:
+        if time.time() - last_join > 0.5:
+            last_join = time.time()
+            sock.sendto(join_packet, MATCHMAKER_ADDR)
+        try:
+            while True:
+                data, addr = sock.recvfrom(MAX_PACKET)
+                if addr == MATCHMAKER_ADDR and len(data) >= MM_MATCH.size and data[0] == PKT_MM_MATCH:
+                    _, token, slot, _, _, ip, port = MM_MATCH.unpack_from(data)
+                    return socket.inet_ntoa(ip), port, token, slot
+        except (BlockingIOError, ConnectionResetError):
+            pass
+
+        screen.fill((10, 10, 15))
+        txt = FONT.render(f"Searching for a {GAME_MODE} match...", True, WHITE)
+        screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
+        pygame.display.flip()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+        clock.tick(30)
+
+def find_lan_server():
+    """ Repeats LAN discovery until a room with a free slot answers, returns (ip, port) """
+    while True:
+        screen.fill((10, 10, 15))
+        txt = FONT.render("Searching for LAN servers...", True, WHITE)
+        screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
+        pygame.display.flip()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+        servers = discover()
+        for info in servers: print(f"Found {info}")
+        if servers and servers[0].free():
+            return servers[0].ip, servers[0].port
 
-state_buffer = []
+room_token = 0
+requested_slot = 0
+if MATCHMAKER_ADDR:
+    SERVER_IP, PORT, room_token, requested_slot = find_match(main_menu())
+    print(f"Matched: {SERVER_IP}:{PORT} as p{requested_slot}")
+elif SERVER_IP is None:
+    SERVER_IP, PORT = find_lan_server()
+    print(f"Joining {SERVER_IP}:{PORT}")
+
+# Preallocated network buffers (reused every frame, network thread only)
+recv_buf, recv_view = new_buffer()
+send_buf, send_view = new_buffer()
+# Input packet with n changes plus the INPUT_FEEDBACK trailer
+input_views = [send_view[:INPUT.size + n * INPUT_CHANGE.size + INPUT_FEEDBACK.size]
+               for n in range(INPUT_REDUNDANCY + 1)]
+input_frame = 0
+# Last few (frame, mask) key changes, repeated in every input packet
+recent_changes = []
+last_mask = 0
+last_input_send = 0
+# Keys held right now, written by the render loop and sampled by the network thread
+current_mask = 0
+
+# Reliable control channel (config, score, game over)
+channel = ReliableChannel(sock, (SERVER_IP, PORT))
+# Events queued by the render thread, sent by the network thread (owns the channel)
+control_outbox = deque()
+match_score = (0, 0)
+goal_banner_until = 0
+game_over = False
+# Local car prediction, created once the server tells us our slot
+predictor = None
+predicted_state = None  # predictor.render_state(), republished by the network thread
+
+def handle_event(payload):
+    """ Applies a match event received from the server """
+    global match_score, goal_banner_until, game_over, predictor
+    if payload[0] == EVT_WELCOME and len(payload) >= EVENT_WELCOME.size:
+        _, slot, mode_id = EVENT_WELCOME.unpack_from(payload)
+        predictor = Predictor(slot, MODE_IDS[mode_id])
+        dead_reckoning.set_mode(MODE_IDS[mode_id])
+        print(f"Playing as p{slot}")
+    elif payload[0] == EVT_SCORE and len(payload) >= EVENT_SCORE.size:
+        _, red, blue, pause_ticks = EVENT_SCORE.unpack_from(payload)
+        match_score = (red, blue)
+        if pause_ticks: goal_banner_until = time.time() + pause_ticks / 60
+    elif payload[0] == EVT_GAME_OVER and len(payload) >= EVENT_GAME_OVER.size:
+        _, red, blue = EVENT_GAME_OVER.unpack_from(payload)
+        match_score = (red, blue)
+        game_over = True
+
+# Join (repeated every input frame until the first snapshot arrives)
+hello_packet = HELLO.pack(PKT_HELLO, room_token, requested_slot)
+joined = False
+sock.sendto(hello_packet, (SERVER_IP, PORT))
+
+# Raw SNAPSHOT tuples in a tick-indexed ring (see S_* offsets in rl_2d_net).
+# Owned by the render loop; the network thread hands snapshots over through
+# `arrivals` as (snapshot, arrival time). deque append/popleft are atomic, so
+# no lock is needed between the two threads.
+clock_sync = ClockSync()
+state_buffer = SnapshotBuffer(tick_rate=60, clock=clock_sync)
+arrivals = deque(maxlen=256)
+net_stats = NetStats(sock)
+net_graph = NetGraph(net_stats, SMALL_FONT, (10, HEIGHT - 170))
+# Fills in entities the server left out of partial snapshots (rl_2d_bandwidth)
+assembler = SnapshotAssembler()
+# Reported back in every input packet so the server can size our snapshot budget
+snapshots_received = 0
+newest_snapshot_tick = 0
+newest_snapshot_arrival = time.perf_counter()
+# Fills gaps when the buffer runs dry instead of freezing the field
+dead_reckoning = DeadReckoning()
 
 def lerp(start, end, t):
     return start + (end - start) * t
@@ -76,62 +201,154 @@ def draw_car_with_nose(surf, x, y, vx, vy, color):
     ny = int(y + math.sin(ang) * 22)
     pygame.draw.circle(surf, BLACK, (nx, ny), 6)
 
-def get_interpolated_state():
-    render_time = time.time() - INTERPOLATION_DELAY
-    while len(state_buffer) > 2 and state_buffer[1]['time'] < render_time:
-        state_buffer.pop(0)
-    
-    if len(state_buffer) < 2: return None
+def get_interpolated_state(render_tick):
+    sample = state_buffer.sample(render_tick)
+    if sample is None: return None
 
-    prev = state_buffer[0]
-    next_s = state_buffer[1]
-    
-    total_time = next_s['time'] - prev['time']
-    time_passed = render_time - prev['time']
-    t = 0 if total_time == 0 else time_passed / total_time
-    t = max(0, min(1, t))
-
-    # Helper for 4-value tuple interpolation (x, y, vx, vy)
-    def lerp_vec4(v1, v2, t):
-        return (lerp(v1[0], v2[0], t), lerp(v1[1], v2[1], t), 
-                lerp(v1[2], v2[2], t), lerp(v1[3], v2[3], t))
-
-    return {
-        "p1": lerp_vec4(prev['p1'], next_s['p1'], t),
-        "p2": lerp_vec4(prev['p2'], next_s['p2'], t),
-        "gk1": lerp_vec4(prev['gk1'], next_s['gk1'], t),
-        "gk2": lerp_vec4(prev['gk2'], next_s['gk2'], t),
-        "ball": (lerp(prev['ball'][0], next_s['ball'][0], t), lerp(prev['ball'][1], next_s['ball'][1], t)),
-        "score": next_s['score'],
-        "goal_timer": next_s['goal_timer'],
-        "time_left": next_s['time_left']
-    }
+    prev, next_s, t = sample
+    if next_s is None:
+        # Ran past the newest data: extrapolate from its velocities
+        return dead_reckoning.smooth(dead_reckoning.extrapolate(prev, t), True)
+
+    # Helper for 4-value tuple interpolation (x, y, vx, vy) starting at offset i
+    def lerp_vec4(i):
+        return (lerp(prev[i], next_s[i], t), lerp(prev[i+1], next_s[i+1], t),
+                lerp(prev[i+2], next_s[i+2], t), lerp(prev[i+3], next_s[i+3], t))
+
+    return dead_reckoning.smooth({
+        "p1": lerp_vec4(S_P1),
+        "p2": lerp_vec4(S_P2),
+        "gk1": lerp_vec4(S_GK1),
+        "gk2": lerp_vec4(S_GK2),
+        "ball": (lerp(prev[S_BALL], next_s[S_BALL], t), lerp(prev[S_BALL+1], next_s[S_BALL+1], t)),
+        "time_left": next_s[S_TIME_LEFT]
+    }, False)
+
+# --- NETWORK THREAD ---
+# All socket I/O happens here, so a slow flip or a window drag can't delay input
+# sends or let the socket buffer overflow. Inputs are sampled at a fixed
+# INPUT_RATE and the thread sleeps in select() until the next input frame or
+# the next datagram, stamping each arrival as soon as it is read.
+
+def send_input():
+    """ Samples the keys for one input frame, sends on change/heartbeat, predicts """
+    global input_frame, last_mask, last_input_send, predicted_state
+    if not joined: sock.sendto(hello_packet, (SERVER_IP, PORT))
+    mask = current_mask
+    input_frame += 1
+    now = time.perf_counter()
+    if mask != last_mask:
+        last_mask = mask
+        recent_changes.append((input_frame, mask))
+        if len(recent_changes) > INPUT_REDUNDANCY: del recent_changes[0]
+        last_input_send = 0  # Send now
+    if now - last_input_send >= INPUT_HEARTBEAT:
+        last_input_send = now
+        size = pack_input(send_buf, input_frame, recent_changes)
+        hold_ms = min(65535, int((now - newest_snapshot_arrival) * 1000))
+        INPUT_FEEDBACK.pack_into(send_buf, size, newest_snapshot_tick, snapshots_received & 0xFFFF, hold_ms)
+        sock.sendto(input_views[len(recent_changes)], (SERVER_IP, PORT))
+    if predictor:
+        predictor.paused = time.time() < goal_banner_until
+        predictor.apply_input(input_frame, mask)
+        predicted_state = predictor.render_state()
+
+def receive_packets():
+    """ Reads every queued datagram """
+    global joined, predicted_state, snapshots_received, newest_snapshot_tick, newest_snapshot_arrival
+    try:
+        while True:
+            nbytes, _ = sock.recvfrom_into(recv_view)
+            arrival = time.perf_counter()
+            if nbytes == 0: continue
+            kind = recv_buf[0]
+            if kind == PKT_PONG and nbytes >= PONG.size:
+                clock_sync.on_pong(recv_buf, arrival)
+                continue
+            if kind == PKT_RELIABLE or kind == PKT_ACK:
+                for payload in channel.on_packet(recv_buf, nbytes): handle_event(payload)
+                continue
+            if kind == PKT_SNAPSHOT_PARTIAL:
+                snap = assembler.partial(recv_buf, nbytes)
+                if snap is None: continue
+            elif kind == PKT_SNAPSHOT and nbytes >= SNAPSHOT.size:
+                snap = assembler.full(SNAPSHOT.unpack_from(recv_buf))
+            else:
+                continue
+            joined = True
+            snapshots_received += 1
+            if snap[S_TICK] > newest_snapshot_tick:
+                newest_snapshot_tick, newest_snapshot_arrival = snap[S_TICK], arrival
+            net_stats.on_snapshot(snap[S_TICK])
+            if predictor:
+                predictor.reconcile(snap)
+                predicted_state = predictor.render_state()
+            arrivals.append((snap, arrival))
+    except (BlockingIOError, ConnectionResetError):
+        pass
+
+def network_loop():
+    global running
+    interval = 1 / INPUT_RATE
+    next_input = time.perf_counter()
+    while running:
+        now = time.perf_counter()
+        if now >= next_input:
+            send_input()
+            next_input += interval
+            if now - next_input > 0.25: next_input = now + interval  # Stalled, don't burst
+        select.select([sock], [], [], max(0.0, next_input - time.perf_counter()))
+        receive_packets()
+        while control_outbox: channel.send(control_outbox.popleft())
+        channel.update()
+        if channel.dead:
+            print("[NET] Server stopped acking control messages, disconnecting")
+            running = False
+        clock_sync.maybe_ping(sock, (SERVER_IP, PORT))
 
 running = True
+net_thread = threading.Thread(target=network_loop, daemon=True)
+net_thread.start()
+
+# Wait for the server to assign our car
+while predictor is None:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit(); sys.exit()
+    screen.fill((10, 10, 15))
+    txt = FONT.render(f"Joining {SERVER_IP}:{PORT}...", True, WHITE)
+    screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
+    pygame.display.flip()
+    clock.tick(30)
+
+# Whoever gets P1 hosts and picks the duration
+# (matchmade rooms are configured by the matchmaker instead)
+if not MATCHMAKER_ADDR and predictor.slot == 1:
+    duration = main_menu()
+    # Send Config Event (retransmitted by the channel until acked)
+    control_outbox.append(EVENT_CONFIG.pack(EVT_CONFIG, duration))
+    print(f"Sent config: {duration}s")
+
 while running:
     clock.tick(60)
     for event in pygame.event.get():
         if event.type == pygame.QUIT: running = False
+        if event.type == pygame.KEYDOWN and event.key == NET_GRAPH_KEY: net_graph.toggle()
 
-    # 1. SEND INPUTS
+    # 1. INPUT (picked up by the network thread on its next input frame)
     keys = pygame.key.get_pressed()
-    inputs = {
-        'up': keys[pygame.K_w] or keys[pygame.K_UP],
-        'down': keys[pygame.K_s] or keys[pygame.K_DOWN],
-        'left': keys[pygame.K_a] or keys[pygame.K_LEFT],
-        'right': keys[pygame.K_d] or keys[pygame.K_RIGHT],
-        'boost': keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
-    }
-    sock.sendto(pickle.dumps(inputs), (SERVER_IP, PORT))
-
-    # 2. RECEIVE
-    try:
-        while True:
-            data, _ = sock.recvfrom(4096)
-            state_buffer.append(pickle.loads(data))
-            state_buffer.sort(key=lambda x: x['time'])
-    except BlockingIOError:
-        pass
+    mask = 0
+    if keys[pygame.K_w] or keys[pygame.K_UP]: mask |= KEY_UP
+    if keys[pygame.K_s] or keys[pygame.K_DOWN]: mask |= KEY_DOWN
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]: mask |= KEY_LEFT
+    if keys[pygame.K_d] or keys[pygame.K_RIGHT]: mask |= KEY_RIGHT
+    if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]: mask |= KEY_BOOST
+    current_mask = mask
+
+    # 2. TAKE OVER SNAPSHOTS FROM THE NETWORK THREAD
+    while arrivals:
+        snap, arrival = arrivals.popleft()
+        state_buffer.insert(snap, arrival)
 
     # 3. RENDER
     screen.fill((18, 18, 18))
@@ -142,9 +359,13 @@ while running:
     pygame.draw.rect(screen, (200,200,200), (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 2)
     pygame.draw.rect(screen, (200,200,200), (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 2)
 
-    s = get_interpolated_state()
+    render_tick = state_buffer.render_tick(time.perf_counter())
+    s = get_interpolated_state(render_tick)
     
     if s:
+        # Own car comes from local prediction, not the delayed server state
+        if predictor and predicted_state: s['p1' if predictor.slot == 1 else 'p2'] = predicted_state
+
         # Draw Players with Nose (x, y, vx, vy)
         draw_car_with_nose(screen, s['p1'][0], s['p1'][1], s['p1'][2], s['p1'][3], RED)
         draw_car_with_nose(screen, s['p2'][0], s['p2'][1], s['p2'][2], s['p2'][3], BLUE)
@@ -157,17 +378,17 @@ while running:
         pygame.draw.circle(screen, ORANGE, (int(s['ball'][0]), int(s['ball'][1])), 16)
 
         # HUD
-        score_txt = FONT.render(f"{s['score'][0]} - {s['score'][1]}", True, WHITE)
+        score_txt = FONT.render(f"{match_score[0]} - {match_score[1]}", True, WHITE)
         screen.blit(score_txt, (WIDTH//2 - score_txt.get_width()//2, 50))
         
         time_txt = FONT.render(f"Time: {int(s['time_left'])}", True, WHITE)
         screen.blit(time_txt, (WIDTH//2 - time_txt.get_width()//2, 15))
         
-        if s['goal_timer'] > 0:
+        if time.time() < goal_banner_until:
             gm = BIG_FONT.render("GOAL!", True, GREEN)
             screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40))
             
-        if s['time_left'] == 0:
+        if game_over:
              over_txt = BIG_FONT.render("GAME OVER", True, WHITE)
              screen.blit(over_txt, (WIDTH//2 - over_txt.get_width()//2, HEIGHT//2))
 
@@ -175,6 +396,12 @@ while running:
         con_txt = FONT.render("Connecting to Server...", True, WHITE)
         screen.blit(con_txt, (WIDTH//2 - con_txt.get_width()//2, HEIGHT//2))
 
+    # Recorded every frame so the history is there as soon as the graph is opened
+    net_stats.record(clock_sync.last_rtt, state_buffer.jitter, state_buffer.depth(render_tick),
+                     dead_reckoning.extrapolated_ticks / 60)
+    net_graph.draw(screen)
+
     pygame.display.flip()
 
+net_thread.join(1.0)
 pygame.quit()
\ No newline at end of file
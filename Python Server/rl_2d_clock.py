@@ -0,0 +1,112 @@
+import time
+from collections import deque
+from rl_2d_net import PKT_PING, PING, PONG
+
+# --- CLOCK SYNCHRONIZATION ---
+# NTP-style estimate of the server's monotonic timeline (the one ticks live
+# on) from the client's time.perf_counter(), run over the game socket.
+#
+# Each ping/pong gives   offset = server_time - (t_send + t_recv) / 2
+# with an error of at most rtt / 2, so only the lowest-RTT samples are trusted.
+# Drift (the two clocks running at slightly different rates) is the slope of a
+# least-squares fit of those good samples against local time.
+#
+# A pong whose offset is off the published mapping by more than its own
+# rtt / 2 (plus STEP_THRESHOLD) proves the server timeline itself moved
+# (server restart, host suspend). The older samples are dropped, a new fast
+# burst is sent, and the next lock steps once to the new timeline, instead of
+# stepping again every time another new sample enters the window.
+
+SAMPLE_WINDOW = 32      # Pong samples kept
+BEST_FRACTION = 0.25    # Share of lowest-RTT samples used for the estimate
+FAST_PINGS = 8          # Pings sent quickly at connect for a fast first lock
+FAST_INTERVAL = 0.1
+PING_INTERVAL = 0.5
+SYNC_SAMPLES = 4        # Pongs needed before the estimate is published (half the fast burst)
+MAX_SLEW = 0.002        # Max correction of the published offset per update (seconds)
+STEP_THRESHOLD = 0.02   # Errors bigger than this are stepped instead of slewed
+MAX_DRIFT = 100e-6      # Real crystals are within ~100 ppm; a steeper fitted slope is noise
+
+
+class ClockSync:
+    def __init__(self):
+        self.samples = deque(maxlen=SAMPLE_WINDOW)  # (local_mid, offset, rtt)
+        self.seq = 0
+        self.last_ping = 0.0
+        self.fast_pings = FAST_PINGS    # Pings sent quickly up to this seq
+        self.synced = False
+        self.epoch = 0          # Bumped on first sync and on every step, timeline users re-anchor
+
+        # server_time(local) = local + offset + drift * (local - ref_time), published
+        # as one (offset, drift, ref_time) tuple so another thread never reads a mix
+        self.mapping = (0.0, 0.0, 0.0)
+        self.rtt = 0.0          # Best recent round trip (seconds)
+        self.last_rtt = 0.0     # Newest round trip, for display
+
+    def maybe_ping(self, sock, addr, now=None):
+        """ Sends a ping when one is due. Call every frame. """
+        if now is None: now = time.perf_counter()
+        interval = FAST_INTERVAL if self.seq < self.fast_pings else PING_INTERVAL
+        if now - self.last_ping < interval: return
+        self.last_ping = now
+        self.seq += 1
+        try:
+            sock.sendto(PING.pack(PKT_PING, self.seq, now), addr)
+        except (BlockingIOError, ConnectionResetError):
+            pass
+
+    def on_pong(self, buf, now=None):
+        """ Feeds a PKT_PONG datagram """
+        if now is None: now = time.perf_counter()
+        _, _, sent, server_time = PONG.unpack_from(buf)
+        rtt = now - sent
+        if rtt < 0: return
+        self.last_rtt = rtt
+        mid = (sent + now) / 2
+        offset = server_time - mid
+        if self.synced and abs(self.server_time(mid) - mid - offset) > rtt / 2 + STEP_THRESHOLD:
+            # The timeline moved: older samples describe the old one, lock again
+            self.samples.clear()
+            self.synced = False
+            self.fast_pings = self.seq + FAST_PINGS
+        self.samples.append((mid, offset, rtt))
+        self._estimate(now)
+
+    def _estimate(self, now):
+        if len(self.samples) < SYNC_SAMPLES: return
+        ranked = sorted(self.samples, key=lambda s: s[2])
+        best = ranked[:max(2, int(len(ranked) * BEST_FRACTION))]
+        self.rtt = best[0][2]
+
+        # Least-squares line offset = a + b * (local - ref) through the best samples
+        ref = now
+        n = len(best)
+        mean_x = sum(s[0] - ref for s in best) / n
+        mean_y = sum(s[1] for s in best) / n
+        var_x = sum((s[0] - ref - mean_x) ** 2 for s in best)
+        drift = 0.0
+        if n >= 4 and var_x > 1.0:  # Need a few seconds of spread to trust a slope
+            drift = sum((s[0] - ref - mean_x) * (s[1] - mean_y) for s in best) / var_x
+            # Standard error of the slope: on a jittery link it is mostly noise, keep it flat
+            residual = sum((s[1] - mean_y - drift * (s[0] - ref - mean_x)) ** 2 for s in best)
+            if (residual / (n - 2) / var_x) ** 0.5 > MAX_DRIFT / 2: drift = 0.0
+            drift = max(-MAX_DRIFT, min(MAX_DRIFT, drift))
+        target = mean_y - drift * mean_x
+
+        old_offset, old_drift, old_ref = self.mapping
+        current = old_offset + old_drift * (ref - old_ref)
+        if not self.synced or abs(target - current) > STEP_THRESHOLD:
+            # First lock, or far off (e.g. the early samples were all slow): jump
+            offset = target
+            self.epoch += 1
+        else:
+            # Slew instead of jumping so playout never steps backwards visibly
+            offset = current + max(-MAX_SLEW, min(MAX_SLEW, target - current))
+        self.mapping = (offset, drift, ref)
+        self.synced = True
+
+    def server_time(self, local=None):
+        """ Estimated server timeline value at local perf_counter time """
+        if local is None: local = time.perf_counter()
+        offset, drift, ref_time = self.mapping
+        return local + offset + drift * (local - ref_time)
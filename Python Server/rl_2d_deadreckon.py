@@ -0,0 +1,79 @@
+from rl_2d_game_objects import Car, Ball, GAME_MODES
+from rl_2d_net import S_P1, S_P2, S_GK1, S_GK2, S_BALL, S_TIME_LEFT
+
+# --- DEAD RECKONING ---
+# When the jitter buffer runs dry (loss burst, late packets) the newest
+# snapshot is pushed forward with the same physics the server runs instead of
+# freezing the field: cars coast with the mode's car friction and the ball
+# uses Ball.update, so it slows with the mode's ball friction and bounces off
+# the walls (but not through the goal mouths). Extrapolation is capped, after
+# that the last guess is held until data returns.
+#
+# When fresh snapshots come back the guessed position is not snapped away:
+# the difference goes into a per-entity offset that decays over a few frames.
+
+MAX_EXTRAPOLATE_TICKS = 12  # 200 ms at 60 Hz
+BLEND = 0.8                 # Fraction of the correction kept each frame
+SNAP_DISTANCE = 120         # Bigger corrections (kick-off reset) are not blended
+CAR_OFFSETS = (('p1', S_P1), ('p2', S_P2), ('gk1', S_GK1), ('gk2', S_GK2))
+ENTITIES = ('p1', 'p2', 'gk1', 'gk2', 'ball')
+
+
+class DeadReckoning:
+    def __init__(self, mode='SOCCER'):
+        # Scratch objects reused for every extrapolation
+        self.cars = [Car(0, 0, None) for _ in CAR_OFFSETS]
+        self.ball = Ball()
+        self.set_mode(mode)
+
+        self.err = {name: [0.0, 0.0] for name in ENTITIES}
+        self.shown = {name: [0.0, 0.0] for name in ENTITIES}
+        self.extrapolating = False
+        self.extrapolated_ticks = 0.0   # How far past the newest data we are
+
+    def set_mode(self, mode):
+        for car in self.cars: car.friction = GAME_MODES[mode]['car_friction']
+        self.ball.friction = GAME_MODES[mode]['ball_friction']
+
+    def extrapolate(self, snap, ticks):
+        """ State dict for `snap` advanced by `ticks` (fractional, capped) """
+        ticks = max(0.0, min(ticks, MAX_EXTRAPOLATE_TICKS))
+        whole = int(ticks)
+        frac = ticks - whole
+        state = {}
+
+        for car, (name, i) in zip(self.cars, CAR_OFFSETS):
+            car.x, car.y, car.vx, car.vy = snap[i], snap[i+1], snap[i+2], snap[i+3]
+            for _ in range(whole): car.update()
+            state[name] = (car.x + car.vx * frac, car.y + car.vy * frac, car.vx, car.vy)
+
+        ball = self.ball
+        ball.x, ball.y, ball.vx, ball.vy = snap[S_BALL], snap[S_BALL+1], snap[S_BALL+2], snap[S_BALL+3]
+        for _ in range(whole): ball.update()
+        state['ball'] = (ball.x + ball.vx * frac, ball.y + ball.vy * frac)
+        state['time_left'] = snap[S_TIME_LEFT]
+        self.extrapolated_ticks = ticks
+        return state
+
+    def smooth(self, state, extrapolating):
+        """ Applies the decaying correction in place; call once per rendered frame """
+        if self.extrapolating and not extrapolating:
+            # Real data is back: start from where the guess was drawn
+            for name in ENTITIES:
+                err, shown = self.err[name], self.shown[name]
+                err[0] = shown[0] - state[name][0]
+                err[1] = shown[1] - state[name][1]
+                if abs(err[0]) + abs(err[1]) > SNAP_DISTANCE: err[0] = err[1] = 0.0
+        self.extrapolating = extrapolating
+        if not extrapolating: self.extrapolated_ticks = 0.0
+
+        for name in ENTITIES:
+            err, shown = self.err[name], self.shown[name]
+            err[0] *= BLEND
+            err[1] *= BLEND
+            if abs(err[0]) + abs(err[1]) < 0.05: err[0] = err[1] = 0.0
+            pos = state[name]
+            shown[0] = pos[0] + err[0]
+            shown[1] = pos[1] + err[1]
+            if err[0] or err[1]: state[name] = (shown[0], shown[1]) + tuple(pos[2:])
+        return state
@@ -0,0 +1,116 @@
+import select
+import socket
+import time
+from rl_2d_game_objects import MODE_IDS
+from rl_2d_net import *
+
+# --- LAN DISCOVERY ---
+# Finds game servers on the local network so nobody has to type an IP.
+# DISCOVER is broadcast to every game port in DISCOVERY_PORTS (one room per
+# server process); each server answers with its room list and load. The
+# broadcast reply is the first RTT sample, then every candidate is probed
+# directly a few more times and the best (lowest) RTT is kept, so one slow
+# reply doesn't rank a nearby server last.
+#
+# Ranking: rooms with a free slot first, then by RTT plus a penalty for
+# players already in the room and for a busy server tick.
+#
+# List the servers on this network: python rl_2d_discovery.py
+
+DISCOVERY_PORTS = range(5555, 5563)     # Game ports probed
+DISCOVERY_HOSTS = ('<broadcast>', '127.0.0.1')  # Loopback finds a server on this machine
+REPLY_WAIT = 0.3        # Seconds to collect broadcast replies
+PROBES = 3              # RTT samples per server (broadcast reply included)
+PROBE_WAIT = 0.1        # Seconds to collect each round of direct probes
+LOAD_PENALTY_MS = 30    # Ranking cost of a room that is full
+TICK_PENALTY = 2        # Ranking cost per ms of server tick time
+
+
+class ServerInfo:
+    """ One room that answered discovery """
+    def __init__(self, ip, port):
+        self.ip = ip
+        self.port = port
+        self.players = 0
+        self.capacity = 2
+        self.mode = 'SOCCER'
+        self.busy = False
+        self.tick_ms = 0.0
+        self.rtts = []
+
+    @property
+    def rtt(self):
+        return min(self.rtts) if self.rtts else float('inf')
+
+    def free(self):
+        """ Open slots (a running or matchmaker-reserved room has none) """
+        return 0 if self.busy else max(0, self.capacity - self.players)
+
+    def score(self):
+        """ Lower is better, in milliseconds """
+        return (self.rtt * 1000 + LOAD_PENALTY_MS * self.players / max(1, self.capacity)
+                + TICK_PENALTY * self.tick_ms)
+
+    def __repr__(self):
+        return (f"{self.ip}:{self.port} {self.mode} {self.players}/{self.capacity}"
+                f"{' busy' if self.busy else ''} rtt {self.rtt * 1000:.1f} ms tick {self.tick_ms:.2f} ms")
+
+
+def rank(servers):
+    """ Joinable rooms first, then by score """
+    return sorted(servers, key=lambda s: (s.free() == 0, s.score()))
+
+
+def _collect(sock, buf, view, servers, deadline):
+    """ Reads replies until the deadline, adding RTT samples """
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0: return
+        select.select([sock], [], [], remaining)
+        try:
+            while True:
+                nbytes, addr = sock.recvfrom_into(view)
+                arrival = time.perf_counter()
+                if nbytes < DISCOVER_REPLY.size or buf[0] != PKT_DISCOVER_REPLY: continue
+                _, _, sent, count = DISCOVER_REPLY.unpack_from(buf)
+                if nbytes < DISCOVER_REPLY.size + count * ROOM_INFO.size: continue
+                for k in range(count):
+                    port, players, capacity, mode_id, busy, tick_ms = ROOM_INFO.unpack_from(
+                        buf, DISCOVER_REPLY.size + k * ROOM_INFO.size)
+                    info = servers.get((addr[0], port))
+                    if info is None: info = servers[(addr[0], port)] = ServerInfo(addr[0], port)
+                    info.players, info.capacity, info.busy, info.tick_ms = players, capacity, bool(busy), tick_ms
+                    if mode_id < len(MODE_IDS): info.mode = MODE_IDS[mode_id]
+                    info.rtts.append(arrival - sent)
+        except (BlockingIOError, ConnectionResetError):
+            pass
+
+
+def discover(ports=DISCOVERY_PORTS, hosts=DISCOVERY_HOSTS, probes=PROBES):
+    """ Broadcasts for servers, probes their RTT, returns ServerInfo list best first """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.setblocking(False)
+    buf, view = new_buffer()
+    servers = {}    # (ip, port): ServerInfo
+    try:
+        for host in hosts:
+            for port in ports:
+                try:
+                    sock.sendto(DISCOVER.pack(PKT_DISCOVER, 0, time.perf_counter()), (host, port))
+                except OSError:
+                    pass    # No broadcast route (offline machine)
+        _collect(sock, buf, view, servers, time.perf_counter() + REPLY_WAIT)
+        for seq in range(1, probes):
+            for info in list(servers.values()):
+                sock.sendto(DISCOVER.pack(PKT_DISCOVER, seq, time.perf_counter()), (info.ip, info.port))
+            _collect(sock, buf, view, servers, time.perf_counter() + PROBE_WAIT)
+    finally:
+        sock.close()
+    return rank(servers.values())
+
+
+if __name__ == "__main__":
+    found = discover()
+    if not found: print("[DISCOVERY] No servers found")
+    for info in found: print(f"[DISCOVERY] {info}")
@@ -1,5 +1,6 @@
 import math
 import random
+from rl_2d_net import decode_keys
 
 # --- SHARED CONSTANTS ---
 WIDTH, HEIGHT = 1000, 600
@@ -18,6 +19,13 @@ ORANGE = (255,165,0)
 DARK_BLUE = (20, 60, 128)
 DARK_RED = (128, 40, 40)
 
+# Game Modes (physics only, the server has no textures)
+GAME_MODES = {
+    'SOCCER': {'car_friction': 0.985, 'ball_friction': 0.999},
+    'HOCKEY': {'car_friction': 0.995, 'ball_friction': 0.998}
+}
+MODE_IDS = ('SOCCER', 'HOCKEY') # Index is the mode id sent over the wire
+
 def clamp(v, a, b): return max(a, min(b, v))
 
 class Car:
@@ -86,6 +94,7 @@ class Goalkeeper(Car):
 
 class Ball:
     def __init__(self):
+        self.friction = 0.999
         self.reset()
 
     def reset(self):
@@ -97,8 +106,8 @@ class Ball:
         self.radius = 16
 
     def update(self):
-        self.vx *= 0.999
-        self.vy *= 0.999
+        self.vx *= self.friction
+        self.vy *= self.friction
         self.x += self.vx
         self.y += self.vy
 
@@ -141,4 +150,68 @@ def resolve_car_car(c1, c2):
         v1n = c1.vx * nx + c1.vy * ny
         v2n = c2.vx * nx + c2.vy * ny
         c1.vx += (v2n - v1n) * nx * 0.6; c1.vy += (v2n - v1n) * ny * 0.6
-        c2.vx += (v1n - v2n) * nx * 0.6; c2.vy += (v1n - v2n) * ny * 0.6
\ No newline at end of file
+        c2.vx += (v1n - v2n) * nx * 0.6; c2.vy += (v1n - v2n) * ny * 0.6
+
+# --- MATCH SIMULATION ---
+GOAL_PAUSE = 90  # Ticks the field freezes after a goal
+
+class World:
+    """
+    Headless version of the per-frame step in game.run_match: drive, keepers,
+    ball, collisions, goal check and the goal pause. Used by the server and by
+    the peer-to-peer rollback mode so both simulate exactly the same way.
+    """
+    def __init__(self, mode='SOCCER'):
+        self.p1 = Car(200, HEIGHT//2, RED)
+        self.p2 = Car(WIDTH-200, HEIGHT//2, BLUE)
+        self.gk1 = Goalkeeper(50, HEIGHT//2, DARK_RED, 'left')
+        self.gk2 = Goalkeeper(WIDTH-50, HEIGHT//2, DARK_BLUE, 'right')
+        self.ball = Ball()
+        self.all_cars = [self.p1, self.p2, self.gk1, self.gk2]
+        self.score = [0, 0]
+        self.goal_timer = 0
+        self.keys = {}      # Decoded inputs, rewritten in place every step
+        self.apply_mode(mode)
+
+    def apply_mode(self, mode):
+        """ Sets the friction values of a game mode on every object """
+        self.mode = mode
+        for car in self.all_cars: car.friction = GAME_MODES[mode]['car_friction']
+        self.ball.friction = GAME_MODES[mode]['ball_friction']
+
+    def reset_positions(self):
+        self.ball.reset()
+        self.p1.x, self.p1.y = 200, HEIGHT//2; self.p1.vx = self.p1.vy = 0
+        self.p2.x, self.p2.y = WIDTH-200, HEIGHT//2; self.p2.vx = self.p2.vy = 0
+        self.gk1.x, self.gk1.y = 50, HEIGHT//2; self.gk1.vx = self.gk1.vy = 0
+        self.gk2.x, self.gk2.y = WIDTH-50, HEIGHT//2; self.gk2.vx = self.gk2.vy = 0
+
+    def step(self, p1_mask, p2_mask):
+        """ Advances one tick with the players' key masks. Returns True if a goal was scored. """
+        if self.goal_timer:
+            self.goal_timer -= 1
+            if self.goal_timer == 0: self.reset_positions()
+            return False
+
+        self.p1.handle_network_keys(decode_keys(p1_mask, self.keys))
+        self.p2.handle_network_keys(decode_keys(p2_mask, self.keys))
+        self.p1.update(); self.p2.update()
+        ball = self.ball
+        self.gk1.update_ai(ball); self.gk2.update_ai(ball)
+        ball.update()
+
+        # Collisions
+        cars = self.all_cars
+        for car in cars: resolve_car_ball(car, ball)
+        for i in range(len(cars)):
+            for j in range(i + 1, len(cars)):
+                resolve_car_car(cars[i], cars[j])
+
+        # Goal Check
+        if ball.x - ball.radius < 0 and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
+            self.score[1] += 1; self.goal_timer = GOAL_PAUSE
+            return True
+        if ball.x + ball.radius > WIDTH and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
+            self.score[0] += 1; self.goal_timer = GOAL_PAUSE
+            return True
+        return False
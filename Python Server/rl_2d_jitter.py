@@ -0,0 +1,114 @@
+import math
+from rl_2d_net import S_TICK
+
+# --- JITTER BUFFER ---
+# Fixed-capacity ring of snapshots indexed by server tick (slot = tick % size),
+# so insert and lookup are O(1) and bursts can never grow it.
+#
+# Playout runs on the server tick timeline: with a ClockSync the local clock is
+# first mapped onto the server's monotonic time (so wall clock differences and
+# drift between machines don't matter), then the fastest observed transit
+# gives the one-way delay. The playout delay is adapted to sit just above the
+# measured arrival jitter instead of a fixed 100 ms.
+
+BUFFER_SIZE = 64        # Ticks kept (~1 s at 60 Hz)
+MIN_DELAY_TICKS = 1.0   # Never play closer than one tick behind the newest data
+MAX_DELAY_TICKS = 12.0
+JITTER_MARGIN = 2.5     # Delay = interval + JITTER_MARGIN * jitter
+DELAY_SLEW = 0.02       # Max delay change per sample (ticks), avoids visible time warps
+SEARCH_TICKS = 8        # How far to look for a neighbour when ticks were lost
+
+
+class SnapshotBuffer:
+    def __init__(self, tick_rate=60, size=BUFFER_SIZE, clock=None):
+        self.tick_rate = tick_rate
+        self.clock = clock              # Optional ClockSync
+        self.clock_epoch = 0            # clock.epoch the base was learned in
+        self.size = size
+        self.slots = [None] * size
+        self.ticks = [-1] * size
+        self.latest_tick = -1
+
+        # timeline(local) ~= tick / tick_rate + base   (base = fastest transit seen)
+        self.base = None
+        self.last_transit = None
+        self.jitter = 0.0               # Smoothed |transit delta|, seconds
+        self.delay = 3.0                # Current playout delay, ticks
+        self.interval = 1.0             # Smoothed ticks between snapshots (> 1 on a thinned send rate)
+        self.count = 0
+
+    def insert(self, snap, arrival):
+        """ Stores a snapshot tuple received at local time `arrival` """
+        tick = snap[S_TICK]
+        if tick <= self.latest_tick - self.size: return  # Too old to matter
+        i = tick % self.size
+        self.slots[i] = snap
+        self.ticks[i] = tick
+        self.count += 1
+
+        if self.clock and self.clock.epoch != self.clock_epoch:
+            # Switched to (or jumped on) the server timeline, re-learn the base
+            self.clock_epoch = self.clock.epoch
+            self.base = None
+            self.last_transit = None
+        transit = self._timeline(arrival) - tick / self.tick_rate
+        if self.base is None or transit < self.base:
+            self.base = transit
+        else:
+            self.base += 0.00002  # Creep up so a one-off fast packet doesn't pin the base forever
+
+        # RFC 3550 style interarrival jitter
+        if self.last_transit is not None and tick > self.latest_tick:
+            self.jitter += (abs(transit - self.last_transit) - self.jitter) / 16
+        if tick > self.latest_tick:
+            if self.latest_tick >= 0:
+                self.interval += (min(tick - self.latest_tick, SEARCH_TICKS) - self.interval) / 8
+            self.latest_tick = tick
+            self.last_transit = transit
+
+        target = self.interval + JITTER_MARGIN * self.jitter * self.tick_rate
+        target = max(MIN_DELAY_TICKS, min(MAX_DELAY_TICKS, target))
+        self.delay += max(-DELAY_SLEW, min(DELAY_SLEW, target - self.delay))
+
+    def get(self, tick):
+        """ Snapshot for exactly this tick, or None """
+        i = tick % self.size
+        return self.slots[i] if self.ticks[i] == tick else None
+
+    def render_tick(self, now):
+        """ Fractional server tick to display at local time `now` """
+        if self.base is None: return -1.0  # Nothing received yet
+        return (self._timeline(now) - self.base) * self.tick_rate - self.delay
+
+    def _timeline(self, local):
+        return self.clock.server_time(local) if self.clock_epoch else local
+
+    def sample(self, render_tick):
+        """
+        Returns (prev, next, t) around render_tick for interpolation, or None if
+        the buffer holds nothing usable. If render_tick is past the newest data,
+        prev is the newest snapshot, next is None and t is how many ticks past.
+        """
+        if self.latest_tick < 0: return None
+        floor_tick = min(int(math.floor(render_tick)), self.latest_tick)
+
+        prev = None
+        for tick in range(floor_tick, floor_tick - SEARCH_TICKS, -1):
+            prev = self.get(tick)
+            if prev: break
+        if prev is None: return None
+
+        if render_tick >= self.latest_tick:
+            return prev, None, render_tick - prev[S_TICK]
+
+        for tick in range(floor_tick + 1, floor_tick + 1 + SEARCH_TICKS):
+            nxt = self.get(tick)
+            if nxt:
+                span = tick - prev[S_TICK]
+                t = (render_tick - prev[S_TICK]) / span
+                return prev, nxt, max(0.0, min(1.0, t))
+        return prev, None, render_tick - prev[S_TICK]
+
+    def depth(self, render_tick):
+        """ Ticks of buffered data ahead of the playout point """
+        return max(0.0, self.latest_tick - render_tick)
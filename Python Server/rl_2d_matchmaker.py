@@ -0,0 +1,214 @@
+import heapq
+import random
+import select
+import socket
+import time
+from collections import deque
+from rl_2d_game_objects import MODE_IDS
+from rl_2d_net import *
+
+# --- MATCHMAKER CONFIG ---
+MM_IP = "0.0.0.0"
+MM_PORT = 5560
+TICKET_TIMEOUT = 5.0    # Drop queued players who stop re-sending MM_JOIN
+ROOM_TIMEOUT = 3.0      # Forget servers that stop sending ROOM_STATUS
+ASSIGN_RESEND = 0.5     # Re-send ROOM_ASSIGN / MM_MATCH until confirmed
+TICK_BUCKET_MS = 0.25   # Free rooms are re-ranked when their tick time moves to another bucket
+
+# --- QUEUES ---
+# One min-heap per (mode, duration) bucket, ordered by join time, so the
+# longest waiting players are always matched first. Cancelled / timed out
+# tickets are removed lazily: the heap entry stays until it reaches the top.
+#
+# Free rooms live in a second min-heap ordered by average tick time. A room
+# is pushed when it becomes free or its tick time changes bucket, not on
+# every ROOM_STATUS heartbeat; entries whose version no longer matches the
+# room's latest push are stale and skipped on pop. Once stale entries
+# outnumber the rooms the heap is rebuilt, so an idle matchmaker stays small.
+#
+# Join, match and room selection are all O(log n).
+
+
+class Ticket:
+    def __init__(self, addr, bucket, now):
+        self.addr = addr
+        self.bucket = bucket
+        self.joined = now
+        self.last_seen = now
+        self.live = True
+        self.match = None       # MM_MATCH packet once assigned
+
+
+class Room:
+    def __init__(self, addr):
+        self.addr = addr        # Game address clients connect to
+        self.token = 0
+        self.players = 0
+        self.tick_ms = 0.0
+        self.last_seen = 0.0
+        self.version = 0        # Of the room's live free_rooms entry
+        self.queued = None      # Tick bucket of that entry, None when not queued
+        self.pending = None     # (token, ROOM_ASSIGN packet, sent_at) until the room confirms
+
+    def is_free(self):
+        return self.token == 0 and self.players == 0 and self.pending is None
+
+
+class Matchmaker:
+    def __init__(self, sock):
+        self.sock = sock
+        self.queues = {}        # {(mode, duration): [(joined, order, Ticket)]}
+        self.tickets = {}       # {client_addr: Ticket}
+        self.rooms = {}         # {server_addr: Room}
+        self.free_rooms = []    # [(tick_ms, version, server_addr)]
+        self.matched = deque()  # Matched tickets, oldest first, kept to re-send lost MM_MATCH
+        self.order = 0
+
+    # --- PLAYERS ---
+    def on_join(self, addr, mode, duration, now):
+        ticket = self.tickets.get(addr)
+        if ticket and ticket.live and ticket.bucket == (mode, duration):
+            ticket.last_seen = now
+            if ticket.match: self.sock.sendto(ticket.match, addr)  # Our reply was lost
+            return
+        if ticket: ticket.live = False
+        ticket = Ticket(addr, (mode, duration), now)
+        self.tickets[addr] = ticket
+        self.push_waiting(self.queues.setdefault(ticket.bucket, []), ticket)
+        print(f"[QUEUE] {addr} waiting for {MODE_IDS[mode]} {duration}s")
+
+    def push_waiting(self, queue, ticket):
+        self.order += 1  # Tie-breaker, tickets themselves are not comparable
+        heapq.heappush(queue, (ticket.joined, self.order, ticket))
+
+    def pop_waiting(self, queue, now):
+        """ Pops the oldest live ticket of a bucket, or None """
+        while queue:
+            ticket = queue[0][2]
+            if ticket.live and ticket.match is None and now - ticket.last_seen < TICKET_TIMEOUT:
+                return heapq.heappop(queue)[2]
+            heapq.heappop(queue)
+            if ticket.live and ticket.match is None:
+                ticket.live = False
+                self.tickets.pop(ticket.addr, None)
+        return None
+
+    # --- ROOMS ---
+    def on_status(self, addr, port, players, token, tick_ms, now):
+        room_addr = (addr[0], port)
+        room = self.rooms.get(room_addr)
+        if room is None:
+            room = self.rooms[room_addr] = Room(room_addr)
+            print(f"[ROOM] Server {room_addr} registered")
+        room.players = players
+        room.token = token
+        room.tick_ms = tick_ms
+        room.last_seen = now
+        if room.pending and room.pending[0] == token:
+            room.pending = None  # Assignment confirmed
+        if not room.is_free():
+            room.queued = None
+            return
+        bucket = int(tick_ms / TICK_BUCKET_MS)
+        if room.queued == bucket: return  # Heartbeat, already ranked
+        room.version += 1
+        room.queued = bucket
+        heapq.heappush(self.free_rooms, (tick_ms, room.version, room_addr))
+        if len(self.free_rooms) > 2 * len(self.rooms): self.compact_free_rooms()
+
+    def compact_free_rooms(self):
+        """ Drops the stale entries of free_rooms """
+        self.free_rooms = [entry for entry in self.free_rooms if self.is_queued(entry)]
+        heapq.heapify(self.free_rooms)
+
+    def is_queued(self, entry):
+        room = self.rooms.get(entry[2])
+        return room is not None and room.queued is not None and room.version == entry[1]
+
+    def pop_free_room(self, now):
+        """ Pops the least loaded free room, or None """
+        while self.free_rooms:
+            entry = heapq.heappop(self.free_rooms)
+            if not self.is_queued(entry): continue
+            room = self.rooms[entry[2]]
+            room.queued = None
+            if room.is_free() and now - room.last_seen < ROOM_TIMEOUT:
+                return room
+        return None
+
+    # --- MATCHING ---
+    def match(self, now):
+        for (mode, duration), queue in self.queues.items():
+            while len(queue) >= 2:
+                a = self.pop_waiting(queue, now)
+                b = self.pop_waiting(queue, now)
+                if b is None:
+                    if a: self.push_waiting(queue, a)
+                    break
+                room = self.pop_free_room(now)
+                if room is None:
+                    self.push_waiting(queue, a)
+                    self.push_waiting(queue, b)
+                    return  # No capacity anywhere, try again next loop
+                self.assign(room, a, b, mode, duration, now)
+
+    def assign(self, room, a, b, mode, duration, now):
+        token = random.randint(1, 0xFFFFFFFF)
+        packet = ROOM_ASSIGN.pack(PKT_ROOM_ASSIGN, token, mode, duration)
+        room.pending = (token, packet, now)
+        self.sock.sendto(packet, room.addr)
+
+        ip = socket.inet_aton(room.addr[0])
+        for slot, ticket in ((1, a), (2, b)):
+            ticket.match = MM_MATCH.pack(PKT_MM_MATCH, token, slot, mode, duration, ip, room.addr[1])
+            self.sock.sendto(ticket.match, ticket.addr)
+            self.matched.append(ticket)
+        wait = now - min(a.joined, b.joined)
+        print(f"[MATCH] {a.addr} vs {b.addr} -> {room.addr} (waited {wait:.2f}s, tick {room.tick_ms:.2f}ms)")
+
+    def update(self, now):
+        for room_addr, room in list(self.rooms.items()):
+            if now - room.last_seen > ROOM_TIMEOUT:
+                print(f"[ROOM] Server {room_addr} timed out")
+                del self.rooms[room_addr]
+            elif room.pending and now - room.pending[2] > ASSIGN_RESEND:
+                room.pending = (room.pending[0], room.pending[1], now)
+                self.sock.sendto(room.pending[1], room_addr)
+        if len(self.free_rooms) > 2 * len(self.rooms): self.compact_free_rooms()
+        # Matched clients stop sending MM_JOIN once they have their server
+        while self.matched and now - self.matched[0].last_seen > TICKET_TIMEOUT:
+            ticket = self.matched.popleft()
+            ticket.live = False
+            if self.tickets.get(ticket.addr) is ticket: del self.tickets[ticket.addr]
+        self.match(now)
+
+
+def run_matchmaker():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((MM_IP, MM_PORT))
+    sock.setblocking(False)
+    mm = Matchmaker(sock)
+    recv_buf, recv_view = new_buffer()
+    print(f"[MATCHMAKER] Started on Port {MM_PORT}")
+
+    while True:
+        select.select([sock], [], [], 0.1)
+        now = time.monotonic()
+        try:
+            while True:
+                nbytes, addr = sock.recvfrom_into(recv_view)
+                if nbytes == 0: continue
+                kind = recv_buf[0]
+                if kind == PKT_MM_JOIN and nbytes >= MM_JOIN.size:
+                    _, mode, duration = MM_JOIN.unpack_from(recv_buf)
+                    if mode < len(MODE_IDS): mm.on_join(addr, mode, duration, now)
+                elif kind == PKT_ROOM_STATUS and nbytes >= ROOM_STATUS.size:
+                    _, port, players, token, tick_ms = ROOM_STATUS.unpack_from(recv_buf)
+                    mm.on_status(addr, port, players, token, tick_ms, now)
+        except (BlockingIOError, ConnectionResetError):
+            pass
+        mm.update(now)
+
+
+if __name__ == "__main__":
+    run_matchmaker()
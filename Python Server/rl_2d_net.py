@@ -0,0 +1,227 @@
+import struct
+
+# --- WIRE PROTOCOL ---
+# Every datagram starts with a one byte packet type. Layouts are precompiled
+# struct.Struct objects so encode/decode never re-parses a format string, and
+# both sides read/write into preallocated buffers instead of pickling.
+
+PKT_INPUT = 1
+PKT_SNAPSHOT = 3
+PKT_SNAPSHOT_PARTIAL = 17  # Snapshot with only some entities (see rl_2d_bandwidth)
+PKT_RELIABLE = 4    # Control message, see rl_2d_reliable
+PKT_ACK = 5
+PKT_HELLO = 6       # Client -> server: join with a room token
+PKT_PING = 7        # Client -> server: clock sync / RTT probe
+PKT_PONG = 8        # Server -> client: ping echo + server clock
+PKT_P2P_INPUT = 9   # Peer -> peer: input history (see rl_2d_rollback)
+PKT_P2P_HELLO = 14  # Peer -> peer: join / match settings (see rl_2d_p2p)
+# Matchmaking (see rl_2d_matchmaker)
+PKT_MM_JOIN = 10    # Client -> matchmaker: queue me
+PKT_MM_MATCH = 11   # Matchmaker -> client: go to this server with this token
+PKT_ROOM_STATUS = 12  # Server -> matchmaker: heartbeat with load
+PKT_ROOM_ASSIGN = 13  # Matchmaker -> server: host this match
+# LAN discovery (see rl_2d_discovery)
+PKT_DISCOVER = 15   # Client -> broadcast / server: who is hosting? (also the RTT probe)
+PKT_DISCOVER_REPLY = 16  # Server -> client: room list and load
+
+MAX_PACKET = 1024
+
+# Input key bits
+KEY_UP = 1
+KEY_DOWN = 2
+KEY_LEFT = 4
+KEY_RIGHT = 8
+KEY_BOOST = 16
+KEY_BITS = (('up', KEY_UP), ('down', KEY_DOWN), ('left', KEY_LEFT),
+            ('right', KEY_RIGHT), ('boost', KEY_BOOST))
+
+# type, newest client frame, change count -- followed by `count` INPUT_CHANGE
+# entries, oldest first. Inputs are sent when the keys change (plus a low-rate
+# heartbeat), and each packet repeats the last few changes so one lost packet
+# never loses a keypress. The change frame doubles as its sequence number.
+INPUT = struct.Struct('<BIB')
+# frame the mask starts at, key mask
+INPUT_CHANGE = struct.Struct('<IB')
+INPUT_REDUNDANCY = 4    # Changes repeated in every input packet
+# Optional trailer after the changes: newest snapshot tick received, snapshots
+# received (wraps at 65536), ms that snapshot waited before this packet. The
+# server uses it to size each client's snapshot budget; senders without it
+# always get full snapshots.
+INPUT_FEEDBACK = struct.Struct('<IHH')
+# type, tick, input ack (last client frame applied, per client), server time (tick / rate),
+# p1/p2/gk1/gk2/ball (x, y, vx, vy), time_left
+SNAPSHOT = struct.Struct('<BIId' + 'ffff' * 5 + 'f')
+# Patched into a packed snapshot for each client before sending
+SNAPSHOT_ACK = struct.Struct('<I')
+SNAPSHOT_ACK_OFFSET = 5
+# type, tick, input ack, server time, entity mask (E_* bits), time_left -- followed
+# by one SNAPSHOT_ENTITY (x, y, vx, vy) per set bit, in p1/p2/gk1/gk2/ball order
+SNAPSHOT_PARTIAL = struct.Struct('<BIIdBf')
+SNAPSHOT_ENTITY = struct.Struct('<ffff')
+E_P1, E_P2, E_GK1, E_GK2, E_BALL = 1, 2, 4, 8, 16
+E_ALL = 31
+# type, seq, cumulative ack -- followed by an event payload
+RELIABLE = struct.Struct('<BHH')
+# type, cumulative ack
+ACK = struct.Struct('<BH')
+# type, room token (0 = no matchmaker), requested slot (0 = any, 1 = p1, 2 = p2)
+HELLO = struct.Struct('<BIB')
+# type, seq, client send time
+PING = struct.Struct('<BId')
+# type, seq, echoed client send time, server time (monotonic, same timeline as ticks)
+PONG = struct.Struct('<BIdd')
+# type, next frame wanted from the peer (= frames of its input we have),
+# first frame included, count -- followed by `count` key mask bytes
+P2P_INPUT = struct.Struct('<BIIB')
+P2P_MAX_INPUTS = 32
+# type, mode id, duration (the host's values win)
+P2P_HELLO = struct.Struct('<BBH')
+
+# type, mode id, duration
+MM_JOIN = struct.Struct('<BBH')
+# type, room token, slot (1 = p1, 2 = p2), mode id, duration, server ip, server port
+MM_MATCH = struct.Struct('<BIBBH4sH')
+# type, game port, players, room token (0 = free), avg tick time (ms)
+ROOM_STATUS = struct.Struct('<BHBIf')
+# type, room token, mode id, duration
+ROOM_ASSIGN = struct.Struct('<BIBH')
+# type, seq, client send time
+DISCOVER = struct.Struct('<BId')
+# type, seq, echoed client send time, room count -- followed by `count` ROOM_INFO entries
+DISCOVER_REPLY = struct.Struct('<BIdB')
+# game port, players, capacity, mode id, busy (match running or reserved), avg tick time (ms)
+ROOM_INFO = struct.Struct('<HBBBBf')
+
+# Field offsets into an unpacked SNAPSHOT tuple
+S_TICK = 1
+S_ACK = 2
+S_TIME = 3
+S_P1 = 4
+S_P2 = 8
+S_GK1 = 12
+S_GK2 = 16
+S_BALL = 20
+S_TIME_LEFT = 24
+SLOT_OFFSETS = (None, S_P1, S_P2)   # Indexed by slot number
+
+# --- CONTROL EVENTS (sent over the reliable channel) ---
+# One-off match events; the first byte is the event id.
+EVT_CONFIG = 1      # Host -> server: start match
+EVT_SCORE = 2       # Server -> clients: score changed / sync on join
+EVT_GAME_OVER = 3   # Server -> clients: final score
+EVT_WELCOME = 4     # Server -> client: which car you drive
+
+# id, duration (seconds)
+EVENT_CONFIG = struct.Struct('<BH')
+# id, red score (p1), blue score (p2), goal pause (ticks, 0 = plain sync)
+EVENT_SCORE = struct.Struct('<BHHH')
+# id, red score (p1), blue score (p2)
+EVENT_GAME_OVER = struct.Struct('<BHH')
+# id, slot (1 = p1, 2 = p2), mode id
+EVENT_WELCOME = struct.Struct('<BBB')
+
+
+def new_buffer():
+    """ Returns a reusable (bytearray, memoryview) pair for one socket direction """
+    buf = bytearray(MAX_PACKET)
+    return buf, memoryview(buf)
+
+
+def encode_keys(keys):
+    """ Packs an inputs dict ({'up': bool, ...}) into a key bit mask """
+    mask = 0
+    for name, bit in KEY_BITS:
+        if keys.get(name, False): mask |= bit
+    return mask
+
+
+def decode_keys(mask, out):
+    """ Writes a key bit mask into an existing inputs dict (no allocation) """
+    out['up'] = bool(mask & KEY_UP)
+    out['down'] = bool(mask & KEY_DOWN)
+    out['left'] = bool(mask & KEY_LEFT)
+    out['right'] = bool(mask & KEY_RIGHT)
+    out['boost'] = bool(mask & KEY_BOOST)
+    return out
+
+
+def pack_input(buf, frame, changes):
+    """ Encodes an input packet with the (frame, mask) changes list, returns its size """
+    INPUT.pack_into(buf, 0, PKT_INPUT, frame, len(changes))
+    offset = INPUT.size
+    for change_frame, mask in changes:
+        INPUT_CHANGE.pack_into(buf, offset, change_frame, mask)
+        offset += INPUT_CHANGE.size
+    return offset
+
+
+def pack_snapshot(buf, tick, server_time, p1, p2, gk1, gk2, ball, time_left):
+    """ Encodes the world state straight into buf, returns the packet size """
+    SNAPSHOT.pack_into(buf, 0, PKT_SNAPSHOT, tick, 0, server_time,
+                       p1.x, p1.y, p1.vx, p1.vy,
+                       p2.x, p2.y, p2.vx, p2.vy,
+                       gk1.x, gk1.y, gk1.vx, gk1.vy,
+                       gk2.x, gk2.y, gk2.vx, gk2.vy,
+                       ball.x, ball.y, ball.vx, ball.vy, time_left)
+    return SNAPSHOT.size
+
+
+def pack_partial_snapshot(buf, tick, server_time, mask, entities, time_left):
+    """ Encodes the entities whose E_* bit is set in mask, returns the packet size """
+    SNAPSHOT_PARTIAL.pack_into(buf, 0, PKT_SNAPSHOT_PARTIAL, tick, 0, server_time, mask, time_left)
+    offset = SNAPSHOT_PARTIAL.size
+    bit = 1
+    for e in entities:
+        if mask & bit:
+            SNAPSHOT_ENTITY.pack_into(buf, offset, e.x, e.y, e.vx, e.vy)
+            offset += SNAPSHOT_ENTITY.size
+        bit <<= 1
+    return offset
+
+
+if __name__ == "__main__":
+    # Steady state allocation report for the encode/send/receive/decode path.
+    # Run: python rl_2d_net.py
+    import socket
+    import tracemalloc
+    from array import array
+    from rl_2d_game_objects import Car, Goalkeeper, Ball, WIDTH, HEIGHT, RED, BLUE
+
+    TICKS = 5000
+    a = socket.socket(socket.AF_INET, socket.SOCK_DGRAM); a.bind(("127.0.0.1", 0))
+    b = socket.socket(socket.AF_INET, socket.SOCK_DGRAM); b.bind(("127.0.0.1", 0))
+    b_addr = b.getsockname()
+
+    cars = [Car(200, HEIGHT//2, RED), Car(WIDTH-200, HEIGHT//2, BLUE),
+            Goalkeeper(50, HEIGHT//2, RED, 'left'), Goalkeeper(WIDTH-50, HEIGHT//2, BLUE, 'right')]
+    ball = Ball()
+    send_buf, send_view = new_buffer()
+    recv_buf, recv_view = new_buffer()
+    snap_view = send_view[:SNAPSHOT.size]
+
+    def tick(n):
+        pack_snapshot(send_buf, n, 0.0, cars[0], cars[1], cars[2], cars[3], ball, 0.0)
+        a.sendto(snap_view, b_addr)
+        nbytes, _ = b.recvfrom_into(recv_view)
+        return SNAPSHOT.unpack_from(recv_buf)[S_TICK]
+
+    for n in range(100): tick(n)  # warm up
+    # Per tick: peak traced memory above the starting level (short-lived objects
+    # included, e.g. the unpacked snapshot tuple and its floats), and what is
+    # still held afterwards. Interpreter bookkeeping makes both slightly noisy.
+    transient = array('q', bytes(8 * TICKS))  # Preallocated so it isn't counted
+    tracemalloc.start()
+    start_level = tracemalloc.get_traced_memory()[0]
+    for n in range(TICKS):
+        tracemalloc.reset_peak()
+        level = tracemalloc.get_traced_memory()[0]
+        tick(n)
+        transient[n] = tracemalloc.get_traced_memory()[1] - level
+    retained = tracemalloc.get_traced_memory()[0] - start_level
+    tracemalloc.stop()
+
+    transient = sorted(transient)
+    print(f"[NET] {TICKS} ticks, {SNAPSHOT.size} byte snapshots")
+    print(f"[NET] peak allocated per tick: median {transient[TICKS // 2]} B, max {transient[-1]} B"
+          " (mostly the decoded SNAPSHOT tuple, freed right away)")
+    print(f"[NET] retained after run: {retained} B ({retained / TICKS:.3f} B/tick)")
@@ -0,0 +1,186 @@
+import time
+import pygame
+
+# --- NET GRAPH ---
+# Toggleable overlay with the numbers players can screenshot when a remote
+# match feels bad: RTT, snapshot jitter, loss, interpolation buffer depth,
+# extrapolation time and bandwidth in/out.
+#
+# Kept cheap enough to leave on: every metric lives in a preallocated ring,
+# the panel (box, labels, grid) is drawn once into a cached surface, the plot
+# point lists are rewritten in place, and value text is re-rendered only a few
+# times per second.
+
+GRAPH_SAMPLES = 120     # Frames of history (2 s at 60 FPS)
+ROW_HEIGHT = 22
+LABEL_WIDTH = 64
+VALUE_WIDTH = 78
+PLOT_WIDTH = GRAPH_SAMPLES * 2
+TEXT_INTERVAL = 0.25    # Seconds between value text refreshes
+LOSS_WINDOW = 0.5       # Seconds per loss measurement
+RATE_WINDOW = 1.0       # Seconds per bytes/s measurement
+BG_COLOR = (0, 0, 0, 170)
+
+# name, unit format, full-scale value, line color
+METRICS = (
+    ("RTT", "{:.0f} ms", 200.0, (120, 200, 255)),
+    ("Jitter", "{:.1f} ms", 30.0, (255, 220, 120)),
+    ("Loss", "{:.1f} %", 20.0, (255, 110, 110)),
+    ("Buffer", "{:.1f} tk", 12.0, (140, 255, 140)),
+    ("Extrap", "{:.0f} ms", 200.0, (255, 160, 60)),
+    ("In", "{:.1f} KB/s", 20.0, (200, 160, 255)),
+    ("Out", "{:.1f} KB/s", 5.0, (160, 255, 230)),
+)
+
+
+class CountingSocket:
+    """ Socket wrapper that counts datagram bytes in and out """
+    def __init__(self, sock):
+        self.sock = sock
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def sendto(self, data, addr):
+        sent = self.sock.sendto(data, addr)
+        self.bytes_out += len(data)
+        return sent
+
+    def recvfrom_into(self, buf, nbytes=0):
+        result = self.sock.recvfrom_into(buf, nbytes)
+        self.bytes_in += result[0]
+        return result
+
+    def recvfrom(self, bufsize):
+        result = self.sock.recvfrom(bufsize)
+        self.bytes_in += len(result[0])
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+class NetStats:
+    """ Snapshot loss and bandwidth counters plus one ring per metric """
+    def __init__(self, counter=None):
+        self.counter = counter          # CountingSocket, or None for no bandwidth
+        self.rings = [[0.0] * GRAPH_SAMPLES for _ in METRICS]
+        self.current = [0.0] * len(METRICS)
+        self.index = 0
+
+        # Written by the network thread
+        self.snapshots = 0
+        self.newest_tick = -1
+
+        self.loss_start = time.perf_counter()
+        self.loss_snapshots = 0
+        self.loss_tick = -1
+        self.loss = 0.0
+        self.rate_start = self.loss_start
+        self.rate_bytes = (0, 0)
+        self.rate_in = self.rate_out = 0.0
+
+    def on_snapshot(self, tick):
+        """ Counts a received snapshot (network thread) """
+        self.snapshots += 1
+        if tick > self.newest_tick: self.newest_tick = tick
+
+    def record(self, rtt, jitter, depth, extrapolated, now=None):
+        """ Pushes one frame of samples; times in seconds, depth in ticks """
+        if now is None: now = time.perf_counter()
+        if now - self.loss_start >= LOSS_WINDOW:
+            expected = self.newest_tick - self.loss_tick
+            if self.loss_tick >= 0 and expected > 0:
+                received = self.snapshots - self.loss_snapshots
+                self.loss = max(0.0, 1.0 - received / expected) * 100
+            self.loss_start = now
+            self.loss_snapshots = self.snapshots
+            self.loss_tick = self.newest_tick
+        if self.counter and now - self.rate_start >= RATE_WINDOW:
+            span = now - self.rate_start
+            bytes_in, bytes_out = self.counter.bytes_in, self.counter.bytes_out
+            self.rate_in = (bytes_in - self.rate_bytes[0]) / span / 1024
+            self.rate_out = (bytes_out - self.rate_bytes[1]) / span / 1024
+            self.rate_start = now
+            self.rate_bytes = (bytes_in, bytes_out)
+
+        current = self.current
+        current[0] = rtt * 1000
+        current[1] = jitter * 1000
+        current[2] = self.loss
+        current[3] = depth
+        current[4] = extrapolated * 1000
+        current[5] = self.rate_in
+        current[6] = self.rate_out
+        i = self.index
+        for ring, value in zip(self.rings, current): ring[i] = value
+        self.index = (i + 1) % GRAPH_SAMPLES
+
+
+class NetGraph:
+    def __init__(self, stats, font, pos=(10, 10)):
+        self.stats = stats
+        self.font = font
+        self.pos = pos
+        self.visible = False
+        self.background = None
+        self.value_surfs = [None] * len(METRICS)
+        self.last_text = 0.0
+        # One reusable point list per metric, only y values change
+        self.points = [[[pos[0] + LABEL_WIDTH + x * 2, 0] for x in range(GRAPH_SAMPLES)] for _ in METRICS]
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def _build_background(self):
+        width = LABEL_WIDTH + PLOT_WIDTH + VALUE_WIDTH
+        surf = pygame.Surface((width, ROW_HEIGHT * len(METRICS) + 4), pygame.SRCALPHA)
+        surf.fill(BG_COLOR)
+        for row, (name, _, _, color) in enumerate(METRICS):
+            top = 2 + row * ROW_HEIGHT
+            surf.blit(self.font.render(name, True, color), (4, top + 3))
+            pygame.draw.line(surf, (70, 70, 70), (LABEL_WIDTH, top + ROW_HEIGHT - 2),
+                             (LABEL_WIDTH + PLOT_WIDTH, top + ROW_HEIGHT - 2))
+        self.background = surf.convert_alpha()
+
+    def draw(self, surf, now=None):
+        if not self.visible: return
+        if self.background is None: self._build_background()
+        if now is None: now = time.perf_counter()
+        ox, oy = self.pos
+        surf.blit(self.background, self.pos)
+
+        stats = self.stats
+        refresh = now - self.last_text >= TEXT_INTERVAL
+        if refresh: self.last_text = now
+        start = stats.index
+        for row, (name, fmt, scale, color) in enumerate(METRICS):
+            ring, points = stats.rings[row], self.points[row]
+            bottom = oy + 2 + (row + 1) * ROW_HEIGHT - 3
+            height = ROW_HEIGHT - 5
+            for k in range(GRAPH_SAMPLES):
+                value = ring[(start + k) % GRAPH_SAMPLES]
+                points[k][1] = bottom - (height if value >= scale else value / scale * height)
+            pygame.draw.lines(surf, color, False, points)
+            if refresh or self.value_surfs[row] is None:
+                self.value_surfs[row] = self.font.render(fmt.format(stats.current[row]), True, color)
+            surf.blit(self.value_surfs[row], (ox + LABEL_WIDTH + PLOT_WIDTH + 6, bottom - height + 1))
+
+
+if __name__ == "__main__":
+    # Cost of one overlay frame. Run: SDL_VIDEODRIVER=dummy python rl_2d_netgraph.py
+    import random
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 600))
+    stats = NetStats()
+    graph = NetGraph(stats, pygame.font.SysFont(None, 20))
+    graph.toggle()
+    rnd = random.Random(0)
+    FRAMES = 2000
+    total = 0.0
+    for frame in range(FRAMES):
+        stats.on_snapshot(frame)
+        start = time.perf_counter()
+        stats.record(0.04 + rnd.random() * 0.01, 0.003, 2.5, 0.0)
+        graph.draw(screen)
+        total += time.perf_counter() - start
+    print(f"[NETGRAPH] {total / FRAMES * 1000:.3f} ms per frame")
@@ -0,0 +1,189 @@
+import heapq
+import random
+import select
+import socket
+import time
+
+# --- NETWORK CONDITIONS SIMULATOR ---
+# Injects delay, jitter, loss, duplication and reordering so netcode changes
+# can be tested on one machine, repeatably (every profile is seeded).
+#
+# Two ways to use it:
+#   1. In-process: wrap a game socket with SimulatedSocket (see NET_PROFILE in
+#      rl_2d_client.py / rl_2d_server.py). Affects packets that socket sends.
+#   2. Proxy: python rl_2d_netsim.py --profile WIFI --listen 5556 --server 127.0.0.1:5555
+#      then point the client at port 5556. Affects both directions.
+
+NET_PROFILES = {
+    'LAN': {
+        'delay_ms': 1, 'jitter_ms': 0.5, 'loss': 0.0, 'duplicate': 0.0, 'reorder': 0.0
+    },
+    'WIFI': {
+        'delay_ms': 8, 'jitter_ms': 6, 'loss': 0.01, 'duplicate': 0.002, 'reorder': 0.01
+    },
+    '4G': {
+        'delay_ms': 45, 'jitter_ms': 20, 'loss': 0.02, 'duplicate': 0.005, 'reorder': 0.02
+    },
+    'BAD_HOTEL': {
+        'delay_ms': 120, 'jitter_ms': 60, 'loss': 0.08, 'duplicate': 0.02, 'reorder': 0.05
+    }
+}
+
+
+class NetConditions:
+    """ Decides when (and how many times) a packet is delivered """
+    def __init__(self, profile, seed=0):
+        if isinstance(profile, str): profile = NET_PROFILES[profile.upper()]
+        self.delay = profile['delay_ms'] / 1000
+        self.jitter = profile['jitter_ms'] / 1000
+        self.loss = profile['loss']
+        self.duplicate = profile['duplicate']
+        self.reorder = profile['reorder']
+        self.rng = random.Random(seed)
+
+        # Stats
+        self.sent = 0
+        self.dropped = 0
+        self.duplicated = 0
+
+    def delivery_times(self, now):
+        """ Returns the list of delivery times for one packet (empty = lost) """
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return []
+        times = [now + self._latency()]
+        if self.rng.random() < self.duplicate:
+            self.duplicated += 1
+            times.append(now + self._latency())
+        return times
+
+    def _latency(self):
+        latency = self.delay + self.rng.uniform(-self.jitter, self.jitter)
+        # Reordered packets are held back long enough to land behind later ones
+        if self.rng.random() < self.reorder:
+            latency += self.delay + 2 * self.jitter + 0.005
+        return max(0.0, latency)
+
+
+class DelayQueue:
+    """ Min-heap of (deliver_at, order, data, addr) waiting to be sent """
+    def __init__(self):
+        self.heap = []
+        self.order = 0
+
+    def push(self, deliver_at, data, addr):
+        self.order += 1
+        heapq.heappush(self.heap, (deliver_at, self.order, data, addr))
+
+    def pop_due(self, now):
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            yield entry[2], entry[3]
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+
+class SimulatedSocket:
+    """
+    Drop-in wrapper for a UDP socket. Outgoing datagrams are delayed, dropped,
+    duplicated or reordered according to the profile. Delayed packets go out on
+    the next sendto / recvfrom_into call, so the game loop drives it each frame.
+    """
+    def __init__(self, sock, profile, seed=0):
+        self.sock = sock
+        self.conditions = NetConditions(profile, seed)
+        self.queue = DelayQueue()
+
+    def sendto(self, data, addr):
+        now = time.monotonic()
+        for deliver_at in self.conditions.delivery_times(now):
+            self.queue.push(deliver_at, bytes(data), addr)
+        self.flush(now)
+        return len(data)
+
+    def recvfrom_into(self, buf, nbytes=0):
+        self.flush()
+        return self.sock.recvfrom_into(buf, nbytes)
+
+    def recvfrom(self, bufsize):
+        self.flush()
+        return self.sock.recvfrom(bufsize)
+
+    def flush(self, now=None):
+        if now is None: now = time.monotonic()
+        for data, addr in self.queue.pop_due(now):
+            try:
+                self.sock.sendto(data, addr)
+            except (BlockingIOError, ConnectionResetError):
+                pass
+
+    def __getattr__(self, name):
+        # bind, setblocking, settimeout, getsockname, close, fileno ...
+        return getattr(self.sock, name)
+
+
+def run_proxy(listen_port, server_addr, profile, seed=0):
+    """ UDP proxy: clients -> listen_port -> (conditions) -> server, and back """
+    front = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    front.bind(("0.0.0.0", listen_port))
+    front.setblocking(False)
+
+    upstream = NetConditions(profile, seed)
+    downstream = NetConditions(profile, seed + 1)
+    queue = DelayQueue()
+    backs = {}      # {client_addr: socket to server}
+    owners = {}     # {back socket: client_addr}
+
+    print(f"[NETSIM] Port {listen_port} -> {server_addr[0]}:{server_addr[1]} ({profile})")
+    last_report = time.monotonic()
+
+    while True:
+        now = time.monotonic()
+        due = queue.next_due()
+        timeout = 0.05 if due is None else max(0.0, min(0.05, due - now))
+        readable, _, _ = select.select([front] + list(owners), [], [], timeout)
+        now = time.monotonic()
+
+        for s in readable:
+            try:
+                data, addr = s.recvfrom(65535)
+            except (BlockingIOError, ConnectionResetError):
+                continue
+            if s is front:
+                back = backs.get(addr)
+                if back is None:
+                    back = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                    back.setblocking(False)
+                    backs[addr] = back; owners[back] = addr
+                    print(f"[NETSIM] New client {addr}")
+                for deliver_at in upstream.delivery_times(now):
+                    queue.push(deliver_at, data, (back, server_addr))
+            else:
+                for deliver_at in downstream.delivery_times(now):
+                    queue.push(deliver_at, data, (front, owners[s]))
+
+        for data, (out, addr) in queue.pop_due(now):
+            try:
+                out.sendto(data, addr)
+            except (BlockingIOError, ConnectionResetError):
+                pass
+
+        if now - last_report > 5:
+            last_report = now
+            print(f"[NETSIM] up {upstream.sent} sent / {upstream.dropped} lost, "
+                  f"down {downstream.sent} sent / {downstream.dropped} lost")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Local UDP proxy with simulated network conditions")
+    parser.add_argument("--profile", default="WIFI", choices=[p.lower() for p in NET_PROFILES] + list(NET_PROFILES))
+    parser.add_argument("--listen", type=int, default=5556)
+    parser.add_argument("--server", default="127.0.0.1:5555")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    host, port = args.server.rsplit(":", 1)
+    run_proxy(args.listen, (host, int(port)), args.profile.upper(), args.seed)
@@ -0,0 +1,179 @@
+import argparse
+import math
+import socket
+import sys
+import time
+import pygame
+from rl_2d_game_objects import *
+from rl_2d_net import *
+from rl_2d_rollback import RollbackMatch
+
+# --- PEER-TO-PEER 1v1 (ROLLBACK) ---
+# Two players on a LAN, no server: each machine runs the full match through
+# RollbackMatch and the peers only exchange key masks.
+#
+#   Host (red, sets mode/duration): python rl_2d_p2p.py host --mode HOCKEY
+#   Guest (blue):                   python rl_2d_p2p.py join 192.168.18.44
+#
+# Every frame each peer sends all of its inputs the other side has not
+# confirmed yet (P2P_INPUT carries the ack), so lost packets are covered by
+# the next one and nothing needs a separate resend timer.
+
+P2P_PORT = 5570
+FRAME_ADVANTAGE = 2     # Frames ahead of the peer allowed before slowing down
+HELLO_INTERVAL = 0.25
+
+parser = argparse.ArgumentParser(description="Direct 1v1 with rollback netcode")
+parser.add_argument("role", choices=("host", "join"))
+parser.add_argument("address", nargs="?", help="host IP (join only)")
+parser.add_argument("--port", type=int, default=P2P_PORT)
+parser.add_argument("--mode", default="SOCCER", choices=MODE_IDS)
+parser.add_argument("--duration", type=int, default=200)
+args = parser.parse_args()
+if args.role == "join" and not args.address: parser.error("join needs the host address")
+
+pygame.init()
+screen = pygame.display.set_mode((WIDTH, HEIGHT))
+pygame.display.set_caption("Rocket Soccer P2P")
+clock = pygame.time.Clock()
+FONT = pygame.font.SysFont(None, 36)
+BIG_FONT = pygame.font.SysFont(None, 70)
+
+# --- UDP SETUP ---
+sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+sock.bind(("0.0.0.0", args.port if args.role == "host" else 0))
+sock.setblocking(False)
+recv_buf, recv_view = new_buffer()
+send_buf, send_view = new_buffer()
+
+# --- HANDSHAKE ---
+# The guest repeats HELLO until the host answers with its own settings
+peer_addr = (args.address, args.port) if args.role == "join" else None
+mode_id, duration = MODE_IDS.index(args.mode), args.duration
+last_hello = 0
+connected = False
+while not connected:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+    if peer_addr and args.role == "join" and time.time() - last_hello > HELLO_INTERVAL:
+        last_hello = time.time()
+        sock.sendto(P2P_HELLO.pack(PKT_P2P_HELLO, mode_id, duration), peer_addr)
+    try:
+        while True:
+            nbytes, addr = sock.recvfrom_into(recv_view)
+            if nbytes < P2P_HELLO.size or recv_buf[0] != PKT_P2P_HELLO: continue
+            if args.role == "host":
+                peer_addr = addr
+                sock.sendto(P2P_HELLO.pack(PKT_P2P_HELLO, mode_id, duration), addr)
+            else:
+                _, mode_id, duration = P2P_HELLO.unpack_from(recv_buf)
+            connected = True
+    except (BlockingIOError, ConnectionResetError):
+        pass
+
+    screen.fill((10, 10, 15))
+    msg = "Waiting for a guest..." if args.role == "host" else f"Joining {args.address}..."
+    txt = FONT.render(msg, True, WHITE)
+    screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
+    pygame.display.flip()
+    clock.tick(30)
+
+local_slot = 1 if args.role == "host" else 2
+match = RollbackMatch(local_slot, MODE_IDS[mode_id], duration)
+world = match.world
+peer_ack = 0            # Our frames the peer has confirmed
+peer_frames = 0         # Newest frame count the peer has reported
+print(f"[P2P] Playing {MODE_IDS[mode_id]} {duration}s as p{local_slot} against {peer_addr}")
+
+def send_inputs():
+    """ Sends every local input the peer hasn't confirmed (capped at P2P_MAX_INPUTS) """
+    start = max(peer_ack, match.frame - P2P_MAX_INPUTS)
+    count = match.frame - start
+    P2P_INPUT.pack_into(send_buf, 0, PKT_P2P_INPUT, match.remote_frames, start, count)
+    offset = P2P_INPUT.size
+    for frame in range(start, match.frame):
+        send_buf[offset] = match.local_inputs[frame % len(match.local_inputs)]
+        offset += 1
+    sock.sendto(send_view[:offset], peer_addr)
+
+def receive_inputs():
+    global peer_ack, peer_frames
+    try:
+        while True:
+            nbytes, addr = sock.recvfrom_into(recv_view)
+            if addr != peer_addr: continue
+            if recv_buf[0] == PKT_P2P_HELLO and args.role == "host":
+                # Our reply got lost, the guest is still knocking
+                sock.sendto(P2P_HELLO.pack(PKT_P2P_HELLO, mode_id, duration), addr)
+                continue
+            if recv_buf[0] != PKT_P2P_INPUT or nbytes < P2P_INPUT.size: continue
+            _, ack, start, count = P2P_INPUT.unpack_from(recv_buf)
+            if nbytes < P2P_INPUT.size + count: continue
+            if ack > peer_ack: peer_ack = ack
+            if start + count > peer_frames: peer_frames = start + count
+            for k in range(count):
+                match.add_remote_input(start + k, recv_buf[P2P_INPUT.size + k])
+    except (BlockingIOError, ConnectionResetError):
+        pass
+
+def draw_car_with_nose(surf, x, y, vx, vy, color):
+    pygame.draw.circle(surf, color, (int(x), int(y)), 22)
+    if abs(vx) + abs(vy) < 0.5: vx = 1 # Default direction
+    ang = math.atan2(vy, vx)
+    pygame.draw.circle(surf, BLACK, (int(x + math.cos(ang) * 22), int(y + math.sin(ang) * 22)), 6)
+
+# --- MAIN LOOP ---
+running = True
+loops = 0
+while running:
+    clock.tick(60)
+    loops += 1
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT: running = False
+
+    keys = pygame.key.get_pressed()
+    mask = 0
+    if keys[pygame.K_w] or keys[pygame.K_UP]: mask |= KEY_UP
+    if keys[pygame.K_s] or keys[pygame.K_DOWN]: mask |= KEY_DOWN
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]: mask |= KEY_LEFT
+    if keys[pygame.K_d] or keys[pygame.K_RIGHT]: mask |= KEY_RIGHT
+    if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]: mask |= KEY_BOOST
+
+    receive_inputs()
+    # The faster machine idles a frame now and then instead of rolling back constantly
+    ahead = match.frame - peer_frames > FRAME_ADVANTAGE
+    if not (ahead and loops % 4 == 0):
+        match.advance(mask)
+    else:
+        match.rollback()
+    send_inputs()
+
+    # --- RENDER ---
+    screen.fill((18, 18, 18))
+    pygame.draw.rect(screen, (30,120,30), (60,40, WIDTH-120, HEIGHT-80), border_radius=12)
+    pygame.draw.line(screen, WHITE, (WIDTH//2, 60), (WIDTH//2, HEIGHT-60), 3)
+    pygame.draw.rect(screen, (200,200,200), (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 2)
+    pygame.draw.rect(screen, (200,200,200), (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 2)
+
+    for car, color in ((world.p1, RED), (world.p2, BLUE), (world.gk1, DARK_RED), (world.gk2, DARK_BLUE)):
+        draw_car_with_nose(screen, car.x, car.y, car.vx, car.vy, color)
+    pygame.draw.circle(screen, ORANGE, (int(world.ball.x), int(world.ball.y)), 16)
+
+    score_txt = FONT.render(f"{world.score[0]} - {world.score[1]}", True, WHITE)
+    screen.blit(score_txt, (WIDTH//2 - score_txt.get_width()//2, 50))
+    time_txt = FONT.render(f"Time: {int(match.time_left())}", True, WHITE)
+    screen.blit(time_txt, (WIDTH//2 - time_txt.get_width()//2, 15))
+    if world.goal_timer > 0:
+        gm = BIG_FONT.render("GOAL!", True, GREEN)
+        screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40))
+    if match.frame >= match.duration_frames:
+        over_txt = BIG_FONT.render("GAME OVER", True, WHITE)
+        screen.blit(over_txt, (WIDTH//2 - over_txt.get_width()//2, HEIGHT//2))
+    elif not match.can_advance():
+        wait_txt = FONT.render("Waiting for opponent...", True, ORANGE)
+        screen.blit(wait_txt, (WIDTH//2 - wait_txt.get_width()//2, HEIGHT - 40))
+
+    pygame.display.flip()
+
+print(f"[P2P] {match.rollbacks} rollbacks, {match.resimulated} frames re-simulated (max {match.max_resim})")
+pygame.quit()
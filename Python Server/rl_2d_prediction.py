@@ -0,0 +1,71 @@
+from rl_2d_game_objects import Car, WIDTH, HEIGHT, GAME_MODES
+from rl_2d_net import decode_keys, S_TICK, S_ACK, SLOT_OFFSETS
+
+# --- CLIENT-SIDE PREDICTION ---
+# The client simulates its own car locally with the same Car code the server
+# runs, so steering responds on the frame the key is pressed. Every input is
+# remembered by frame number. When a snapshot arrives, the car is reset to the
+# server's authoritative state and every input the server has not applied yet
+# (frame > snapshot ack) is replayed on top.
+#
+# The difference between the old and the re-simulated position is not shown
+# as a snap: it goes into a render offset that decays over a few frames.
+
+HISTORY = 256           # Frames of input kept (~4 s at 60 FPS)
+SMOOTHING = 0.85        # Fraction of the visual error kept each frame
+SNAP_DISTANCE = 120     # Errors bigger than this (kick-off reset) snap instantly
+
+
+class Predictor:
+    def __init__(self, slot, mode='SOCCER'):
+        self.slot = slot
+        self.offset = SLOT_OFFSETS[slot]
+        start_x = 200 if slot == 1 else WIDTH - 200
+        self.car = Car(start_x, HEIGHT//2, None)
+        self.car.friction = GAME_MODES[mode]['car_friction']
+        self.masks = [0] * HISTORY
+        self.keys = {}
+        self.frame = 0
+        self.last_tick = -1
+        self.paused = False     # True while the server freezes play (goal)
+
+        # Visual error still being smoothed out
+        self.err_x = 0.0
+        self.err_y = 0.0
+
+    def apply_input(self, frame, mask):
+        """ Records and simulates one local frame of input """
+        self.frame = frame
+        self.masks[frame % HISTORY] = mask
+        if not self.paused: self._step(mask)
+        self.err_x *= SMOOTHING
+        self.err_y *= SMOOTHING
+
+    def reconcile(self, snap):
+        """ Rewinds to an authoritative snapshot tuple and replays unacked inputs """
+        if snap[S_TICK] <= self.last_tick: return
+        self.last_tick = snap[S_TICK]
+        car = self.car
+        old_x, old_y = car.x, car.y
+
+        i = self.offset
+        car.x, car.y, car.vx, car.vy = snap[i], snap[i+1], snap[i+2], snap[i+3]
+        ack = snap[S_ACK]
+        if not self.paused:
+            first = max(ack + 1, self.frame - HISTORY + 1)
+            for frame in range(first, self.frame + 1):
+                self._step(self.masks[frame % HISTORY])
+
+        self.err_x += old_x - car.x
+        self.err_y += old_y - car.y
+        if abs(self.err_x) + abs(self.err_y) > SNAP_DISTANCE:
+            self.err_x = self.err_y = 0.0
+
+    def render_state(self):
+        """ (x, y, vx, vy) to draw this frame """
+        car = self.car
+        return (car.x + self.err_x, car.y + self.err_y, car.vx, car.vy)
+
+    def _step(self, mask):
+        self.car.handle_network_keys(decode_keys(mask, self.keys))
+        self.car.update()
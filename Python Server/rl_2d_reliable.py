@@ -0,0 +1,111 @@
+import time
+from rl_2d_net import PKT_RELIABLE, PKT_ACK, RELIABLE, ACK
+
+# --- RELIABLE ORDERED CHANNEL ---
+# Small control-message layer multiplexed on the game socket. Each message gets
+# a 16-bit sequence number, is retransmitted until the peer acks it, and is
+# delivered to the application strictly in order. Acks are cumulative ("every
+# seq up to N has arrived") and also piggyback on outgoing reliable packets.
+#
+# A message still unacked after MAX_RESENDS tries means the peer is gone: the
+# channel goes `dead` (nothing more is queued or sent) and its owner drops the
+# peer. Received messages are only held out of order within RECV_WINDOW of
+# the next expected seq, so a gap can't grow the reorder buffer forever.
+
+SEQ_MOD = 1 << 16
+RESEND_TIME = 0.15      # Seconds before an unacked message is sent again
+MAX_RESENDS = 50        # Give up after this many tries (peer is gone)
+RECV_WINDOW = 256       # Messages held from the next expected seq on (that one included)
+
+
+def seq_newer(a, b):
+    """ True if sequence number a comes after b (wraps at 16 bits) """
+    return a != b and ((a - b) % SEQ_MOD) < SEQ_MOD // 2
+
+
+class ReliableChannel:
+    def __init__(self, sock, addr, resend_time=RESEND_TIME):
+        self.sock = sock
+        self.addr = addr
+        self.resend_time = resend_time
+
+        # Outgoing
+        self.next_seq = 0
+        self.pending = {}          # {seq: [packet_bytes, last_send_time, tries]}
+
+        # Incoming
+        self.last_delivered = SEQ_MOD - 1   # Nothing delivered yet
+        self.out_of_order = {}     # {seq: payload}
+        self.ack_dirty = False
+        self.dead = False          # Gave up on a message: the peer stopped acking
+
+    def send(self, payload):
+        """ Queues a message (bytes) for reliable, ordered delivery (dropped once the channel is dead) """
+        if self.dead: return
+        seq = self.next_seq
+        self.next_seq = (seq + 1) % SEQ_MOD
+        packet = RELIABLE.pack(PKT_RELIABLE, seq, self.last_delivered) + payload
+        self.pending[seq] = [packet, time.monotonic(), 0]
+        self._transmit(packet)
+        self.ack_dirty = False  # Piggybacked ack just went out
+
+    def on_packet(self, buf, nbytes):
+        """
+        Feeds a received PKT_RELIABLE / PKT_ACK datagram into the channel.
+        Returns the list of payloads that became deliverable (in order).
+        """
+        kind = buf[0]
+        if kind == PKT_ACK and nbytes >= ACK.size:
+            self._on_ack(ACK.unpack_from(buf)[1])
+            return []
+        if kind != PKT_RELIABLE or nbytes < RELIABLE.size:
+            return []
+
+        _, seq, ack = RELIABLE.unpack_from(buf)
+        self._on_ack(ack)
+        self.ack_dirty = True  # Always re-ack, our previous ack may have been lost
+
+        if not seq_newer(seq, self.last_delivered):
+            return []  # Duplicate
+        if (seq - self.last_delivered) % SEQ_MOD > RECV_WINDOW:
+            return []  # Too far ahead, it will be resent once the gap is filled
+        self.out_of_order[seq] = bytes(buf[RELIABLE.size:nbytes])
+
+        delivered = []
+        nxt = (self.last_delivered + 1) % SEQ_MOD
+        while nxt in self.out_of_order:
+            delivered.append(self.out_of_order.pop(nxt))
+            self.last_delivered = nxt
+            nxt = (nxt + 1) % SEQ_MOD
+        return delivered
+
+    def update(self, now=None):
+        """ Sends pending acks and retransmits expired messages. Call once per tick. """
+        if self.dead: return
+        if now is None: now = time.monotonic()
+        if self.ack_dirty:
+            self._transmit(ACK.pack(PKT_ACK, self.last_delivered))
+            self.ack_dirty = False
+
+        for seq, entry in list(self.pending.items()):
+            if now - entry[1] >= self.resend_time:
+                entry[2] += 1
+                if entry[2] > MAX_RESENDS:
+                    # Later messages can never be delivered past this one
+                    self.dead = True
+                    self.pending.clear()
+                    return
+                entry[1] = now
+                self._transmit(entry[0])
+
+    def _on_ack(self, ack):
+        if not self.pending: return
+        for seq in list(self.pending):
+            if not seq_newer(seq, ack):
+                del self.pending[seq]
+
+    def _transmit(self, packet):
+        try:
+            self.sock.sendto(packet, self.addr)
+        except (BlockingIOError, ConnectionResetError):
+            pass  # Retransmit timer covers it
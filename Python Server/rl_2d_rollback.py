@@ -0,0 +1,137 @@
+from rl_2d_game_objects import World
+
+# --- ROLLBACK SIMULATION ---
+# Deterministic 1v1 match for direct peer-to-peer play (see rl_2d_p2p), built
+# on World.step: the same per-frame step as game.run_match and the server,
+# driven by key masks instead of the keyboard.
+#
+# Each peer simulates immediately with its own input and a *prediction* of the
+# opponent's (their last known keys). When the real input for an old frame
+# arrives and differs from what was predicted, the world is restored to the
+# state saved before that frame and every frame since is simulated again.
+# States are flat float lists in a preallocated ring, so save/restore is just
+# attribute copies. A peer that gets MAX_ROLLBACK frames ahead of the inputs
+# it has from the other side waits instead of predicting further.
+
+MAX_ROLLBACK = 8        # Frames that can be re-simulated
+HISTORY = 128           # Frames of inputs/states kept (must exceed MAX_ROLLBACK)
+STATE_SIZE = 23         # 5 bodies * (x, y, vx, vy) + score, score, goal timer
+
+
+class RollbackMatch:
+    def __init__(self, local_slot, mode='SOCCER', duration=200, max_rollback=MAX_ROLLBACK):
+        self.local_slot = local_slot    # 1 = p1, 2 = p2
+        self.max_rollback = max_rollback
+        self.duration_frames = duration * 60
+
+        self.world = World(mode)
+        self.bodies = self.world.all_cars + [self.world.ball]
+
+        self.frame = 0                  # Next frame to simulate
+        self.states = [[0.0] * STATE_SIZE for _ in range(HISTORY)]  # State before frame f
+        self.local_inputs = [0] * HISTORY
+        self.remote_inputs = [0] * HISTORY
+        self.predicted = [0] * HISTORY  # Remote mask actually used for frame f
+        self.remote_frames = 0          # Remote inputs known for frames < remote_frames
+        self.rollback_from = None       # Oldest frame simulated with a wrong prediction
+
+        # Stats
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_resim = 0
+
+    # --- STATE ---
+    def save(self, out):
+        i = 0
+        for body in self.bodies:
+            out[i] = body.x; out[i+1] = body.y; out[i+2] = body.vx; out[i+3] = body.vy
+            i += 4
+        world = self.world
+        out[20] = world.score[0]; out[21] = world.score[1]; out[22] = world.goal_timer
+
+    def restore(self, state):
+        i = 0
+        for body in self.bodies:
+            body.x = state[i]; body.y = state[i+1]; body.vx = state[i+2]; body.vy = state[i+3]
+            i += 4
+        world = self.world
+        world.score[0] = int(state[20]); world.score[1] = int(state[21]); world.goal_timer = int(state[22])
+
+    # --- INPUTS ---
+    def add_remote_input(self, frame, mask):
+        """ Stores the opponent's mask for a frame; inputs must arrive in frame order """
+        if frame != self.remote_frames: return  # Duplicate, or a gap (resent later)
+        self.remote_inputs[frame % HISTORY] = mask
+        self.remote_frames = frame + 1
+        if frame < self.frame and self.predicted[frame % HISTORY] != mask:
+            if self.rollback_from is None or frame < self.rollback_from:
+                self.rollback_from = frame
+
+    def remote_mask(self, frame):
+        """ Real remote input if known, else the last known one (prediction) """
+        if frame < self.remote_frames: return self.remote_inputs[frame % HISTORY]
+        if self.remote_frames == 0: return 0
+        return self.remote_inputs[(self.remote_frames - 1) % HISTORY]
+
+    def can_advance(self):
+        return self.frame - self.remote_frames < self.max_rollback
+
+    def advance(self, local_mask):
+        """ Simulates the next frame with local_mask; False if waiting for the peer or over """
+        self.rollback()
+        if self.frame >= self.duration_frames or not self.can_advance(): return False
+        self.local_inputs[self.frame % HISTORY] = local_mask
+        self._simulate(self.frame)
+        self.frame += 1
+        return True
+
+    def rollback(self):
+        """ Re-simulates from the oldest mispredicted frame, if any """
+        start = self.rollback_from
+        if start is None: return
+        self.rollback_from = None
+        self.restore(self.states[start % HISTORY])
+        for frame in range(start, self.frame): self._simulate(frame)
+        count = self.frame - start
+        self.rollbacks += 1
+        self.resimulated += count
+        if count > self.max_resim: self.max_resim = count
+
+    def _simulate(self, frame):
+        i = frame % HISTORY
+        self.save(self.states[i])
+        remote = self.remote_mask(frame)
+        self.predicted[i] = remote
+        if self.local_slot == 1: self.world.step(self.local_inputs[i], remote)
+        else: self.world.step(remote, self.local_inputs[i])
+
+    def time_left(self):
+        return max(0.0, (self.duration_frames - self.frame) / 60)
+
+
+if __name__ == "__main__":
+    # Save/restore and re-simulation cost. Run: python rl_2d_rollback.py
+    import time
+    from rl_2d_net import KEY_UP, KEY_RIGHT, KEY_BOOST
+
+    match = RollbackMatch(1)
+    for frame in range(300):
+        match.advance(KEY_RIGHT | (KEY_UP if frame % 40 < 20 else 0))
+        match.add_remote_input(frame, KEY_BOOST | KEY_UP)
+
+    REPEAT = 2000
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        match.save(match.states[0]); match.restore(match.states[0])
+    save_us = (time.perf_counter() - start) / REPEAT * 1e6
+    print(f"[ROLLBACK] save + restore: {save_us:.1f} us")
+
+    for frames in (8, 16, 32):
+        state = [0.0] * STATE_SIZE
+        match.save(state)
+        start = time.perf_counter()
+        for _ in range(REPEAT // 10):
+            match.restore(state)
+            for _ in range(frames): match.world.step(KEY_RIGHT, KEY_UP)
+        ms = (time.perf_counter() - start) / (REPEAT // 10) * 1000
+        print(f"[ROLLBACK] re-simulate {frames} frames: {ms:.3f} ms ({ms / 16.7 * 100:.1f}% of a 60 FPS frame)")
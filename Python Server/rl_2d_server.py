@@ -1,134 +1,304 @@
 import socket
 import time
-import pickle
 import pygame
+from collections import deque
 from rl_2d_game_objects import *
+from rl_2d_net import *
+from rl_2d_reliable import ReliableChannel
+from rl_2d_netsim import SimulatedSocket
+from rl_2d_bandwidth import LinkBudget
 
 # --- SERVER CONFIG ---
 SERVER_IP = "0.0.0.0" 
 PORT = 5555
 FPS = 60
+MAX_CATCHUP = 5     # Ticks simulated in one loop when the server falls behind
+MATCHMAKER_ADDR = None  # e.g. ("192.168.18.44", 5560) to take matches from rl_2d_matchmaker
+ROOM_RESET_DELAY = 10   # Seconds after game over before a matchmade room is freed
+NET_PROFILE = None  # e.g. "WIFI", "4G", "BAD_HOTEL" to simulate a bad link (rl_2d_netsim)
 
 # --- SETUP UDP ---
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 sock.bind((SERVER_IP, PORT))
 sock.setblocking(False)
+if NET_PROFILE:
+    sock = SimulatedSocket(sock, NET_PROFILE)
+
+# Preallocated network buffers (reused every tick)
+recv_buf, recv_view = new_buffer()
+send_buf, send_view = new_buffer()
+snapshot_view = send_view[:SNAPSHOT.size]
+partial_buf, partial_view = new_buffer()
+discover_view = send_view[:DISCOVER_REPLY.size + ROOM_INFO.size]
+pong_view = send_view[:PONG.size]
 
 print(f"[SERVER] Started on Port {PORT}")
 print("[SERVER] Waiting for players...")
 
 # --- GAME INSTANCE ---
-# Player 1 is RED (Host)
-p1 = Car(200, HEIGHT//2, RED)
-# Player 2 is BLUE (Joiner)
-p2 = Car(WIDTH-200, HEIGHT//2, BLUE)
-
-gk1 = Goalkeeper(50, HEIGHT//2, DARK_RED, 'left')
-gk2 = Goalkeeper(WIDTH-50, HEIGHT//2, DARK_BLUE, 'right')
-ball = Ball()
-score = [0, 0]
+# Player 1 is RED (Host), Player 2 is BLUE (Joiner)
+world = World()
+p1, p2, gk1, gk2, ball = world.p1, world.p2, world.gk1, world.gk2, world.ball
+score = world.score
+snapshot_entities = (p1, p2, gk1, gk2, ball)   # E_* bit order
 
-all_cars = [p1, p2, gk1, gk2]
 clients = {} # {address: "p1" or "p2"}
+channels = {} # {address: ReliableChannel} for match events
 p1_addr = None
 p2_addr = None
+# Input per slot: [key mask, newest frame received, frame applied last tick,
+# newest change frame seen]. One frame is applied per tick; the held keys repeat
+# until a change for that frame is due, which is what the client's prediction assumes.
+slot_inputs = {"p1": [0, 0, 0, 0], "p2": [0, 0, 0, 0]}
+# (frame, mask) key changes received but not reached by the applied frame yet
+pending_changes = {"p1": deque(maxlen=32), "p2": deque(maxlen=32)}
+# Snapshot detail each client's link can take (rl_2d_bandwidth)
+budgets = {"p1": LinkBudget(), "p2": LinkBudget()}
 
 clock = pygame.time.Clock()
-goal_timer = 0
+
+# Monotonic server timeline: tick N is simulated at server_time() == N / FPS
+server_epoch = time.perf_counter()
+def server_time():
+    return time.perf_counter() - server_epoch
 
 # Game Config
 game_duration = 200 # Default
 start_time = None
 game_active = False
+game_over_sent = False
+game_over_at = 0
 
-def get_snapshot():
-    """ Creates a packet of the current world state, including VELOCITY for drawing noses """
-    time_left = 0
+# Matchmaking
+room_token = 0      # 0 = open room (first two addresses play)
+room_mode = 'SOCCER'
+last_status = 0
+tick_ms = 0.0       # Smoothed simulation+send cost per tick, reported to the matchmaker
+
+def get_time_left():
+    """ Seconds remaining in the match (full duration until the host starts it) """
     if game_active and start_time:
          elapsed = time.time() - start_time
-         time_left = max(0, game_duration - elapsed)
+         return max(0, game_duration - elapsed)
+    return game_duration # Show default if not started
+
+def apply_mode(mode):
+    """ Switches the room to a game mode """
+    global room_mode
+    room_mode = mode
+    world.apply_mode(mode)
+
+def reset_room():
+    """ Frees a matchmade room for the next match """
+    global p1_addr, p2_addr, room_token, game_active, start_time, game_over_sent
+    clients.clear(); channels.clear()
+    for held in slot_inputs.values(): held[:] = [0, 0, 0, 0]
+    for changes in pending_changes.values(): changes.clear()
+    p1_addr = p2_addr = None
+    room_token = 0
+    game_active = False; start_time = None; game_over_sent = False
+    world.goal_timer = 0
+    score[0] = score[1] = 0
+    world.reset_positions()
+    print("[ROOM] Reset, waiting for matchmaker")
+
+def register_client(addr, slot):
+    """ Gives addr the requested slot (1/2) or the first free one (0) """
+    global p1_addr, p2_addr
+    if p1_addr is None and slot in (0, 1):
+        p1_addr = addr
+        clients[addr] = "p1"
+        print(f"[CONNECT] Player 1 (Host/Red) joined from {addr}")
+    elif p2_addr is None and slot in (0, 2):
+        p2_addr = addr
+        clients[addr] = "p2"
+        print(f"[CONNECT] Player 2 (Joiner/Blue) joined from {addr}")
     else:
-         time_left = game_duration # Show default if not started
-
-    return {
-        "time": time.time(),
-        # We send (x, y, vx, vy) so client can draw the nose
-        "p1": (p1.x, p1.y, p1.vx, p1.vy),
-        "p2": (p2.x, p2.y, p2.vx, p2.vy),
-        "gk1": (gk1.x, gk1.y, gk1.vx, gk1.vy),
-        "gk2": (gk2.x, gk2.y, gk2.vx, gk2.vy),
-        "ball": (ball.x, ball.y),
-        "score": score,
-        "goal_timer": goal_timer,
-        "time_left": time_left
-    }
+        return
+    channels[addr] = ReliableChannel(sock, addr)
+    budgets[clients[addr]] = LinkBudget()
+    channels[addr].send(EVENT_WELCOME.pack(EVT_WELCOME, 1 if clients[addr] == "p1" else 2, MODE_IDS.index(room_mode)))
+    # Late joiners still need the current score
+    channels[addr].send(EVENT_SCORE.pack(EVT_SCORE, score[0], score[1], 0))
+
+def drop_client(addr):
+    """ Frees the slot of a client whose reliable channel gave up (it stopped acking) """
+    global p1_addr, p2_addr
+    player_id = clients.pop(addr)
+    del channels[addr]
+    if addr == p1_addr: p1_addr = None
+    if addr == p2_addr: p2_addr = None
+    slot_inputs[player_id][:] = [0, 0, 0, 0]
+    pending_changes[player_id].clear()
+    print(f"[DISCONNECT] {player_id} at {addr} stopped responding")
+
+def broadcast_event(payload):
+    """ Sends a one-off match event reliably to every connected client """
+    for channel in channels.values(): channel.send(payload)
+
+def handle_event(addr, payload):
+    """ Applies a control event received over a client's reliable channel """
+    global game_duration, start_time, game_active, game_over_sent
+    # Handle CONFIG event (From Host Menu)
+    if payload[0] == EVT_CONFIG and len(payload) >= EVENT_CONFIG.size and clients.get(addr) == "p1":
+        game_duration = EVENT_CONFIG.unpack_from(payload)[1]
+        start_time = time.time()
+        game_active = True
+        game_over_sent = False
+        print(f"[GAME START] Duration set to {game_duration}s")
+
+def simulate_tick():
+    """ Advances the match by one fixed step (1 / FPS) """
+    # We allow movement always, but timer logic depends on game_active
+
+    # Advance each player's input stream by one frame and apply due key changes
+    for player_id, held in slot_inputs.items():
+        held[2] = max(held[2] + 1, held[1]) if held[1] else 0
+        changes = pending_changes[player_id]
+        while changes and changes[0][0] <= held[2]:
+            held[0] = changes.popleft()[1]
+
+    if world.step(slot_inputs["p1"][0], slot_inputs["p2"][0]):
+        broadcast_event(EVENT_SCORE.pack(EVT_SCORE, score[0], score[1], world.goal_timer))
 
 # --- MAIN LOOP ---
+tick = 0
 while True:
     dt = clock.tick(FPS)
+    tick_start = time.perf_counter()
 
     # 1. RECEIVE INPUTS
     try:
         while True:
-            data, addr = sock.recvfrom(1024)
-            inputs = pickle.loads(data)
+            nbytes, addr = sock.recvfrom_into(recv_view)
+            if nbytes == 0: continue
+            kind = recv_buf[0]
+
+            # Clock sync: echo with our timeline (answered for anyone, also used as RTT probe)
+            if kind == PKT_PING and nbytes >= PING.size:
+                _, seq, client_time = PING.unpack_from(recv_buf)
+                PONG.pack_into(send_buf, 0, PKT_PONG, seq, client_time, server_time())
+                sock.sendto(pong_view, addr)
+                continue
+
+            # LAN discovery: describe this room (answered for anyone, before registration)
+            if kind == PKT_DISCOVER and nbytes >= DISCOVER.size:
+                _, seq, client_time = DISCOVER.unpack_from(recv_buf)
+                busy = game_active or room_token != 0
+                DISCOVER_REPLY.pack_into(send_buf, 0, PKT_DISCOVER_REPLY, seq, client_time, 1)
+                ROOM_INFO.pack_into(send_buf, DISCOVER_REPLY.size, PORT, len(clients), 2,
+                                    MODE_IDS.index(room_mode), busy, tick_ms)
+                sock.sendto(discover_view, addr)
+                continue
+
+            # Match assignment from the matchmaker
+            if kind == PKT_ROOM_ASSIGN and addr == MATCHMAKER_ADDR and nbytes >= ROOM_ASSIGN.size:
+                _, token, mode_id, duration = ROOM_ASSIGN.unpack_from(recv_buf)
+                if room_token == 0 and not clients:
+                    room_token = token
+                    game_duration = duration
+                    apply_mode(MODE_IDS[mode_id])
+                    print(f"[ROOM] Assigned {MODE_IDS[mode_id]} {duration}s match")
+                last_status = 0  # Confirm right away
+                continue
 
             # Registration Logic
             if addr not in clients:
-                if p1_addr is None:
-                    p1_addr = addr
-                    clients[addr] = "p1"
-                    print(f"[CONNECT] Player 1 (Host/Red) joined from {addr}")
-                elif p2_addr is None:
-                    p2_addr = addr
-                    clients[addr] = "p2"
-                    print(f"[CONNECT] Player 2 (Joiner/Blue) joined from {addr}")
-
-            # Handle CONFIG packet (From Host Menu)
-            if "config_duration" in inputs:
-                game_duration = inputs["config_duration"]
-                start_time = time.time()
-                game_active = True
-                print(f"[GAME START] Duration set to {game_duration}s")
-                continue # Skip physics this frame
+                if kind == PKT_HELLO and nbytes >= HELLO.size:
+                    _, token, slot = HELLO.unpack_from(recv_buf)
+                    if token == room_token: register_client(addr, slot)
+                elif room_token == 0:
+                    register_client(addr, 0)
+                if room_token and p1_addr and p2_addr and not game_active:
+                    start_time = time.time()
+                    game_active = True
+                    print(f"[GAME START] Matchmade, duration {game_duration}s")
+
+            # Control channel (config, acks)
+            if kind == PKT_RELIABLE or kind == PKT_ACK:
+                channel = channels.get(addr)
+                if channel:
+                    for payload in channel.on_packet(recv_buf, nbytes):
+                        handle_event(addr, payload)
+                continue
             
             # Apply Inputs
+            if kind != PKT_INPUT or nbytes < INPUT.size: continue
             player_id = clients.get(addr)
-            if player_id == "p1": p1.handle_network_keys(inputs)
-            elif player_id == "p2": p2.handle_network_keys(inputs)
+            if player_id is None: continue
+            _, frame, count = INPUT.unpack_from(recv_buf)
+            if count > INPUT_REDUNDANCY or nbytes < INPUT.size + count * INPUT_CHANGE.size: continue
+            held = slot_inputs[player_id]
+            if frame > held[1]: held[1] = frame
+            # Redundant copies of changes we already have are skipped by frame number
+            offset = INPUT.size
+            for _ in range(count):
+                change_frame, mask = INPUT_CHANGE.unpack_from(recv_buf, offset)
+                offset += INPUT_CHANGE.size
+                if change_frame > held[3]:
+                    held[3] = change_frame
+                    pending_changes[player_id].append((change_frame, mask))
+            if nbytes >= offset + INPUT_FEEDBACK.size:
+                snap_tick, received, hold_ms = INPUT_FEEDBACK.unpack_from(recv_buf, offset)
+                budget = budgets[player_id]
+                if budget.on_feedback(snap_tick, received, hold_ms / 1000, time.perf_counter()):
+                    print(f"[BANDWIDTH] {player_id} -> level {budget.level} (loss {budget.loss * 100:.1f} %, "
+                          f"queue {budget.queue_delay * 1000:.0f} ms, rtt {budget.rtt * 1000:.0f} ms, "
+                          f"sending {budget.send_rate:.0f} B/s)")
 
-    except BlockingIOError:
+    except (BlockingIOError, ConnectionResetError):
         pass
 
-    # 2. UPDATE PHYSICS (Only if game started, or just allow warm up)
-    # We allow movement always, but timer logic depends on game_active
-    
-    if goal_timer == 0:
-        p1.update(); p2.update()
-        gk1.update_ai(ball); gk2.update_ai(ball)
-        ball.update()
-
-        # Collisions
-        for car in all_cars: resolve_car_ball(car, ball)
-        for i in range(len(all_cars)):
-            for j in range(i + 1, len(all_cars)):
-                resolve_car_car(all_cars[i], all_cars[j])
-
-        # Goal Check
-        if ball.x - ball.radius < 0 and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
-            score[1] += 1; goal_timer = 90
-        elif ball.x + ball.radius > WIDTH and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
-            score[0] += 1; goal_timer = 90
-    else:
-        goal_timer -= 1
-        if goal_timer == 0:
-            ball.reset()
-            p1.x, p1.y = 200, HEIGHT//2; p1.vx=p1.vy=0
-            p2.x, p2.y = WIDTH-200, HEIGHT//2; p2.vx=p2.vy=0
-            gk1.x, gk1.y = 50, HEIGHT//2; gk1.vx=gk1.vy=0
-            gk2.x, gk2.y = WIDTH-50, HEIGHT//2; gk2.vx=gk2.vy=0
+    # 2. UPDATE PHYSICS (fixed step, catches up if a loop ran late)
+    target_tick = int(server_time() * FPS)
+    steps = 0
+    while tick < target_tick and steps < MAX_CATCHUP:
+        tick += 1; steps += 1
+        simulate_tick()
+    tick = max(tick, target_tick)  # Too far behind: skip time rather than spiral
+
+    time_left = get_time_left()
+    if game_active and time_left == 0 and not game_over_sent:
+        game_over_sent = True
+        game_over_at = time.time()
+        broadcast_event(EVENT_GAME_OVER.pack(EVT_GAME_OVER, score[0], score[1]))
+        print(f"[GAME OVER] Final score {score[0]} - {score[1]}")
 
     # 3. BROADCAST STATE
-    snapshot = pickle.dumps(get_snapshot())
-    if p1_addr: sock.sendto(snapshot, p1_addr)
-    if p2_addr: sock.sendto(snapshot, p2_addr)
\ No newline at end of file
+    # Events/acks/retransmits first, then the per-tick snapshot
+    for addr, channel in list(channels.items()):
+        channel.update()
+        if channel.dead: drop_client(addr)
+
+    # Only when a tick was simulated; the loop runs slightly faster than FPS
+    if steps:
+        # Full snapshot packed once into the reusable send buffer; clients on a
+        # reduced budget get a partial one instead (ball and own car in each),
+        # or on the lowest levels nothing on some ticks
+        pack_snapshot(send_buf, tick, tick / FPS, p1, p2, gk1, gk2, ball, time_left)
+        now = time.perf_counter()
+        for slot, addr, car in ((1, p1_addr, p1), (2, p2_addr, p2)):
+            if addr is None: continue
+            player_id = "p1" if slot == 1 else "p2"
+            budget = budgets[player_id]
+            far_keeper = E_GK1 if abs(car.x - gk1.x) > abs(car.x - gk2.x) else E_GK2
+            mask = budget.entity_mask(tick, slot, far_keeper)
+            if not mask: continue
+            if mask == E_ALL:
+                # Only the input ack differs per client
+                SNAPSHOT_ACK.pack_into(send_buf, SNAPSHOT_ACK_OFFSET, slot_inputs[player_id][2])
+                sock.sendto(snapshot_view, addr)
+                size = SNAPSHOT.size
+            else:
+                size = pack_partial_snapshot(partial_buf, tick, tick / FPS, mask, snapshot_entities, time_left)
+                SNAPSHOT_ACK.pack_into(partial_buf, SNAPSHOT_ACK_OFFSET, slot_inputs[player_id][2])
+                sock.sendto(partial_view[:size], addr)
+            budget.on_send(tick, now, size)
+
+    # 4. MATCHMAKER HEARTBEAT
+    if room_token and game_over_sent and time.time() - game_over_at > ROOM_RESET_DELAY:
+        reset_room()
+    tick_ms += ((time.perf_counter() - tick_start) * 1000 - tick_ms) * 0.05
+    if MATCHMAKER_ADDR and time.time() - last_status > 1.0:
+        last_status = time.time()
+        sock.sendto(ROOM_STATUS.pack(PKT_ROOM_STATUS, PORT, len(clients), room_token, tick_ms), MATCHMAKER_ADDR)
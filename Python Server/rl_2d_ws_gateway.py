@@ -0,0 +1,134 @@
+import asyncio
+from rl_2d_net import PKT_SNAPSHOT
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# --- WEBSOCKET <-> UDP GATEWAY ---
+# Browsers (the pygbag build) cannot open UDP sockets. Each WebSocket client
+# gets its own UDP socket towards the match server, and datagrams are relayed
+# unchanged as binary frames, so the browser speaks the normal rl_2d_net
+# protocol (HELLO, INPUT, RELIABLE/ACK, SNAPSHOT).
+#
+# Snapshots are coalesced: only the newest one waits in a per-connection slot,
+# so a slow browser skips stale states instead of building a backlog.
+# Reliable/ack packets are never dropped and go out in order.
+#
+# Requires: pip install websockets
+
+GATEWAY_HOST = "0.0.0.0"
+GATEWAY_PORT = 8765
+SERVER_ADDR = ("127.0.0.1", 5555)
+MAX_CONTROL_QUEUE = 256     # Control packets are small and rare; this is a safety cap
+
+
+class UdpLink(asyncio.DatagramProtocol):
+    """ UDP side of one browser connection """
+    def __init__(self, relay):
+        self.relay = relay
+
+    def datagram_received(self, data, addr):
+        self.relay.from_server(data)
+
+
+class Relay:
+    """ Moves datagrams between one WebSocket and the match server """
+    def __init__(self, ws):
+        self.ws = ws
+        self.transport = None
+        self.latest_snapshot = None
+        self.control = asyncio.Queue(MAX_CONTROL_QUEUE)
+        self.wakeup = asyncio.Event()
+        self.dropped_snapshots = 0
+
+    def from_server(self, data):
+        if data and data[0] == PKT_SNAPSHOT:
+            if self.latest_snapshot is not None: self.dropped_snapshots += 1
+            self.latest_snapshot = data   # Coalesce to the newest state
+        else:
+            try:
+                self.control.put_nowait(data)
+            except asyncio.QueueFull:
+                pass  # Reliable layer will retransmit
+        self.wakeup.set()
+
+    async def pump_to_browser(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            while not self.control.empty():
+                await self.ws.send(self.control.get_nowait())
+            snapshot, self.latest_snapshot = self.latest_snapshot, None
+            if snapshot is not None:
+                await self.ws.send(snapshot)
+
+    async def pump_to_server(self):
+        async for message in self.ws:
+            if isinstance(message, (bytes, bytearray)):
+                self.transport.sendto(message)
+
+
+async def handle_browser(ws, server_addr=SERVER_ADDR):
+    loop = asyncio.get_running_loop()
+    relay = Relay(ws)
+    relay.transport, _ = await loop.create_datagram_endpoint(
+        lambda: UdpLink(relay), remote_addr=server_addr)
+    peer = getattr(ws, "remote_address", None)
+    print(f"[GATEWAY] Browser {peer} connected")
+
+    sender = asyncio.ensure_future(relay.pump_to_browser())
+    try:
+        await relay.pump_to_server()
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        sender.cancel()
+        relay.transport.close()
+        print(f"[GATEWAY] Browser {peer} left ({relay.dropped_snapshots} stale snapshots skipped)")
+
+
+async def run_gateway(host=GATEWAY_HOST, port=GATEWAY_PORT, server_addr=SERVER_ADDR):
+    async with websockets.serve(lambda ws, *_: handle_browser(ws, server_addr), host, port,
+                                compression=None, max_queue=64):
+        print(f"[GATEWAY] ws://{host}:{port} -> udp {server_addr[0]}:{server_addr[1]}")
+        await asyncio.Future()
+
+
+async def probe(url, seconds=5.0):
+    """ Browser stand-in: joins through the gateway and reports snapshot rate """
+    from rl_2d_net import HELLO, INPUT, PKT_HELLO, PKT_INPUT
+    async with websockets.connect(url, compression=None) as ws:
+        await ws.send(HELLO.pack(PKT_HELLO, 0, 0))
+        loop = asyncio.get_running_loop()
+        end = loop.time() + seconds
+        snapshots = other = frame = 0
+        while loop.time() < end:
+            frame += 1
+            await ws.send(INPUT.pack(PKT_INPUT, frame, 0))
+            try:
+                while True:
+                    message = await asyncio.wait_for(ws.recv(), 1 / 60)
+                    if message[0] == PKT_SNAPSHOT: snapshots += 1
+                    else: other += 1
+            except asyncio.TimeoutError:
+                pass
+        print(f"[PROBE] {snapshots / seconds:.1f} snapshots/s, {other} control packets")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="WebSocket to UDP relay for browser clients")
+    parser.add_argument("--port", type=int, default=GATEWAY_PORT)
+    parser.add_argument("--server", default=f"{SERVER_ADDR[0]}:{SERVER_ADDR[1]}")
+    parser.add_argument("--probe", metavar="URL", help="act as a test browser, e.g. ws://127.0.0.1:8765")
+    args = parser.parse_args()
+
+    if websockets is None:
+        raise SystemExit("The gateway needs the 'websockets' package: pip install websockets")
+    if args.probe:
+        asyncio.run(probe(args.probe))
+    else:
+        host, port = args.server.rsplit(":", 1)
+        asyncio.run(run_gateway(port=args.port, server_addr=(host, int(port))))
@@ -0,0 +1,95 @@
+from rl_2d_bandwidth import LinkBudget, SnapshotAssembler, LEVELS, snapshot_size
+from rl_2d_game_objects import Car, Ball
+from rl_2d_net import *
+
+# Run: python -m pytest test_rl_2d_bandwidth.py  (from the Python Server folder)
+
+
+def make_entities():
+    cars = [Car(100 + 50 * k, 200, None) for k in range(4)]
+    for k, car in enumerate(cars): car.vx, car.vy = 1.0 + k, -0.5
+    ball = Ball()
+    ball.x, ball.y, ball.vx, ball.vy = 400.0, 300.0, 2.0, 1.0
+    return cars + [ball]
+
+
+def test_partial_snapshot_fills_missing_entities():
+    entities = make_entities()
+    buf, _ = new_buffer()
+    assembler = SnapshotAssembler()
+    pack_snapshot(buf, 10, 0.5, *entities, 90.0)
+    assembler.full(SNAPSHOT.unpack_from(buf))
+
+    size = pack_partial_snapshot(buf, 12, 0.6, E_BALL | E_P1, entities, 89.0)
+    assert size == SNAPSHOT_PARTIAL.size + 2 * SNAPSHOT_ENTITY.size
+    snap = assembler.partial(buf, size)
+    assert len(snap) == len(SNAPSHOT.unpack_from(bytes(SNAPSHOT.size)))
+    assert snap[S_TICK] == 12 and snap[S_TIME_LEFT] == 89.0
+    assert snap[S_BALL:S_BALL+2] == (400.0, 300.0)
+    # Left out: moved on from tick 10 at the last known velocity
+    gk = entities[2]
+    assert abs(snap[S_GK1] - (gk.x + gk.vx * 2)) < 1e-4
+    assert abs(snap[S_GK1+1] - (gk.y + gk.vy * 2)) < 1e-4
+
+
+def test_partial_needs_a_baseline():
+    buf, _ = new_buffer()
+    size = pack_partial_snapshot(buf, 3, 0.0, E_BALL | E_P2, make_entities(), 0.0)
+    assert SnapshotAssembler().partial(buf, size) is None
+
+
+def feed(budget, ticks, lost_every=0, delay=0.02, start=0.0):
+    """ Sends `ticks` snapshots, the client reports each one that arrives """
+    received = 0
+    now = start
+    for tick in range(1, ticks + 1):
+        now = start + tick / 60
+        budget.on_send(tick, now)
+        if lost_every and tick % lost_every == 0: continue
+        received += 1
+        budget.on_feedback(tick, received, 0.0, now + delay)
+    return now
+
+
+def test_budget_steps_down_on_loss_and_recovers():
+    budget = LinkBudget()
+    now = feed(budget, 120)
+    assert budget.level == 0
+    now = feed(budget, 300, lost_every=5, start=now)
+    assert budget.level == len(LEVELS) - 1
+    sent = LEVELS[-1][0]    # First tick that gets a snapshot, past the one with everything
+    assert budget.entity_mask(sent, 1, E_GK2) & (E_BALL | E_P1) == E_BALL | E_P1
+    assert not budget.entity_mask(sent, 1, E_GK2) & E_GK2
+
+    budget2 = LinkBudget()
+    budget2.level = 2
+    feed(budget2, 60 * 5)
+    assert budget2.level == 0
+
+
+def test_lower_levels_send_fewer_bytes_and_packets():
+    """ Sends 10 s of ticks at each level the way the server does, through on_send """
+    rates = []
+    for level in range(len(LEVELS)):
+        budget = LinkBudget()
+        budget.level = level
+        packets = 0
+        for tick in range(600):
+            mask = budget.entity_mask(tick, 2, E_GK1)
+            if not mask: continue
+            packets += 1
+            budget.on_send(tick, tick / 60, snapshot_size(mask))
+        rates.append((budget.send_rate, packets))
+    assert all(a[0] > b[0] for a, b in zip(rates, rates[1:]))
+    assert abs(rates[0][0] - SNAPSHOT.size * 60) < 1
+    assert rates[-1][0] < rates[0][0] / 3
+    assert rates[-1][1] == 600 // LEVELS[-1][0] and rates[0][1] == 600
+
+
+def test_every_sent_snapshot_has_ball_and_own_car():
+    budget = LinkBudget()
+    for level in range(len(LEVELS)):
+        budget.level = level
+        for tick in range(120):
+            mask = budget.entity_mask(tick, 2, E_GK1)
+            assert not mask or mask & (E_BALL | E_P2) == E_BALL | E_P2
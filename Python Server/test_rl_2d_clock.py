@@ -0,0 +1,77 @@
+import random
+from rl_2d_clock import ClockSync, SYNC_SAMPLES, STEP_THRESHOLD, PING_INTERVAL
+from rl_2d_net import PKT_PONG, PONG
+
+# Run: python -m pytest test_rl_2d_clock.py  (from the Python Server folder)
+
+
+class Server:
+    """ Server timeline as seen from the client's clock: offset + drift, plus steps """
+    def __init__(self, offset=5.0, drift=50e-6):
+        self.offset = offset
+        self.drift = drift
+
+    def time(self, local):
+        return local * (1 + self.drift) + self.offset
+
+
+def exchange(sync, server, now, rng, noise=0.030):
+    """ One ping/pong taking 10 ms + up to `noise` each way; returns the arrival time """
+    there = 0.010 + rng.random() * noise
+    back = 0.010 + rng.random() * noise
+    pong = PONG.pack(PKT_PONG, 0, now, server.time(now + there))
+    sync.on_pong(pong, now + there + back)
+    return now + there + back
+
+
+def run(sync, server, start, seconds, rng, noise=0.030):
+    now = start
+    while now < start + seconds:
+        now = exchange(sync, server, now, rng, noise) + PING_INTERVAL
+    return now
+
+
+def error(sync, server, now):
+    return abs(sync.server_time(now) - server.time(now))
+
+
+def test_waits_for_a_few_pongs_before_syncing():
+    sync, server, rng = ClockSync(), Server(), random.Random(1)
+    now = 100.0
+    for k in range(SYNC_SAMPLES - 1):
+        now = exchange(sync, server, now, rng) + 0.1
+    assert not sync.synced and sync.epoch == 0
+    exchange(sync, server, now, rng)
+    assert sync.synced and sync.epoch == 1
+
+
+def test_offset_converges_under_jitter():
+    # Within a fraction of a tick (16.7 ms) with 10-40 ms each way
+    for seed in range(5):
+        sync, server, rng = ClockSync(), Server(), random.Random(seed)
+        now = run(sync, server, 100.0, 60.0, rng)
+        assert error(sync, server, now) < 0.003
+        assert error(sync, server, now + 2.0) < 0.004    # Between pongs
+
+
+def test_drift_is_fitted_on_a_quiet_link():
+    sync, server, rng = ClockSync(), Server(drift=60e-6), random.Random(4)
+    now = run(sync, server, 100.0, 60.0, rng, noise=0.001)
+    assert abs(sync.mapping[1] - server.drift) < 30e-6
+    assert error(sync, server, now + 2.0) < 0.0005
+
+
+def test_small_errors_slew_and_large_ones_step():
+    sync, server, rng = ClockSync(), Server(drift=0.0), random.Random(3)
+    now = run(sync, server, 100.0, 30.0, rng)
+    epoch = sync.epoch
+
+    server.offset += STEP_THRESHOLD / 4     # Slewed: no new epoch, but it follows
+    now = run(sync, server, now, 30.0, rng)
+    assert sync.epoch == epoch
+    assert error(sync, server, now) < 0.003
+
+    server.offset += 0.25                   # Server restarted its timeline: stepped
+    now = run(sync, server, now, 30.0, rng)
+    assert sync.epoch == epoch + 1
+    assert error(sync, server, now) < 0.003
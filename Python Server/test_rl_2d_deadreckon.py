@@ -0,0 +1,56 @@
+from rl_2d_deadreckon import DeadReckoning, MAX_EXTRAPOLATE_TICKS, BLEND, SNAP_DISTANCE, ENTITIES
+from rl_2d_game_objects import Car, Ball
+from rl_2d_net import *
+
+# Run: python -m pytest test_rl_2d_deadreckon.py  (from the Python Server folder)
+
+
+def make_snapshot():
+    cars = [Car(200 + 100 * k, 300, None) for k in range(4)]
+    for k, car in enumerate(cars): car.vx, car.vy = 3.0, 1.0 - k
+    ball = Ball()
+    ball.x, ball.y, ball.vx, ball.vy = 500.0, 350.0, 4.0, -2.0
+    buf, _ = new_buffer()
+    pack_snapshot(buf, 10, 0.5, *cars, ball, 90.0)
+    return SNAPSHOT.unpack_from(buf)
+
+
+def make_state(dx=0.0):
+    state = {name: (300.0 + dx, 200.0, 0.0, 0.0) for name in ENTITIES}
+    state['ball'] = (400.0 + dx, 250.0)
+    return state
+
+
+def test_extrapolation_is_capped():
+    dr = DeadReckoning()
+    snap = make_snapshot()
+    near = dr.extrapolate(snap, 2)
+    assert near['ball'][0] > snap[S_BALL] and near['p1'][0] > snap[S_P1]
+    capped = dr.extrapolate(snap, MAX_EXTRAPOLATE_TICKS)
+    past = dr.extrapolate(snap, MAX_EXTRAPOLATE_TICKS * 5)
+    assert past == capped
+    assert dr.extrapolated_ticks == MAX_EXTRAPOLATE_TICKS
+    assert dr.extrapolate(snap, 0)['ball'] == snap[S_BALL:S_BALL+2]
+
+
+def test_small_correction_blends_and_decays():
+    dr = DeadReckoning()
+    dr.smooth(make_state(dx=10.0), True)    # Guess drawn 10 px ahead
+    state = dr.smooth(make_state(), False)  # Real data disagrees
+    assert abs(state['ball'][0] - (400.0 + 10.0 * BLEND)) < 1e-9
+    assert abs(state['p1'][0] - (300.0 + 10.0 * BLEND)) < 1e-9
+    assert state['p1'][2:] == (0.0, 0.0)
+
+    gaps = []
+    for _ in range(40):
+        state = dr.smooth(make_state(), False)
+        gaps.append(state['ball'][0] - 400.0)
+    assert all(a > b for a, b in zip(gaps, gaps[1:]) if a)
+    assert state == make_state()    # Fully settled, nothing left drawn off
+
+
+def test_big_correction_snaps():
+    dr = DeadReckoning()
+    dr.smooth(make_state(dx=SNAP_DISTANCE + 1), True)
+    assert dr.smooth(make_state(), False) == make_state()
+    assert dr.extrapolated_ticks == 0.0
@@ -0,0 +1,68 @@
+from rl_2d_jitter import SnapshotBuffer, BUFFER_SIZE, SEARCH_TICKS
+from rl_2d_net import S_TICK, S_TIME_LEFT
+
+# Run: python -m pytest test_rl_2d_jitter.py  (from the Python Server folder)
+
+
+def snap(tick):
+    state = [0.0] * (S_TIME_LEFT + 1)
+    state[S_TICK] = tick
+    return tuple(state)
+
+
+def test_out_of_order_arrivals_are_sampled_in_tick_order():
+    buf = SnapshotBuffer()
+    for tick in (10, 12, 11, 14, 13):
+        buf.insert(snap(tick), tick / 60)
+    assert buf.latest_tick == 14
+    prev, nxt, t = buf.sample(11.25)
+    assert prev[S_TICK] == 11 and nxt[S_TICK] == 12 and abs(t - 0.25) < 1e-9
+    # A late duplicate of an old tick doesn't move the newest one back
+    buf.insert(snap(12), 15 / 60)
+    assert buf.latest_tick == 14
+
+
+def test_lost_ticks_are_interpolated_across():
+    buf = SnapshotBuffer()
+    for tick in (20, 23):
+        buf.insert(snap(tick), tick / 60)
+    prev, nxt, t = buf.sample(21.5)
+    assert prev[S_TICK] == 20 and nxt[S_TICK] == 23 and abs(t - 0.5) < 1e-9
+
+
+def test_underrun_reports_ticks_past_the_newest():
+    buf = SnapshotBuffer()
+    assert buf.sample(5.0) is None
+    for tick in range(30, 35):
+        buf.insert(snap(tick), tick / 60)
+    prev, nxt, t = buf.sample(36.5)
+    assert prev[S_TICK] == 34 and nxt is None and abs(t - 2.5) < 1e-9
+    assert buf.depth(36.5) == 0.0
+    assert buf.sample(30 - SEARCH_TICKS - 1) is None    # Older than anything kept
+
+
+def test_ring_slots_are_reused():
+    buf = SnapshotBuffer()
+    for tick in range(BUFFER_SIZE + 5):
+        buf.insert(snap(tick), tick / 60)
+    assert buf.get(2) is None and buf.get(BUFFER_SIZE + 2)[S_TICK] == BUFFER_SIZE + 2
+    buf.insert(snap(1), 0.0)        # Too old to matter, must not overwrite a live slot
+    assert buf.get(BUFFER_SIZE + 1)[S_TICK] == BUFFER_SIZE + 1
+
+
+def test_delay_follows_jitter_and_snapshot_interval():
+    steady = SnapshotBuffer()
+    for tick in range(600):
+        steady.insert(snap(tick), tick / 60)
+    assert steady.jitter < 1e-9 and abs(steady.delay - 1.0) < 0.05
+
+    # Every 3rd tick (thinned send rate): the delay grows to cover the gaps
+    thinned = SnapshotBuffer()
+    for tick in range(0, 1800, 3):
+        thinned.insert(snap(tick), tick / 60)
+    assert abs(thinned.interval - 3.0) < 0.01 and abs(thinned.delay - 3.0) < 0.05
+
+    jittery = SnapshotBuffer()
+    for tick in range(600):
+        jittery.insert(snap(tick), tick / 60 + (0.02 if tick % 2 else 0.0))
+    assert jittery.delay > steady.delay + 1.0
@@ -0,0 +1,51 @@
+from rl_2d_matchmaker import Matchmaker, TICK_BUCKET_MS
+from rl_2d_net import *
+
+# Run: python -m pytest test_rl_2d_matchmaker.py  (from the Python Server folder)
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((bytes(data), addr))
+
+
+def heartbeats(mm, rooms, count, jitter=0.0, start=0.0):
+    """ `count` ROOM_STATUS rounds from `rooms` idle servers, 1/20 s apart """
+    now = start
+    for k in range(count):
+        now = start + k / 20
+        for port in range(rooms):
+            tick_ms = 1.0 + port * 0.1 + (jitter if k % 2 else 0.0)
+            mm.on_status(('10.0.0.1', 0), 6000 + port, 0, 0, tick_ms, now)
+        mm.update(now)
+    return now
+
+
+def test_idle_heartbeats_keep_the_room_heap_bounded():
+    mm = Matchmaker(FakeSocket())
+    heartbeats(mm, 1, 5000)
+    assert len(mm.free_rooms) == 1
+
+    # Tick time flapping across buckets still can't outgrow the rooms
+    mm = Matchmaker(FakeSocket())
+    heartbeats(mm, 8, 5000, jitter=TICK_BUCKET_MS * 3)
+    assert len(mm.free_rooms) <= 2 * 8
+
+
+def test_players_get_the_fastest_free_room():
+    sock = FakeSocket()
+    mm = Matchmaker(sock)
+    now = heartbeats(mm, 4, 100)
+    mm.on_join(('10.0.0.9', 1000), 0, 120, now)
+    mm.on_join(('10.0.0.9', 1001), 0, 120, now)
+    mm.update(now)
+    assigns = [addr for data, addr in sock.sent if data[0] == PKT_ROOM_ASSIGN]
+    assert assigns == [('10.0.0.1', 6000)]
+    assert sum(1 for data, _ in sock.sent if data[0] == PKT_MM_MATCH) == 2
+    # Busy now: more heartbeats don't queue it again
+    mm.on_status(('10.0.0.1', 0), 6000, 0, 0, 1.0, now)
+    assert not mm.rooms[('10.0.0.1', 6000)].is_free()
+    assert mm.pop_free_room(now).addr == ('10.0.0.1', 6001)
@@ -0,0 +1,94 @@
+import socket
+import struct
+import time
+from rl_2d_netsim import NetConditions, SimulatedSocket, NET_PROFILES
+
+# Run: python -m pytest test_rl_2d_netsim.py  (from the Python Server folder)
+
+SEQ = struct.Struct('<I')
+
+
+def inversions(values):
+    """ Number of adjacent pairs that arrive out of order """
+    return sum(1 for a, b in zip(values, values[1:]) if b < a)
+
+
+def simulate(profile, count, spacing, seed=7):
+    """ Delivery order (packet numbers sorted by delivery time) for `count` sends """
+    conditions = NetConditions(profile, seed)
+    deliveries = []
+    for i in range(count):
+        for at in conditions.delivery_times(i * spacing):
+            deliveries.append((at, i))
+    deliveries.sort()
+    return conditions, [i for _, i in deliveries]
+
+
+def test_profile_is_repeatable():
+    assert simulate('4G', 2000, 0.016)[1] == simulate('4G', 2000, 0.016)[1]
+    assert simulate('4G', 2000, 0.016, seed=1)[1] != simulate('4G', 2000, 0.016, seed=2)[1]
+
+
+def test_profile_rates():
+    profile = NET_PROFILES['BAD_HOTEL']
+    count = 20000
+    conditions, order = simulate('BAD_HOTEL', count, 0.016)
+    assert conditions.sent == count
+    assert abs(conditions.dropped / count - profile['loss']) < 0.01
+    survivors = count - conditions.dropped
+    assert abs(conditions.duplicated / survivors - profile['duplicate']) < 0.005
+    assert len(order) == survivors + conditions.duplicated
+    assert inversions(order) > 0
+
+
+def test_lan_keeps_order():
+    conditions, order = simulate('LAN', 2000, 0.016)
+    assert conditions.dropped == 0 and conditions.duplicated == 0
+    assert order == list(range(2000))
+
+
+def run_loopback(profile, count, seed=3):
+    """ Sends numbered datagrams through a SimulatedSocket, returns (sim, received) """
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.bind(("127.0.0.1", 0))
+    tx = SimulatedSocket(socket.socket(socket.AF_INET, socket.SOCK_DGRAM), profile, seed)
+    addr = rx.getsockname()
+    received = []
+
+    def drain(timeout):
+        # Read as we go so the receive buffer never overflows
+        rx.settimeout(timeout)
+        try:
+            while True: received.append(SEQ.unpack(rx.recv(64))[0])
+        except (socket.timeout, BlockingIOError):
+            pass
+
+    try:
+        for i in range(count):
+            tx.sendto(SEQ.pack(i), addr)
+            time.sleep(0.001)
+            drain(0)
+        while tx.queue.next_due() is not None:
+            tx.flush()
+            time.sleep(0.001)
+            drain(0)
+        drain(0.2)
+        return tx, received
+    finally:
+        rx.close(); tx.close()
+
+
+def test_loopback_loss_and_duplicates():
+    profile = {'delay_ms': 0, 'jitter_ms': 0, 'loss': 0.2, 'duplicate': 0.1, 'reorder': 0.0}
+    sim, received = run_loopback(profile, 300)
+    stats = sim.conditions
+    assert stats.dropped > 0 and stats.duplicated > 0
+    assert len(received) == 300 - stats.dropped + stats.duplicated
+    assert inversions(received) == 0
+
+
+def test_loopback_reorders():
+    profile = {'delay_ms': 5, 'jitter_ms': 0, 'loss': 0.0, 'duplicate': 0.0, 'reorder': 0.2}
+    sim, received = run_loopback(profile, 150)
+    assert sorted(received) == list(range(150))
+    assert inversions(received) > 0
@@ -0,0 +1,92 @@
+from rl_2d_prediction import Predictor, SMOOTHING, SNAP_DISTANCE
+from rl_2d_game_objects import Car, Ball, WIDTH, HEIGHT, GAME_MODES
+from rl_2d_net import *
+
+# Run: python -m pytest test_rl_2d_prediction.py  (from the Python Server folder)
+
+
+def mask_at(frame):
+    """ Steers and boosts in a pattern that turns the car both ways """
+    mask = KEY_UP
+    if frame % 40 < 15: mask |= KEY_LEFT
+    elif frame % 40 > 30: mask |= KEY_RIGHT
+    if frame % 25 < 5: mask |= KEY_BOOST
+    return mask
+
+
+class Server:
+    """ The server's copy of car p1: applies the inputs it has received, in order """
+    def __init__(self):
+        self.car = Car(200, HEIGHT//2, None)
+        self.car.friction = GAME_MODES['SOCCER']['car_friction']
+        self.others = [Car(WIDTH - 200, HEIGHT//2, None), Car(50, HEIGHT//2, None), Car(WIDTH - 50, HEIGHT//2, None)]
+        self.ball = Ball()
+        self.keys = {}
+        self.ack = 0
+        self.tick = 0
+
+    def step(self, frame):
+        self.car.handle_network_keys(decode_keys(mask_at(frame), self.keys))
+        self.car.update()
+        self.ack = frame
+
+    def snapshot(self):
+        self.tick += 1
+        buf, _ = new_buffer()
+        pack_snapshot(buf, self.tick, 0.0, self.car, *self.others, self.ball, 90.0)
+        snap = list(SNAPSHOT.unpack_from(buf))
+        snap[S_ACK] = self.ack
+        return tuple(snap)
+
+
+def test_reconcile_replays_unacked_inputs():
+    """ With 6 frames of input in flight, reconciling must land on the fully predicted state """
+    predictor = Predictor(1)
+    server = Server()
+    for frame in range(1, 121):
+        predictor.apply_input(frame, mask_at(frame))
+        if frame > 6:
+            server.step(frame - 6)
+            predictor.reconcile(server.snapshot())
+            assert abs(predictor.err_x) + abs(predictor.err_y) < 1e-3
+
+    for frame in range(115, 121): server.step(frame)
+    car = predictor.car
+    assert abs(car.x - server.car.x) < 1e-3 and abs(car.y - server.car.y) < 1e-3
+    assert abs(car.vx - server.car.vx) < 1e-3 and abs(car.vy - server.car.vy) < 1e-3
+
+
+def test_misprediction_is_smoothed_out():
+    predictor = Predictor(1)
+    server = Server()
+    for frame in range(1, 31):
+        predictor.apply_input(frame, mask_at(frame))
+        server.step(frame)
+    drawn = predictor.render_state()
+
+    server.car.x += 20.0    # Something the client could not predict (a bump)
+    predictor.reconcile(server.snapshot())
+    assert abs(predictor.car.x - server.car.x) < 1e-3
+    assert abs(predictor.render_state()[0] - drawn[0]) < 1e-3  # No visible jump
+
+    predictor.paused = True  # Hold the car still so only the offset changes
+    err = predictor.err_x
+    for frame in range(31, 61):
+        predictor.apply_input(frame, 0)
+        err *= SMOOTHING
+        assert abs(predictor.err_x - err) < 1e-9
+    assert abs(predictor.render_state()[0] - server.car.x) < 0.2
+
+
+def test_big_correction_snaps_and_old_snapshots_are_ignored():
+    predictor = Predictor(1)
+    server = Server()
+    server.car.x += SNAP_DISTANCE + 1  # Kick-off reset
+    predictor.reconcile(server.snapshot())
+    assert predictor.render_state()[0] == server.car.x
+
+    stale = list(server.snapshot())
+    predictor.reconcile(server.snapshot())
+    stale[S_P1] = 0.0
+    predictor.reconcile(tuple(stale))
+    assert predictor.car.x == server.car.x
@@ -0,0 +1,70 @@
+import time
+from rl_2d_reliable import ReliableChannel, MAX_RESENDS, RESEND_TIME, RECV_WINDOW, SEQ_MOD
+from rl_2d_net import RELIABLE, PKT_RELIABLE
+
+# Run: python -m pytest test_rl_2d_reliable.py  (from the Python Server folder)
+
+
+class Wire:
+    """ Captures what a channel sends; `drop` decides which packets are lost """
+    def __init__(self, drop=None):
+        self.packets = []
+        self.drop = drop or (lambda packet, n: False)
+        self.count = 0
+
+    def sendto(self, data, addr):
+        self.count += 1
+        if not self.drop(bytes(data), self.count): self.packets.append(bytes(data))
+
+    def deliver(self, channel):
+        """ Feeds everything captured into `channel`, returns the payloads it delivered """
+        packets, self.packets = self.packets, []
+        out = []
+        for packet in packets: out += channel.on_packet(packet, len(packet))
+        return out
+
+
+def pair(drop_ab=None):
+    ab, ba = Wire(drop_ab), Wire()
+    return ReliableChannel(ab, 'b'), ReliableChannel(ba, 'a'), ab, ba
+
+
+def test_lost_messages_are_resent_and_delivered_in_order():
+    # Every other first transmission is lost
+    a, b, ab, ba = pair(drop_ab=lambda packet, n: n <= 10 and n % 2 == 0)
+    for k in range(10): a.send(bytes([k]))
+    got = ab.deliver(b)
+    assert got == [bytes([0])]      # Held back behind the lost seq 1
+    now = time.monotonic()
+    while a.pending:
+        now += RESEND_TIME
+        a.update(now)
+        got += ab.deliver(b)
+        b.update(now)
+        ba.deliver(a)
+    assert got == [bytes([k]) for k in range(10)]
+    assert not a.dead and not b.out_of_order
+
+
+def test_gives_up_and_goes_dead_when_the_peer_never_acks():
+    a, b, ab, ba = pair()
+    a.send(b'hello')
+    now = time.monotonic()
+    for _ in range(MAX_RESENDS + 1):
+        now += RESEND_TIME
+        a.update(now)
+    assert a.dead and not a.pending
+    sent = ab.count
+    a.send(b'more')
+    a.update(now + 1)
+    assert ab.count == sent         # Nothing queued or sent once dead
+
+
+def test_out_of_order_is_bounded():
+    a, b, ab, ba = pair()
+    for seq in range(1, RECV_WINDOW + 50):   # seq 0 never arrives
+        packet = RELIABLE.pack(PKT_RELIABLE, seq, SEQ_MOD - 1) + b'x'
+        assert b.on_packet(packet, len(packet)) == []
+    assert len(b.out_of_order) == RECV_WINDOW - 1     # The window counts the missing seq 0
+    packet = RELIABLE.pack(PKT_RELIABLE, 0, SEQ_MOD - 1) + b'x'
+    assert len(b.on_packet(packet, len(packet))) == RECV_WINDOW
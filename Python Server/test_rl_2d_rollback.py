@@ -0,0 +1,49 @@
+from rl_2d_rollback import RollbackMatch, STATE_SIZE
+from rl_2d_game_objects import World
+from rl_2d_net import KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_BOOST
+
+# Run: python -m pytest test_rl_2d_rollback.py  (from the Python Server folder)
+
+
+def p1_keys(frame):
+    return KEY_RIGHT | (KEY_UP if frame % 40 < 20 else KEY_DOWN) | (KEY_BOOST if frame % 90 < 30 else 0)
+
+
+def p2_keys(frame):
+    # Changes often, so delayed inputs keep being mispredicted
+    return (KEY_LEFT if frame % 14 < 9 else KEY_RIGHT) | (KEY_UP if frame % 22 < 7 else 0)
+
+
+def straight_run(frames):
+    world = World()
+    for frame in range(frames): world.step(p1_keys(frame), p2_keys(frame))
+    return world
+
+
+def state_of(world):
+    match = RollbackMatch(1)
+    match.world = world
+    match.bodies = world.all_cars + [world.ball]
+    out = [0.0] * STATE_SIZE
+    match.save(out)
+    return out
+
+
+def test_resimulation_matches_a_straight_run():
+    frames = 600
+    delay = 5               # Remote inputs arrive this many frames late
+    match = RollbackMatch(1, max_rollback=delay + 1)
+    for frame in range(frames + delay):
+        if frame < frames: assert match.advance(p1_keys(frame))
+        if frame >= delay: match.add_remote_input(frame - delay, p2_keys(frame - delay))
+    match.rollback()
+    assert match.rollbacks > 0 and match.max_resim <= delay + 1
+    assert state_of(match.world) == state_of(straight_run(frames))
+
+
+def test_waits_instead_of_predicting_too_far():
+    match = RollbackMatch(2, max_rollback=4)
+    advanced = sum(match.advance(p2_keys(frame)) for frame in range(10))
+    assert advanced == 4 and match.frame == 4
+    match.add_remote_input(0, p1_keys(0))
+    assert match.advance(p2_keys(4))
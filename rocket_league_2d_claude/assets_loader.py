@@ -1,11 +1,23 @@
 # assets_loader.py
 import pygame
 import os
-from settings import WIDTH, HEIGHT
+from collections import OrderedDict
+from settings import WIDTH, HEIGHT, ROTATION_STEPS, ROTATION_SMOOTH, TEXT_CACHE_SIZE
 
 GRAPHICS = {}
 SOUNDS = {}
 FONTS = {}
+# Pre-rotated sprites: {texture key: [(surface, blit offset), ...] or None}
+ROTATIONS = {}
+# Plain circle sprites for objects without a texture: {(color, radius, dot color): (surface, offset)}
+DISCS = {}
+# Rendered text: {(font, text, color, antialias): Surface}, least recently used first
+TEXT_CACHE = OrderedDict()
+# Quality switches (quality.QualityGovernor turns them off on slow machines)
+BALL_SPIN = True
+TEXT_ANTIALIAS = True
+# font.render() calls made so far (the profiler overlay shows them per frame)
+FONT_RENDERS = 0
 
 def load_texture(name, width=None, height=None):
     path = os.path.join("assets", "textures", name)
@@ -35,6 +47,69 @@ def load_font(name, size):
         print(f"Font '{name}' not found. Using system default.")
         return pygame.font.SysFont('Arial', size, bold=True)
 
+def build_rotations(key, steps=ROTATION_STEPS, smooth=ROTATION_SMOOTH):
+    """Rotates GRAPHICS[key] once per angle bucket, each frame with the offset that centers it"""
+    texture = GRAPHICS.get(key)
+    frames = None
+    if texture:
+        frames = []
+        for i in range(steps):
+            angle = i * 360 / steps
+            img = pygame.transform.rotozoom(texture, angle, 1) if smooth else pygame.transform.rotate(texture, angle)
+            frames.append((img, (-(img.get_width() // 2), -(img.get_height() // 2))))
+    ROTATIONS[key] = frames
+    return frames
+
+def get_rotated(key, angle):
+    """Pre-rotated GRAPHICS[key] closest to angle (degrees) as (surface, offset), or None"""
+    frames = ROTATIONS[key] if key in ROTATIONS else build_rotations(key)
+    if not frames: return None
+    return frames[round(angle * len(frames) / 360) % len(frames)]
+
+def draw_rotated(surf, key, angle, x, y):
+    """Draws GRAPHICS[key] turned angle degrees, centered on (x, y); False if there is no such texture.
+    Texture targets (SDL2 backend) turn the sprite on the GPU, Surfaces get the closest pre-rotated frame"""
+    if getattr(surf, 'rotates', False):
+        texture = GRAPHICS.get(key)
+        if not texture: return False
+        surf.blit_rotated(texture, (x, y), angle)
+        return True
+    rotated = get_rotated(key, angle)
+    if not rotated: return False
+    img, (ox, oy) = rotated
+    surf.blit(img, (int(x) + ox, int(y) + oy))
+    return True
+
+def set_rotation_steps(steps):
+    """Rebuilds the cached rotations with `steps` angles each (lowered by the quality governor)"""
+    for key, frames in list(ROTATIONS.items()):
+        if frames and len(frames) != steps: build_rotations(key, steps)
+
+def get_disc(color, radius, dot=None):
+    """Filled circle (with a 6px center dot if dot is a color) as (surface, offset), like get_rotated"""
+    key = (color, radius, dot)
+    if key not in DISCS:
+        img = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(img, color, (radius, radius), radius)
+        if dot: pygame.draw.circle(img, dot, (radius, radius), 6)
+        DISCS[key] = (img, (-radius, -radius))
+    return DISCS[key]
+
+def render_text(font, text, color, antialias=True):
+    """font.render() through an LRU cache, so HUD text is only rendered when it changes"""
+    global FONT_RENDERS
+    antialias = antialias and TEXT_ANTIALIAS
+    key = (font, text, color, antialias)
+    surf = TEXT_CACHE.get(key)
+    if surf is None:
+        surf = font.render(text, antialias, color)
+        FONT_RENDERS += 1
+        TEXT_CACHE[key] = surf
+        if len(TEXT_CACHE) > TEXT_CACHE_SIZE: TEXT_CACHE.popitem(last=False)
+    else:
+        TEXT_CACHE.move_to_end(key)
+    return surf
+
 def init_assets():
     # Textures - Menu
     GRAPHICS['menu_bg'] = load_texture('menu_bg.png', WIDTH, HEIGHT)
@@ -55,6 +130,11 @@ def init_assets():
     GRAPHICS['car_red'] = load_texture('car_red.png', 50, 50)
     GRAPHICS['gk_blue'] = load_texture('gk_blue.png', 50, 50)
     GRAPHICS['gk_red'] = load_texture('gk_red.png', 50, 50)
+
+    # Sprites that turn are rotated once here instead of every frame
+    ROTATIONS.clear()
+    for key in ('ball', 'ball_soccer', 'ball_puck', 'car_blue', 'car_red', 'gk_blue', 'gk_red'):
+        build_rotations(key)
     
     # Textures - UI (Optional)
     GRAPHICS['button_normal'] = load_texture('button_normal.png')
@@ -72,6 +152,7 @@ def init_assets():
     FONTS['title_medium'] = load_font('title_font.ttf', 60)
     FONTS['main'] = load_font('main_font.ttf', 40)
     FONTS['main_small'] = load_font('main_font.ttf', 36)
+    FONTS['debug'] = load_font('body_font.ttf', 15)     # Profiler overlay
     FONTS['body'] = load_font('body_font.ttf', 24)
     FONTS['body_small'] = load_font('body_font.ttf', 20)
     FONTS['hud'] = load_font('main_font.ttf', 36)
@@ -4,11 +4,72 @@ from settings import *
 import assets_loader
 from objects import Car, Goalkeeper, Ball
 from physics import resolve_car_ball, resolve_car_car
+from renderer import make_renderer, entity_rect
+from particles import MatchEffects
+from profiler import FrameProfiler
+from quality import QualityGovernor
+from replay import Replay
 
 def draw_text_centered(screen, text, font, color, y_offset=0):
-    surf = font.render(text, True, color)
+    surf = assets_loader.render_text(font, text, color)
     screen.blit(surf, (WIDTH//2 - surf.get_width()//2, HEIGHT//2 + y_offset))
 
+# Area the HUD text can cover (redrawn every frame by the dirty-rect renderer)
+HUD_RECT = pygame.Rect(0, 0, WIDTH, 100)
+
+# Baked static field (texture or fallback markings, plus goals), one per mode
+BACKGROUNDS = {}
+
+def get_background(screen, game_mode, theme):
+    """Opaque field for game_mode, rebuilt when the window size or theme changes"""
+    key = (game_mode, screen.get_size(), theme)
+    bg = BACKGROUNDS.get(key)
+    if bg is None:
+        # Stale sizes / themes are never drawn again
+        for old in [k for k in BACKGROUNDS if k[1:] != key[1:]]: del BACKGROUNDS[old]
+        mode_config = GAME_MODES[game_mode]
+        bg = pygame.Surface(screen.get_size())
+        field_texture = assets_loader.GRAPHICS.get(mode_config['field_texture'].replace('.png', ''))
+        if field_texture:
+            bg.blit(field_texture, (0,0))
+        elif assets_loader.GRAPHICS.get('field'):
+            bg.blit(assets_loader.GRAPHICS['field'], (0,0))
+        else:
+            # Fallback to colored field
+            bg.fill(mode_config['field_color'])
+            pygame.draw.rect(bg, WHITE, (0, 0, WIDTH, HEIGHT), 3)
+            pygame.draw.line(bg, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3)
+            pygame.draw.circle(bg, WHITE, (WIDTH//2, HEIGHT//2), 70, 3)
+
+        # Draw goals
+        pygame.draw.rect(bg, (200,200,200), (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+        pygame.draw.rect(bg, (200,200,200), (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+        bg = bg.convert()
+        BACKGROUNDS[key] = bg
+    return bg
+
+# Prebuilt full-screen overlays: {(state, text): Surface}
+OVERLAYS = {}
+
+def get_overlay(state, text=""):
+    """Dimmed layer with the PAUSED / GAMEOVER text, built once per (state, text)"""
+    key = (state, text)
+    layer = OVERLAYS.get(key)
+    if layer is None:
+        layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        layer.fill(GRAY_TRANSPARENT)
+        if state == "PAUSED":
+            draw_text_centered(layer, "PAUSED", assets_loader.FONTS['big'], WHITE, -60)
+            draw_text_centered(layer, "Press [P] to Resume", assets_loader.FONTS['main'], WHITE, 30)
+            draw_text_centered(layer, "[R] Restart  [M] Menu  [Q] Quit", assets_loader.FONTS['main'], ORANGE, 80)
+        else:
+            draw_text_centered(layer, "GAME OVER", assets_loader.FONTS['big'], WHITE, -100)
+            draw_text_centered(layer, text, assets_loader.FONTS['big'], ORANGE, -30)
+            draw_text_centered(layer, "[R] Restart  [M] Menu  [Q] Quit", assets_loader.FONTS['main'], GREEN, 100)
+        layer = layer.convert_alpha()
+        OVERLAYS[key] = layer
+    return layer
+
 def run_match(screen, clock, game_mode, duration, config):
     """Run a match with specified game mode and duration"""
     
@@ -62,9 +123,23 @@ def run_match(screen, clock, game_mode, duration, config):
     goal_timer = 0
     game_state = "PLAYING"
     winner_text = ""
+    # Paused / game over frames don't change: composited once, then reused
+    frozen_state = None
+    frozen_frame = None
+    renderer = make_renderer(screen, config.get('renderer', 'surface'))
+    screen = renderer.target    # The display Surface, or the SDL2 texture target
+    effects = MatchEffects()
+    governor = QualityGovernor(effects) if QUALITY_GOVERNOR else None
+    profiler = FrameProfiler(screen) if config.get('show_fps') else None
+    if profiler: screen = profiler.target  # Counts the blits
+    replay = Replay(all_cars, ball)
+    last_ticks = pygame.time.get_ticks()
 
     while True:
         current_ticks = pygame.time.get_ticks()
+        if profiler: profiler.start()
+        dt_ms = current_ticks - last_ticks
+        last_ticks = current_ticks
         
         # --- INPUT ---
         for event in pygame.event.get():
@@ -82,6 +157,8 @@ def run_match(screen, clock, game_mode, duration, config):
                     if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
                         game_state = "PAUSED"
                         paused_at_ticks = current_ticks
+                    elif replay.active:
+                        replay.stop()   # Any other key skips the replay
                 
                 elif game_state == "PAUSED":
                     if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
@@ -120,6 +197,12 @@ def run_match(screen, clock, game_mode, duration, config):
                         objects.BALL_FRICTION = original_ball_friction
                         return 'QUIT'
 
+        if profiler: profiler.mark('input')
+
+        # The match clock stops for the replay (it runs through the GOAL! banner as before)
+        if game_state == "PLAYING" and replay.active:
+            total_pause_duration += dt_ms
+
         # --- UPDATES ---
         if game_state == "PLAYING" or game_state == "GAMEOVER":
             time_elapsed = (current_ticks - start_ticks - total_pause_duration) / 1000
@@ -132,6 +215,7 @@ def run_match(screen, clock, game_mode, duration, config):
                 else: winner_text = "DRAW!"
 
         if game_state == "PLAYING":
+            effects.update()
             keys = pygame.key.get_pressed()
             p1.handle(keys); p2.handle(keys)
             
@@ -144,17 +228,25 @@ def run_match(screen, clock, game_mode, duration, config):
                 for i in range(len(all_cars)):
                     for j in range(i + 1, len(all_cars)):
                         resolve_car_car(all_cars[i], all_cars[j])
+                effects.boost_trail(p1); effects.boost_trail(p2)
 
                 # Goal Check
                 if ball.x - ball.radius < 0 and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
                     score[1] += 1; goal_timer = 90
+                    effects.goal_burst(0, ball.y, 1)
                     if assets_loader.SOUNDS.get('goal'): assets_loader.SOUNDS['goal'].play()
                 elif ball.x + ball.radius > WIDTH and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
                     score[0] += 1; goal_timer = 90
+                    effects.goal_burst(WIDTH, ball.y, 0)
                     if assets_loader.SOUNDS.get('goal'): assets_loader.SOUNDS['goal'].play()
+                replay.record()
+            elif replay.active:
+                replay.step()   # Holds goal_timer at 1 until the replay ends or is skipped
             else:
                 goal_timer -= 1
+                if goal_timer == 1: replay.start()  # After the GOAL! banner
                 if goal_timer == 0:
+                    replay.clear()
                     ball.reset()
                     # Apply speed multiplier after reset
                     ball.vx *= ball.speed_multiplier
@@ -165,59 +257,61 @@ def run_match(screen, clock, game_mode, duration, config):
                     gk1.x, gk1.y = 50, HEIGHT//2; gk1.vx=gk1.vy=0
                     gk2.x, gk2.y = WIDTH-50, HEIGHT//2; gk2.vx=gk2.vy=0
 
+        if profiler: profiler.mark('sim')
+
         # --- DRAWING ---
-        # Draw field based on game mode
-        field_texture_name = mode_config['field_texture'].replace('.png', '')
-        field_texture = assets_loader.GRAPHICS.get(field_texture_name)
-        
-        if field_texture:
-            screen.blit(field_texture, (0,0))
-        elif assets_loader.GRAPHICS.get('field'):
-            screen.blit(assets_loader.GRAPHICS['field'], (0,0))
+        freeze = game_state if game_state != "PLAYING" else None
+        # Overlay frames, and the first one after them, go out whole
+        if freeze or frozen_state: renderer.invalidate()
+        if frozen_frame and freeze == frozen_state:
+            screen.blit(frozen_frame, (0,0))
         else:
-            # Fallback to colored field
-            screen.fill(mode_config['field_color'])
-            pygame.draw.rect(screen, WHITE, (0, 0, WIDTH, HEIGHT), 3)
-            pygame.draw.line(screen, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3)
-            pygame.draw.circle(screen, WHITE, (WIDTH//2, HEIGHT//2), 70, 3)
+            # Field and goals, baked once per mode
+            renderer.begin(get_background(screen, game_mode, config.get('theme')))
+            renderer.mark(effects.draw(screen))
 
-        # Draw goals
-        pygame.draw.rect(screen, (200,200,200), (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
-        pygame.draw.rect(screen, (200,200,200), (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+            ball.draw(screen)
+            renderer.mark(entity_rect(ball))
+            for car in all_cars:
+                car.draw(screen)
+                renderer.mark(entity_rect(car))
+            if profiler: profiler.mark('sprites')
 
-        ball.draw(screen)
-        for car in all_cars: car.draw(screen)
+            # HUD
+            renderer.mark(HUD_RECT)
+            score_txt = assets_loader.render_text(assets_loader.FONTS['hud'], f"{score[0]} - {score[1]}", WHITE)
+            screen.blit(score_txt, (WIDTH//2 - score_txt.get_width()//2, 50))
+            timer_txt = assets_loader.render_text(assets_loader.FONTS['hud'], f"Time: {int(time_left)}", WHITE)
+            screen.blit(timer_txt, (WIDTH//2 - timer_txt.get_width()//2, 15))
 
-        # HUD
-        score_txt = assets_loader.FONTS['hud'].render(f"{score[0]} - {score[1]}", True, WHITE)
-        screen.blit(score_txt, (WIDTH//2 - score_txt.get_width()//2, 50))
-        timer_txt = assets_loader.FONTS['hud'].render(f"Time: {int(time_left)}", True, WHITE)
-        screen.blit(timer_txt, (WIDTH//2 - timer_txt.get_width()//2, 15))
-        
-        # Show game mode
-        mode_txt = assets_loader.FONTS['body_small'].render(mode_config['name'], True, YELLOW)
-        screen.blit(mode_txt, (10, 10))
-
-        if goal_timer > 0 and game_state == "PLAYING":
-            gm = assets_loader.FONTS['big'].render("GOAL!", True, ORANGE)
-            screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40))
-
-        # Overlays
-        if game_state == "PAUSED":
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill(GRAY_TRANSPARENT)
-            screen.blit(overlay, (0,0))
-            draw_text_centered(screen, "PAUSED", assets_loader.FONTS['big'], WHITE, -60)
-            draw_text_centered(screen, "Press [P] to Resume", assets_loader.FONTS['main'], WHITE, 30)
-            draw_text_centered(screen, "[R] Restart  [M] Menu  [Q] Quit", assets_loader.FONTS['main'], ORANGE, 80)
-
-        if game_state == "GAMEOVER":
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill(GRAY_TRANSPARENT)
-            screen.blit(overlay, (0,0))
-            draw_text_centered(screen, "GAME OVER", assets_loader.FONTS['big'], WHITE, -100)
-            draw_text_centered(screen, winner_text, assets_loader.FONTS['big'], ORANGE, -30)
-            draw_text_centered(screen, "[R] Restart  [M] Menu  [Q] Quit", assets_loader.FONTS['main'], GREEN, 100)
-
-        pygame.display.flip()
+            # Show game mode
+            mode_txt = assets_loader.render_text(assets_loader.FONTS['body_small'], mode_config['name'], YELLOW)
+            screen.blit(mode_txt, (10, 10))
+
+            if replay.active and game_state == "PLAYING":
+                rp = assets_loader.render_text(assets_loader.FONTS['hud'], "REPLAY", ORANGE)
+                renderer.mark(screen.blit(rp, (WIDTH//2 - rp.get_width()//2, HEIGHT - 100)))
+                hint = assets_loader.render_text(assets_loader.FONTS['body'], "Press any key to skip", WHITE)
+                renderer.mark(screen.blit(hint, (WIDTH//2 - hint.get_width()//2, HEIGHT - 55)))
+
+            elif goal_timer > 0 and game_state == "PLAYING":
+                gm = assets_loader.render_text(assets_loader.FONTS['big'], "GOAL!", ORANGE)
+                renderer.mark(screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40)))
+
+            # Overlays
+            if freeze:
+                screen.blit(get_overlay(game_state, winner_text), (0,0))
+
+            frozen_state = freeze
+            # Taken before the profiler panel, which is drawn fresh on top of it
+            frozen_frame = renderer.snapshot() if freeze else None
+
+        if profiler:
+            renderer.mark(profiler.draw(clock.get_fps()))
+            profiler.mark('hud')
+
+        renderer.present()
+        if profiler: profiler.end()
+        if governor and governor.update(clock.get_rawtime()):
+            renderer = governor.renderer(renderer)
         clock.tick(FPS)
@@ -3,7 +3,8 @@ import pygame
 import sys
 from settings import WIDTH, HEIGHT
 import assets_loader
-from menu import main_menu
+from menu import main_menu, load_config
+from renderer import open_display
 from game import run_match
 
 # 1. Init Pygame
@@ -11,8 +12,7 @@ pygame.init()
 pygame.mixer.init()
 
 # 2. Setup Screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rocket Soccer")
+screen = open_display((WIDTH, HEIGHT), "Rocket Soccer", load_config().get('renderer', 'surface'))
 clock = pygame.time.Clock()
 
 # 3. Load Assets (After screen is created)
@@ -5,6 +5,8 @@ import os
 import math
 from settings import *
 import assets_loader
+from renderer import flip
+from particles import MenuDust
 
 # Menu State Constants
 MAIN_MENU = "MAIN_MENU"
@@ -38,12 +40,12 @@ def save_config(config):
 
 def draw_text_centered(screen, text, font, color, y_offset=0):
     """Draw centered text at specified y offset from center"""
-    surf = font.render(text, True, color)
+    surf = assets_loader.render_text(font, text, color)
     screen.blit(surf, (WIDTH//2 - surf.get_width()//2, HEIGHT//2 + y_offset))
 
 def draw_text(screen, text, font, color, x, y, centered=False):
     """Draw text at specific position"""
-    surf = font.render(text, True, color)
+    surf = assets_loader.render_text(font, text, color)
     if centered:
         x -= surf.get_width() // 2
         y -= surf.get_height() // 2
@@ -81,13 +83,11 @@ class Button:
         """Draw button with hover effects"""
         color = ORANGE if self.hovered else WHITE
         
-        # Draw text with scale
-        font_size = int(self.font.get_height() * self.scale)
-        scaled_font = pygame.font.Font(self.font.get_font_name() if hasattr(self.font, 'get_font_name') else None, font_size)
-        surf = self.font.render(self.text, True, color)
+        # Draw text
+        surf = assets_loader.render_text(self.font, self.text, color)
         
         # Add shadow
-        shadow = self.font.render(self.text, True, (20, 20, 20))
+        shadow = assets_loader.render_text(self.font, self.text, (20, 20, 20))
         screen.blit(shadow, (self.x - surf.get_width()//2 + 3, self.y - surf.get_height()//2 + 3))
         screen.blit(surf, (self.x - surf.get_width()//2, self.y - surf.get_height()//2))
         
@@ -113,7 +113,6 @@ class MenuManager:
         
         # Animation state
         self.logo_pulse = 0
-        self.particles = []
         self.init_particles()
         
         # Create buttons
@@ -121,15 +120,7 @@ class MenuManager:
         
     def init_particles(self):
         """Initialize floating particles for background"""
-        import random
-        for _ in range(30):
-            self.particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'vx': random.uniform(-0.5, 0.5),
-                'vy': random.uniform(-0.5, 0.5),
-                'size': random.randint(1, 3)
-            })
+        self.particles = MenuDust(30)
     
     def create_buttons(self):
         """Create all menu buttons"""
@@ -243,6 +234,11 @@ class MenuManager:
                 self.config['sfx_volume'] = min(1.0, self.config['sfx_volume'] + 0.1)
                 save_config(self.config)
             
+            # Profiler overlay during matches
+            elif event.key == pygame.K_f:
+                self.config['show_fps'] = not self.config['show_fps']
+                save_config(self.config)
+            
             # Reset defaults
             elif event.key == pygame.K_SPACE:
                 self.config = DEFAULT_SETTINGS.copy()
@@ -255,16 +251,8 @@ class MenuManager:
         # Logo pulse animation
         self.logo_pulse += 0.05
         
-        # Particle animation
-        for p in self.particles:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            
-            # Wrap around screen
-            if p['x'] < 0: p['x'] = WIDTH
-            if p['x'] > WIDTH: p['x'] = 0
-            if p['y'] < 0: p['y'] = HEIGHT
-            if p['y'] > HEIGHT: p['y'] = 0
+        # Particle animation (wraps around the screen)
+        self.particles.update()
         
         # Update buttons
         mouse_pos = pygame.mouse.get_pos()
@@ -289,7 +277,7 @@ class MenuManager:
         elif self.state == SETTINGS:
             self.draw_settings()
         
-        pygame.display.flip()
+        flip(self.screen)
     
     def draw_background(self):
         """Draw menu background"""
@@ -303,10 +291,7 @@ class MenuManager:
                                (0, y), (WIDTH, y))
         
         # Draw particles
-        for p in self.particles:
-            alpha = 100 + int(50 * math.sin(self.logo_pulse + p['x'] * 0.01))
-            color = (alpha, alpha, alpha + 50)
-            pygame.draw.circle(self.screen, color, (int(p['x']), int(p['y'])), p['size'])
+        self.particles.draw(self.screen, self.logo_pulse)
     
     def draw_main_menu(self):
         """Draw main menu screen"""
@@ -322,7 +307,7 @@ class MenuManager:
             # Text logo
             scale = 1.0 + 0.05 * math.sin(self.logo_pulse)
             logo_text = "ROCKET SOCCER"
-            surf = assets_loader.FONTS['title'].render(logo_text, True, YELLOW)
+            surf = assets_loader.render_text(assets_loader.FONTS['title'], logo_text, YELLOW)
             scaled_surf = pygame.transform.scale(surf, 
                 (int(surf.get_width() * scale), int(surf.get_height() * scale)))
             self.screen.blit(scaled_surf, 
@@ -337,7 +322,7 @@ class MenuManager:
         draw_text(self.screen, "v1.0 | Press ESC to Exit", footer_font, 
                  (100, 100, 100), WIDTH - 10, HEIGHT - 10, centered=False)
         # Adjust position
-        footer_surf = footer_font.render("v1.0 | Press ESC to Exit", True, (100, 100, 100))
+        footer_surf = assets_loader.render_text(footer_font, "v1.0 | Press ESC to Exit", (100, 100, 100))
         self.screen.blit(footer_surf, (WIDTH - footer_surf.get_width() - 10, HEIGHT - 30))
     
     def draw_game_mode_select(self):
@@ -572,7 +557,7 @@ class MenuManager:
         instructions = [
             "Use LEFT/RIGHT arrows to adjust SFX volume",
             "Hold CTRL + LEFT/RIGHT for music volume",
-            "",
+            f"Press F to toggle the FPS overlay ({'ON' if self.config['show_fps'] else 'OFF'})",
             "Press SPACE to Reset to Defaults",
             "Press ESC to Save and Return"
         ]
@@ -19,12 +19,14 @@ class Car:
         self.controls = controls 
         self.speed_power = 0.25
         self.texture_key = texture_key
+        self.boost_active = False
 
     def handle(self, keys):
         if not self.controls: return
         ax = ay = 0
+        self.boost_active = keys[self.controls.get('boost', None)]
         if keys[self.controls['up']]:
-            ay -= self.speed_power * (1.5 if keys[self.controls.get('boost', None)] else 1.0)
+            ay -= self.speed_power * (1.5 if self.boost_active else 1.0)
         if keys[self.controls['down']]:
             ay += self.speed_power * 0.8
         if keys[self.controls['left']]:
@@ -54,15 +56,10 @@ class Car:
         self.y = clamp(self.y, self.radius, HEIGHT - self.radius)
 
     def draw(self, surf):
-        texture = assets_loader.GRAPHICS.get(self.texture_key)
-        if texture:
-            angle = math.degrees(math.atan2(-self.vy, self.vx))
-            rotated_img = pygame.transform.rotate(texture, angle)
-            rect = rotated_img.get_rect(center=(int(self.x), int(self.y)))
-            surf.blit(rotated_img, rect)
-        else:
-            pygame.draw.circle(surf, self.color, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(surf, BLACK, (int(self.x), int(self.y)), 6)
+        if assets_loader.draw_rotated(surf, self.texture_key, math.degrees(math.atan2(-self.vy, self.vx)), self.x, self.y):
+            return
+        img, (ox, oy) = assets_loader.get_disc(self.color, self.radius, BLACK)
+        surf.blit(img, (int(self.x) + ox, int(self.y) + oy))
 
 class Goalkeeper(Car):
     def __init__(self, x, y, color, side, texture_key):
@@ -121,11 +118,8 @@ class Ball:
 
     def draw(self, surf):
         # Try to use the texture key specific to game mode
-        texture = assets_loader.GRAPHICS.get(self.texture_key)
-        if texture:
-            rotated_img = pygame.transform.rotate(texture, self.angle)
-            new_rect = rotated_img.get_rect(center=(int(self.x), int(self.y)))
-            surf.blit(rotated_img, new_rect)
-        else:
-            # Fallback to color
-            pygame.draw.circle(surf, self.fallback_color, (int(self.x), int(self.y)), self.radius)
+        angle = self.angle if assets_loader.BALL_SPIN else 0
+        if assets_loader.draw_rotated(surf, self.texture_key, angle, self.x, self.y): return
+        # Fallback to color
+        img, (ox, oy) = assets_loader.get_disc(self.fallback_color, self.radius)
+        surf.blit(img, (int(self.x) + ox, int(self.y) + oy))
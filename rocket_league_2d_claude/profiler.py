@@ -0,0 +1,123 @@
+# profiler.py
+import time
+import pygame
+import assets_loader
+from settings import HEIGHT, FPS, WHITE
+
+# --- FRAME PROFILER ---
+# Only exists while config['show_fps'] is on: run_match keeps `profiler = None`
+# otherwise, so a normal frame pays a handful of `if profiler:` checks.
+# Each frame is split at the run_match phase boundaries; the overlay shows
+# FPS, a frame-time graph, the average time per phase, and the blits and
+# font.render() calls of the last frame. It is drawn from constant surfaces
+# (panel, one bar per height, cached text) so it works on every renderer.
+
+PHASES = ('input', 'sim', 'sprites', 'hud', 'flip')
+GRAPH_FRAMES = 120      # Frames in the graph, 2px each
+GRAPH_HEIGHT = 50
+GRAPH_MS = 40.0         # Frame time at the top of the graph
+TEXT_EVERY = 15         # Frames between text refreshes (readable, and easy on the text cache)
+LINE_HEIGHT = 18
+PANEL_WIDTH = 380       # Fits the phase line
+PANEL_HEIGHT = 3 * LINE_HEIGHT + GRAPH_HEIGHT + 20
+
+class CountingTarget:
+    """Passes draws on to the real target (Surface or texture target), counting blits"""
+    def __init__(self, target):
+        self.target = target
+        self.count = 0
+
+    def blit(self, *args):
+        self.count += 1
+        return self.target.blit(*args)
+
+    def blit_rotated(self, *args):
+        self.count += 1
+        return self.target.blit_rotated(*args)
+
+    def blits(self, blit_sequence, doreturn=True):
+        return self.target.blits(self._counted(blit_sequence), doreturn)
+
+    def _counted(self, blit_sequence):
+        for item in blit_sequence:
+            self.count += 1
+            yield item
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+class FrameProfiler:
+    """Phase timings and draw call counts per frame, plus the overlay that shows them"""
+    def __init__(self, target):
+        self.target = CountingTarget(target)
+        self.rect = pygame.Rect(10, HEIGHT - PANEL_HEIGHT - 10, PANEL_WIDTH, PANEL_HEIGHT)
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+        budget = int(1000 / FPS / GRAPH_MS * GRAPH_HEIGHT)
+        self.budget_line = pygame.Surface((GRAPH_FRAMES * 2, 1))
+        self.budget_line.fill((90, 90, 90))
+        self.budget_y = self.rect.bottom - 8 - budget
+        self.bars = {}          # (height, color): Surface
+        self.history = [0.0] * GRAPH_FRAMES     # Whole frame times (ms), ring buffer
+        self.sums = dict.fromkeys(PHASES, 0.0)  # Seconds per phase since the last text refresh
+        self.frame = 0
+        self.frame_start = self.last = time.perf_counter()
+        self.blits = self.renders = 0
+        self.render_base = assets_loader.FONT_RENDERS
+        self.lines = []
+
+    def start(self):
+        """Top of the frame loop; closes the previous frame (sleep in clock.tick included)"""
+        now = time.perf_counter()
+        self.history[self.frame % GRAPH_FRAMES] = (now - self.frame_start) * 1000
+        self.frame += 1
+        self.frame_start = self.last = now
+
+    def mark(self, phase):
+        """Charges the time since the previous mark to phase"""
+        now = time.perf_counter()
+        self.sums[phase] += now - self.last
+        self.last = now
+
+    def end(self):
+        """After the flip: times it and takes this frame's counts"""
+        self.mark('flip')
+        self.blits, self.target.count = self.target.count, 0
+        self.renders = assets_loader.FONT_RENDERS - self.render_base
+        self.render_base = assets_loader.FONT_RENDERS
+
+    def _bar(self, ms):
+        height = max(1, min(GRAPH_HEIGHT, int(ms / GRAPH_MS * GRAPH_HEIGHT)))
+        color = (80, 200, 80) if ms <= 1000 / FPS + 1 else (230, 200, 60) if ms <= 2000 / FPS else (230, 70, 60)
+        bar = self.bars.get((height, color))
+        if bar is None:
+            bar = self.bars[(height, color)] = pygame.Surface((2, height))
+            bar.fill(color)
+        return bar
+
+    def _refresh(self, fps):
+        recent = [self.history[(self.frame - k) % GRAPH_FRAMES] for k in range(1, TEXT_EVERY + 1)]
+        phases = "  ".join(f"{name} {self.sums[name] * 1000 / TEXT_EVERY:.2f}" for name in PHASES)
+        self.sums = dict.fromkeys(PHASES, 0.0)
+        font = assets_loader.FONTS['debug']
+        self.lines = [assets_loader.render_text(font, text, WHITE) for text in (
+            f"FPS {fps:.0f}   frame {sum(recent) / TEXT_EVERY:.1f} ms (max {max(recent):.1f})",
+            f"{phases} ms",
+            f"blits {self.blits}   font.render {self.renders}")]
+
+    def draw(self, fps):
+        """Draws the overlay, returns its Rect"""
+        if self.frame % TEXT_EVERY == 0 or not self.lines: self._refresh(fps)
+        x, y = self.rect.topleft
+        blit = self.target.blit
+        blit(self.panel, self.rect)
+        for k, txt in enumerate(self.lines):
+            blit(txt, (x + 8, y + 6 + k * LINE_HEIGHT))
+        bottom = self.rect.bottom - 8
+        bars = []
+        for k in range(GRAPH_FRAMES):
+            bar = self._bar(self.history[(self.frame + k) % GRAPH_FRAMES])     # Oldest first
+            bars.append((bar, (x + 8 + k * 2, bottom - bar.get_height())))
+        self.target.blits(bars, doreturn=False)
+        blit(self.budget_line, (x + 8, self.budget_y))
+        return self.rect
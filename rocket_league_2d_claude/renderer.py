@@ -0,0 +1,252 @@
+# renderer.py
+import os
+import time
+from collections import OrderedDict
+import pygame
+try:
+    from pygame._sdl2 import video     # SDL2 Renderer / Texture API
+except ImportError:                     # Browser builds and old pygame: Surface backends only
+    video = None
+
+# How far a rotated sprite can reach past the object's radius
+# (a 50px car texture turned 45 degrees is ~71px across for radius 22)
+SPRITE_EXTENT = 1.65
+
+def entity_rect(obj):
+    """Screen area a car / ball sprite can cover at its current position"""
+    half = int(obj.radius * SPRITE_EXTENT) + 2
+    return pygame.Rect(int(obj.x) - half, int(obj.y) - half, half * 2, half * 2)
+
+class SurfaceRenderer:
+    """Full redraw: the whole background every frame, then flip"""
+    name = 'surface'
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.target = screen    # What the game draws on
+
+    def begin(self, background):
+        self.screen.blit(background, (0, 0))
+
+    def mark(self, rect):
+        pass
+
+    def invalidate(self):
+        pass
+
+    def snapshot(self):
+        """Copy of the finished frame to show again while frozen (None: just redraw)"""
+        return self.screen.copy()
+
+    def present(self):
+        pygame.display.flip()
+
+class DirtyRectRenderer(SurfaceRenderer):
+    """Only restores and pushes the areas that changed, via display.update(rects).
+    Everything drawn must be mark()ed; invalidate() forces one full frame
+    (overlays, state changes)"""
+    name = 'dirty'
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.background = None
+        self.prev_rects = []    # Drawn last frame: restored from the background now
+        self.rects = []
+        self.full = True
+
+    def begin(self, background):
+        if self.full or background is not self.background:
+            self.screen.blit(background, (0, 0))
+            self.full = True
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(background, rect, rect)
+        self.background = background
+
+    def mark(self, rect):
+        self.rects.append(rect)
+
+    def invalidate(self):
+        self.full = True
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+        else:
+            # Old positions (now erased) and new ones
+            pygame.display.update(self.prev_rects + self.rects)
+        self.prev_rects, self.rects = self.rects, self.prev_rects
+        self.rects.clear()
+        self.full = False
+
+# --- SDL2 RENDERER BACKEND ---
+# Sprites, text and the background go up to textures once and each frame is
+# drawn by SDL's Renderer (GPU when there is one). 'software' is the same path
+# on SDL's software rasterizer, which also runs headless (CI, dummy driver).
+# convert() / convert_alpha() still need the pygame display, so it is opened
+# hidden and the game shows in a Window of its own.
+
+# Cars and the ball are one texture each, turned by the Renderer as they are
+# drawn (TextureTarget.blit_rotated), not uploads of the pre-rotated frames.
+
+GPU = None      # pygame._sdl2 Renderer once open_display() picked 'sdl2' / 'software'
+TEXTURE_CACHE_SIZE = 512    # Sprites + text + backgrounds
+_screen_texture = None      # Streaming texture for whole Surface frames (menus)
+
+def open_display(size, caption, backend='surface'):
+    """Creates the game window for the backend, returns the screen Surface to draw menus on"""
+    global GPU
+    GPU = None
+    if backend in ('sdl2', 'software') and video is not None:
+        os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', '1')     # Filtered rotation, like rotozoom
+        try:
+            screen = pygame.display.set_mode(size, pygame.HIDDEN)
+            window = video.Window(caption, size)
+            if backend == 'sdl2':
+                try:
+                    GPU = video.Renderer(window, accelerated=1, vsync=True)
+                except video.error:
+                    GPU = video.Renderer(window, accelerated=0)     # No GPU here
+            else:
+                GPU = video.Renderer(window, accelerated=0)
+            return screen
+        except (pygame.error, video.error) as e:
+            print(f"[RENDERER] {backend} unavailable ({e}), using the display surface")
+            GPU = None
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    return screen
+
+def _present_gpu():
+    # Closing our Window only sends WINDOWCLOSE (the hidden display window is
+    # still open), so turn it into the QUIT the game loops listen for
+    if pygame.event.peek(pygame.WINDOWCLOSE): pygame.event.post(pygame.event.Event(pygame.QUIT))
+    GPU.present()
+
+def flip(screen):
+    """Shows a fully drawn screen Surface: display flip, or one texture upload on the SDL2 window"""
+    global _screen_texture
+    if GPU is None:
+        pygame.display.flip()
+        return
+    size = screen.get_size()
+    if _screen_texture is None or (_screen_texture.width, _screen_texture.height) != size:
+        _screen_texture = video.Texture(GPU, size, streaming=True)
+    _screen_texture.update(screen)
+    GPU.clear()
+    _screen_texture.draw()
+    _present_gpu()
+
+class TextureTarget:
+    """Stands in for the screen Surface: blit() draws the source's texture instead.
+    Textures are made once per source Surface (the caches keep those alive)"""
+    rotates = True      # Has blit_rotated (assets_loader.draw_rotated checks)
+
+    def __init__(self, gpu, size):
+        self.gpu = gpu
+        self.size = size
+        self.textures = OrderedDict()   # id(surface): (surface, Texture), least recently used first
+
+    def texture(self, surface):
+        entry = self.textures.get(id(surface))
+        if entry is None or entry[0] is not surface:
+            entry = (surface, video.Texture.from_surface(self.gpu, surface))
+            self.textures[id(surface)] = entry
+            if len(self.textures) > TEXTURE_CACHE_SIZE: self.textures.popitem(last=False)
+        else:
+            self.textures.move_to_end(id(surface))
+        return entry[1]
+
+    def blit(self, source, dest, area=None):
+        texture = self.texture(source)
+        if area is None:
+            rect = pygame.Rect(dest[0], dest[1], source.get_width(), source.get_height())
+            texture.draw(dstrect=rect)
+        else:
+            area = pygame.Rect(area)
+            rect = pygame.Rect(dest[0], dest[1], area.w, area.h)
+            texture.draw(srcrect=area, dstrect=rect)
+        return rect
+
+    def blit_rotated(self, source, center, angle):
+        """Draws source turned angle degrees (counterclockwise, as pygame.transform.rotate) around center"""
+        rect = source.get_rect(center=(int(center[0]), int(center[1])))
+        self.texture(source).draw(dstrect=rect, angle=-angle)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+class Sdl2Renderer(SurfaceRenderer):
+    """Textured frames through the SDL2 Renderer opened by open_display()"""
+    name = 'sdl2'
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.target = TextureTarget(GPU, screen.get_size())
+
+    def begin(self, background):
+        GPU.clear()
+        self.target.blit(background, (0, 0))
+
+    def snapshot(self):
+        return None     # Redrawing from textures is cheaper than uploading a copy
+
+    def present(self):
+        _present_gpu()
+
+RENDERERS = {'surface': SurfaceRenderer, 'dirty': DirtyRectRenderer, 'sdl2': Sdl2Renderer, 'software': Sdl2Renderer}
+
+def make_renderer(screen, name):
+    """Renderer backend by name (unknown names, or SDL2 ones without an SDL2 window, fall back to 'surface')"""
+    backend = RENDERERS.get(name, SurfaceRenderer)
+    if backend is Sdl2Renderer and GPU is None: backend = SurfaceRenderer
+    return backend(screen)
+
+if __name__ == "__main__":
+    # Frame times of each backend on a synthetic match frame (field, 5 rotating
+    # sprites, HUD text). Headless: SDL_VIDEODRIVER=dummy python renderer.py
+    pygame.init()
+    size = (1000, 700)
+    frames = 600
+    for name in ('surface', 'dirty', 'sdl2', 'software'):
+        screen = open_display(size, "Renderer benchmark", name)
+        if name in ('sdl2', 'software') and GPU is None:
+            print(f"[RENDERER] {name}: not available")
+            continue
+        renderer = make_renderer(screen, name)
+        background = pygame.Surface(size).convert()
+        for y in range(0, size[1], 20):
+            pygame.draw.rect(background, (30, 110 + y % 40, 30), (0, y, size[0], 20))
+        sprite = pygame.Surface((50, 30), pygame.SRCALPHA)
+        pygame.draw.rect(sprite, (200, 40, 40), sprite.get_rect(), border_radius=8)
+        sprite = sprite.convert_alpha()
+        rotations = [pygame.transform.rotozoom(sprite, i * 360 / 64, 1) for i in range(64)]
+        font = pygame.font.SysFont("Arial", 40, bold=True)
+        hud = [font.render(text, True, (255, 255, 255)) for text in ("3 - 2", "1:24", "Blue", "Red")]
+        start = time.perf_counter()
+        for frame in range(frames):
+            renderer.begin(background)
+            for k in range(5):
+                x, y = 100 + (frame * (k + 1)) % 800, 150 + k * 100
+                if getattr(renderer.target, 'rotates', False):
+                    renderer.target.blit_rotated(sprite, (x, y), (frame + k * 13) % 64 * 360 / 64)
+                    continue
+                img = rotations[(frame + k * 13) % 64]
+                renderer.mark(renderer.target.blit(img, (x - img.get_width() // 2, y - img.get_height() // 2)))
+            for k, txt in enumerate(hud):
+                renderer.mark(renderer.target.blit(txt, (200 + k * 150, 20)))
+            renderer.present()
+        ms = (time.perf_counter() - start) * 1000 / frames
+        print(f"[RENDERER] {name}: {ms:.3f} ms/frame ({os.environ.get('SDL_VIDEODRIVER', 'default')} video driver)")
+    pygame.quit()
@@ -24,6 +24,28 @@ GOAL_WIDTH = 180
 GOAL_TOP_Y = HEIGHT//2 - GOAL_WIDTH//2
 GOAL_BOTTOM_Y = HEIGHT//2 + GOAL_WIDTH//2
 
+# Rendering
+ROTATION_STEPS = 64     # Pre-rotated frames per car/ball sprite (5.6 degrees apart)
+ROTATION_SMOOTH = True  # Build them with rotozoom (filtered) instead of plain rotate
+TEXT_CACHE_SIZE = 256   # Rendered text surfaces kept (HUD, menus)
+MAX_PARTICLES = 5000     # Live particles per system (boost trails, goal bursts, menu dust)
+PARTICLE_FADE_STEPS = 8  # Pre-rendered stamps per particle kind, faded out to full
+BOOST_PARTICLES = 6      # Exhaust particles per frame per boosting car
+GOAL_PARTICLES = 1200    # Particles in a goal explosion
+REPLAY_SECONDS = 5       # Play kept in the instant replay ring buffer
+REPLAY_SHOWN = 3         # Seconds of it played back after a goal...
+REPLAY_SPEED = 0.5       # ...at this speed (recorded ticks per frame)
+
+# --- ADAPTIVE QUALITY ---
+QUALITY_GOVERNOR = True      # Turn effects off (and back on) to hold FPS on slow machines
+QUALITY_WINDOW = 60          # Frames in the rolling average of frame work time
+QUALITY_HIGH = 0.9           # Step down when the average passes this share of the frame budget
+QUALITY_LOW = 0.5            # ...step back up after QUALITY_RECOVER frames under this share
+QUALITY_COOLDOWN = 60        # Frames between two step downs
+QUALITY_RECOVER = 300
+ROTATION_STEPS_LOW = 16      # Rotation cache resolution once stepped down
+PARTICLE_DENSITY_LOW = 0.3   # Share of particles emitted once stepped down
+
 # Physics / Friction
 # Lower value = More slippery (ice)
 # Higher value (closer to 1.0) = Less friction (air hockey)
@@ -65,5 +87,7 @@ DEFAULT_SETTINGS = {
     'music_volume': 0.8,
     'sfx_volume': 0.9,
     'fullscreen': False,
-    'show_fps': False
+    'show_fps': False,
+    'renderer': 'surface'   # 'surface' (full flip), 'dirty' (display.update of changed rects),
+                            # 'sdl2' (textures on SDL's GPU renderer) or 'software' (same, CPU; runs headless)
 }
@@ -1,18 +1,18 @@
 # main.py
 import pygame
 import sys
-from settings import WIDTH, HEIGHT
+from settings import WIDTH, HEIGHT, RENDERER
 import assets_loader
 from menu import main_menu_loop
 from game import run_match
+from renderer import open_display
 
 # 1. Init Pygame
 pygame.init()
 pygame.mixer.init()
 
 # 2. Setup Screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rocket Soccer: Ultimate Edition")
+screen = open_display((WIDTH, HEIGHT), "Rocket Soccer: Ultimate Edition", RENDERER)
 clock = pygame.time.Clock()
 
 # 3. Load Assets
@@ -3,6 +3,7 @@ import pygame
 import math
 from settings import *
 import assets_loader
+from renderer import flip
 
 # --- UI ELEMENT CLASSES ---
 class Button:
@@ -23,8 +24,8 @@ class Button:
         font = assets_loader.FONTS['ui']
         
         # Draw Text with Shadow
-        shadow_surf = font.render(self.text, True, BLACK)
-        text_surf = font.render(self.text, True, color)
+        shadow_surf = assets_loader.render_text(font, self.text, BLACK)
+        text_surf = assets_loader.render_text(font, self.text, color)
         
         # Scaling
         if abs(self.scale - 1.0) > 0.01:
@@ -129,7 +130,7 @@ def main_menu_loop(screen, clock):
             elif state == "HELP": title_text = "HOW TO PLAY"
             elif state == "DURATION": title_text = "MATCH SETUP"
             
-            t_surf = assets_loader.FONTS['title'].render(title_text, True, WHITE)
+            t_surf = assets_loader.render_text(assets_loader.FONTS['title'], title_text, WHITE)
             screen.blit(t_surf, (WIDTH//2 - t_surf.get_width()//2, 50))
 
         # --- CONTENT ---
@@ -137,18 +138,18 @@ def main_menu_loop(screen, clock):
         if state == "MAIN":
             for btn in btns_main:
                 btn.draw(screen)
-            v_surf = assets_loader.FONTS['body'].render("v2.2 Stable", True, LIGHT_GRAY)
+            v_surf = assets_loader.render_text(assets_loader.FONTS['body'], "v2.2 Stable", LIGHT_GRAY)
             screen.blit(v_surf, (WIDTH - 120, HEIGHT - 30))
 
         elif state == "DURATION":
             # 1. Labels
-            lbl = assets_loader.FONTS['ui_small'].render("ENTER MATCH DURATION (Seconds):", True, BLUE)
+            lbl = assets_loader.render_text(assets_loader.FONTS['ui_small'], "ENTER MATCH DURATION (Seconds):", BLUE)
             screen.blit(lbl, (WIDTH//2 - lbl.get_width()//2, 130))
 
-            b_lbl = assets_loader.FONTS['ui_small'].render("Player Name", True, BLUE)
+            b_lbl = assets_loader.render_text(assets_loader.FONTS['ui_small'], "Player Name", BLUE)
             screen.blit(b_lbl, (blue_rect.centerx - b_lbl.get_width()//2, blue_rect.top - 35))
 
-            r_lbl = assets_loader.FONTS['ui_small'].render("Player Name", True, RED)
+            r_lbl = assets_loader.render_text(assets_loader.FONTS['ui_small'], "Player Name", RED)
             screen.blit(r_lbl, (red_rect.centerx - r_lbl.get_width()//2, red_rect.top - 35))
 
             # 2. Draw Text Box Backgrounds
@@ -168,7 +169,7 @@ def main_menu_loop(screen, clock):
             # 4. Draw Texts inside Boxes
             def draw_box_text(text, rect, is_active):
                 display_text = text + ("_" if is_active else "")
-                txt_surf = assets_loader.FONTS['ui'].render(display_text, True, WHITE)
+                txt_surf = assets_loader.render_text(assets_loader.FONTS['ui'], display_text, WHITE)
                 screen.blit(txt_surf, (rect.centerx - txt_surf.get_width()//2, rect.centery - txt_surf.get_height()//2))
 
             draw_box_text(duration_input_text, dur_rect, active_input == "duration")
@@ -176,7 +177,7 @@ def main_menu_loop(screen, clock):
             draw_box_text(red_name, red_rect, active_input == "red_name")
             
             # 5. Instructions & Buttons
-            inst = assets_loader.FONTS['body'].render("Press ENTER or click PLAY to Start Match", True, ORANGE)
+            inst = assets_loader.render_text(assets_loader.FONTS['body'], "Press ENTER or click PLAY to Start Match", ORANGE)
             screen.blit(inst, (WIDTH//2 - inst.get_width()//2, 350))
 
             btn_play.draw(screen)
@@ -218,15 +219,15 @@ def main_menu_loop(screen, clock):
                     ball_img = pygame.transform.scale(ball_img, (64, 64))
                     screen.blit(ball_img, (draw_rect.centerx - 32, draw_rect.top + 40))
                 
-                name_surf = assets_loader.FONTS['ui'].render(mode['name'], True, WHITE)
+                name_surf = assets_loader.render_text(assets_loader.FONTS['ui'], mode['name'], WHITE)
                 screen.blit(name_surf, (draw_rect.centerx - name_surf.get_width()//2, draw_rect.top + 120))
                 
                 desc_words = mode['desc'].split(' ')
                 line1 = " ".join(desc_words[:len(desc_words)//2])
                 line2 = " ".join(desc_words[len(desc_words)//2:])
                 
-                d1 = assets_loader.FONTS['body'].render(line1, True, LIGHT_GRAY)
-                d2 = assets_loader.FONTS['body'].render(line2, True, LIGHT_GRAY)
+                d1 = assets_loader.render_text(assets_loader.FONTS['body'], line1, LIGHT_GRAY)
+                d2 = assets_loader.render_text(assets_loader.FONTS['body'], line2, LIGHT_GRAY)
                 screen.blit(d1, (draw_rect.centerx - d1.get_width()//2, draw_rect.top + 180))
                 screen.blit(d2, (draw_rect.centerx - d2.get_width()//2, draw_rect.top + 210))
             
@@ -245,11 +246,11 @@ def main_menu_loop(screen, clock):
             ]
             for line in lines:
                 if "PLAYER 1" in line:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, BLUE)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, BLUE)
                 elif "PLAYER 2" in line:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, RED)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, RED)
                 else:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, LIGHT_GRAY)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, LIGHT_GRAY)
                 screen.blit(surf, (WIDTH//2 - surf.get_width()//2, y))
                 if line == "":
                     y += 30
@@ -269,7 +270,7 @@ def main_menu_loop(screen, clock):
                 "Good luck!"
             ]
             for line in rules:
-                surf = assets_loader.FONTS['body'].render(line, True, LIGHT_GRAY)
+                surf = assets_loader.render_text(assets_loader.FONTS['body'], line, LIGHT_GRAY)
                 screen.blit(surf, (230, y))
                 y += 40
             btn_back.draw(screen)
@@ -378,5 +379,5 @@ def main_menu_loop(screen, clock):
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     state = "MAIN"
 
-        pygame.display.flip()
+        flip(screen)
         clock.tick(60)
\ No newline at end of file
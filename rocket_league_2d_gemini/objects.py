@@ -62,15 +62,10 @@ class Car:
         self.y = clamp(self.y, self.radius, HEIGHT - self.radius)
 
     def draw(self, surf):
-        texture = assets_loader.GRAPHICS.get(self.texture_key)
-        if texture:
-            angle = math.degrees(math.atan2(-self.vy, self.vx))
-            rotated_img = pygame.transform.rotate(texture, angle)
-            rect = rotated_img.get_rect(center=(int(self.x), int(self.y)))
-            surf.blit(rotated_img, rect)
-        else:
-            pygame.draw.circle(surf, self.color, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(surf, BLACK, (int(self.x), int(self.y)), 6)
+        if assets_loader.draw_rotated(surf, self.texture_key, math.degrees(math.atan2(-self.vy, self.vx)), self.x, self.y):
+            return
+        img, (ox, oy) = assets_loader.get_disc(self.color, self.radius, BLACK)
+        surf.blit(img, (int(self.x) + ox, int(self.y) + oy))
 
 class Goalkeeper(Car):
     def __init__(self, x, y, color, side, texture_key, friction=CAR_FRICTION):
@@ -125,13 +120,10 @@ class Ball:
         self.angle = (self.angle + self.ang_vel) % 360
 
     def draw(self, surf):
-        texture = assets_loader.GRAPHICS.get(self.texture_key)
+        angle = self.angle if assets_loader.BALL_SPIN else 0
         # Fallback to standard ball if specific texture not found
-        if not texture: texture = assets_loader.GRAPHICS.get('ball')
+        if assets_loader.draw_rotated(surf, self.texture_key, angle, self.x, self.y): return
+        if assets_loader.draw_rotated(surf, 'ball', angle, self.x, self.y): return
 
-        if texture:
-            rotated_img = pygame.transform.rotate(texture, self.angle)
-            new_rect = rotated_img.get_rect(center=(int(self.x), int(self.y)))
-            surf.blit(rotated_img, new_rect)
-        else:
-            pygame.draw.circle(surf, ORANGE, (int(self.x), int(self.y)), self.radius)
\ No newline at end of file
+        img, (ox, oy) = assets_loader.get_disc(ORANGE, self.radius)
+        surf.blit(img, (int(self.x) + ox, int(self.y) + oy))
\ No newline at end of file
@@ -5,30 +5,83 @@ from settings import *
 import assets_loader
 from objects import Car, Goalkeeper, Ball
 from physics import resolve_car_ball, resolve_car_car
+from renderer import make_renderer, entity_rect
+from particles import MatchEffects
+from profiler import FrameProfiler
+from quality import QualityGovernor
+from replay import Replay
+
+# Area the HUD text can cover (redrawn every frame by the dirty-rect renderer)
+HUD_RECT = pygame.Rect(0, 0, WIDTH, 130)
+
+# Baked static field (texture or fallback markings, plus goals), one per mode
+BACKGROUNDS = {}
+
+def get_background(screen, mode_config):
+    """ Opaque field for the mode, rebuilt when the window size changes """
+    field_tex_key = mode_config.get('field_texture', 'field')
+    key = (field_tex_key, screen.get_size())
+    bg = BACKGROUNDS.get(key)
+    if bg is None:
+        # Stale sizes are never drawn again
+        for old in [k for k in BACKGROUNDS if k[1] != key[1]]: del BACKGROUNDS[old]
+        bg = pygame.Surface(screen.get_size())
+        # Draw Field
+        field_img = assets_loader.GRAPHICS.get(field_tex_key)
+        if field_img:
+            bg.blit(field_img, (0,0))
+        else:
+            # Fallback Color
+            bg_col = mode_config.get('bg_color', FIELD_COLOR_GRASS)
+            bg.fill(bg_col)
+            pygame.draw.rect(bg, WHITE, (0, 0, WIDTH, HEIGHT), 3)
+            pygame.draw.line(bg, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3)
+            pygame.draw.circle(bg, WHITE, (WIDTH//2, HEIGHT//2), 70, 3)
+
+        # Draw Goal Boxes
+        pygame.draw.rect(bg, LIGHT_GRAY, (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+        pygame.draw.rect(bg, LIGHT_GRAY, (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+        bg = bg.convert()
+        BACKGROUNDS[key] = bg
+    return bg
+
+# Prebuilt full-screen overlays: {(state, text): Surface}
+OVERLAYS = {}
+
+def get_overlay(state, text=""):
+    """ Dimmed layer with the PAUSED / GAMEOVER text, built once per (state, text) """
+    key = (state, text)
+    layer = OVERLAYS.get(key)
+    if layer is None:
+        if state == "PAUSED":
+            fill, lines = GRAY_TRANSPARENT, (('title', "PAUSED", WHITE, 200),
+                                             ('ui', "Press [P] to Resume", WHITE, 300),
+                                             ('body', "[M] Menu   [R] Restart   [Q] Quit", ORANGE, 380))
+        elif state == "GAMEOVER":
+            fill, lines = GRAY_TRANSPARENT, (('title', "GAME OVER", WHITE, 200),
+                                             ('header', text, ORANGE, 300),
+                                             ('ui', "[R] Restart   [M] Menu", GREEN, 400))
+        layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        layer.fill(fill)
+        for font_key, line, color, y in lines:
+            surf = assets_loader.render_text(assets_loader.FONTS[font_key], line, color)
+            layer.blit(surf, (WIDTH//2 - surf.get_width()//2, y))
+        layer = layer.convert_alpha()
+        OVERLAYS[key] = layer
+    return layer
 
 def draw_hud(screen, score, time_left, winner_text=""):
     # Score
-    score_txt = assets_loader.FONTS['header'].render(f"{score[0]} - {score[1]}", True, WHITE)
+    score_txt = assets_loader.render_text(assets_loader.FONTS['header'], f"{score[0]} - {score[1]}", WHITE)
     screen.blit(score_txt, (WIDTH//2 - score_txt.get_width()//2, 20))
     
     # Timer
     col = RED if time_left < 10 else WHITE
-    timer_txt = assets_loader.FONTS['hud'].render(f"{int(time_left)}", True, col)
+    timer_txt = assets_loader.render_text(assets_loader.FONTS['hud'], f"{int(time_left)}", col)
     screen.blit(timer_txt, (WIDTH//2 - timer_txt.get_width()//2, 80))
     
     if winner_text:
-        ov = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        ov.fill(GRAY_TRANSPARENT)
-        screen.blit(ov, (0,0))
-        
-        t = assets_loader.FONTS['title'].render("GAME OVER", True, WHITE)
-        screen.blit(t, (WIDTH//2 - t.get_width()//2, 200))
-        
-        w = assets_loader.FONTS['header'].render(winner_text, True, ORANGE)
-        screen.blit(w, (WIDTH//2 - w.get_width()//2, 300))
-        
-        i = assets_loader.FONTS['ui'].render("[R] Restart   [M] Menu", True, GREEN)
-        screen.blit(i, (WIDTH//2 - i.get_width()//2, 400))
+        screen.blit(get_overlay("GAMEOVER", winner_text), (0,0))
 
 async def run_match(screen, clock, mode_config):
     """ 
@@ -40,7 +93,6 @@ async def run_match(screen, clock, mode_config):
     friction_car = mode_config['friction_car']
     friction_ball = mode_config['friction_ball']
     ball_tex = mode_config['ball_texture']
-    field_tex_key = mode_config.get('field_texture', 'field')
     duration = mode_config['duration']
     
     # 2. Init Objects
@@ -67,11 +119,25 @@ async def run_match(screen, clock, mode_config):
     goal_timer = 0
     game_state = "PLAYING"
     winner_text = ""
+    # Paused / game over frames don't change: composited once, then reused
+    frozen_state = None
+    frozen_frame = None
+    renderer = make_renderer(screen, RENDERER)
+    screen = renderer.target    # The display Surface, or the SDL2 texture target
+    effects = MatchEffects()
+    governor = QualityGovernor(effects) if QUALITY_GOVERNOR else None
+    profiler = FrameProfiler(screen) if SHOW_FPS else None
+    if profiler: screen = profiler.target  # Counts the blits
+    replay = Replay(all_cars, ball)
 
     assets_loader.play_music("GAME")
+    last_ticks = pygame.time.get_ticks()
 
     while True:
         current_ticks = pygame.time.get_ticks()
+        if profiler: profiler.start()
+        dt_ms = current_ticks - last_ticks
+        last_ticks = current_ticks
         
         # --- INPUT ---
         for event in pygame.event.get():
@@ -83,6 +149,8 @@ async def run_match(screen, clock, mode_config):
                     if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
                         game_state = "PAUSED"
                         paused_at_ticks = current_ticks
+                    elif replay.active:
+                        replay.stop()   # Any other key skips the replay
                 
                 elif game_state == "PAUSED":
                     if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
@@ -97,6 +165,12 @@ async def run_match(screen, clock, mode_config):
                     elif event.key == pygame.K_r: return 'RESTART'
                     elif event.key == pygame.K_q: return 'QUIT'
 
+        if profiler: profiler.mark('input')
+
+        # The match clock stops for the replay (it runs through the GOAL! banner as before)
+        if game_state == "PLAYING" and replay.active:
+            total_pause_duration += dt_ms
+
         # --- UPDATE ---
         time_left = 0
         if game_state == "PLAYING" or game_state == "GAMEOVER":
@@ -110,6 +184,7 @@ async def run_match(screen, clock, mode_config):
                 else: winner_text = "MATCH DRAW!"
 
         if game_state == "PLAYING":
+            effects.update()
             keys = pygame.key.get_pressed()
             p1.handle(keys); p2.handle(keys)
             
@@ -123,63 +198,81 @@ async def run_match(screen, clock, mode_config):
                 for i in range(len(all_cars)):
                     for j in range(i + 1, len(all_cars)):
                         resolve_car_car(all_cars[i], all_cars[j])
+                effects.boost_trail(p1); effects.boost_trail(p2)
 
                 # Goal Check
                 if ball.x - ball.radius < 0 and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
                     score[1] += 1; goal_timer = 90
+                    effects.goal_burst(0, ball.y, 1)
                     if assets_loader.SOUNDS['goal']: assets_loader.SOUNDS['goal'].play()
                 elif ball.x + ball.radius > WIDTH and GOAL_TOP_Y < ball.y < GOAL_BOTTOM_Y:
                     score[0] += 1; goal_timer = 90
+                    effects.goal_burst(WIDTH, ball.y, 0)
                     if assets_loader.SOUNDS['goal']: assets_loader.SOUNDS['goal'].play()
+                replay.record()
+            elif replay.active:
+                replay.step()   # Holds goal_timer at 1 until the replay ends or is skipped
             else:
                 goal_timer -= 1
+                if goal_timer == 1: replay.start()  # After the GOAL! banner
                 if goal_timer == 0:
+                    replay.clear()
                     ball.reset()
                     p1.x, p1.y = 200, HEIGHT//2; p1.vx=p1.vy=0
                     p2.x, p2.y = WIDTH-200, HEIGHT//2; p2.vx=p2.vy=0
                     gk1.x, gk1.y = 50, HEIGHT//2; gk1.vx=gk1.vy=0
                     gk2.x, gk2.y = WIDTH-50, HEIGHT//2; gk2.vx=gk2.vy=0
 
+        if profiler: profiler.mark('sim')
+
         # --- DRAWING ---
-        # Draw Field
-        field_img = assets_loader.GRAPHICS.get(field_tex_key)
-        if field_img:
-            screen.blit(field_img, (0,0))
+        freeze = game_state if game_state != "PLAYING" else None
+        # Overlay frames, and the first one after them, go out whole
+        if freeze or frozen_state: renderer.invalidate()
+        if frozen_frame and freeze == frozen_state:
+            screen.blit(frozen_frame, (0,0))
         else:
-            # Fallback Color
-            bg_col = mode_config.get('bg_color', FIELD_COLOR_GRASS)
-            screen.fill(bg_col)
-            pygame.draw.rect(screen, WHITE, (0, 0, WIDTH, HEIGHT), 3)
-            pygame.draw.line(screen, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3)
-            pygame.draw.circle(screen, WHITE, (WIDTH//2, HEIGHT//2), 70, 3)
+            # Field and goal boxes, baked once per mode
+            renderer.begin(get_background(screen, mode_config))
+            renderer.mark(effects.draw(screen))
 
-        # Draw Goal Boxes
-        pygame.draw.rect(screen, LIGHT_GRAY, (0, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
-        pygame.draw.rect(screen, LIGHT_GRAY, (WIDTH-60, GOAL_TOP_Y, 60, GOAL_WIDTH), 3)
+            # Entities
+            ball.draw(screen)
+            renderer.mark(entity_rect(ball))
+            for car in all_cars:
+                car.draw(screen)
+                renderer.mark(entity_rect(car))
+            if profiler: profiler.mark('sprites')
 
-        # Entities
-        ball.draw(screen)
-        for car in all_cars: car.draw(screen)
+            # HUD / Overlays
+            renderer.mark(HUD_RECT)
+            draw_hud(screen, score, time_left, winner_text if game_state == "GAMEOVER" else "")
 
-        # HUD / Overlays
-        draw_hud(screen, score, time_left, winner_text if game_state == "GAMEOVER" else "")
-        
-        if goal_timer > 0 and game_state == "PLAYING":
-            gm = assets_loader.FONTS['hud_big'].render("GOAL!", True, ORANGE)
-            screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40))
-            
-        if game_state == "PAUSED":
-            ov = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            ov.fill(GRAY_TRANSPARENT)
-            screen.blit(ov, (0,0))
-            t = assets_loader.FONTS['title'].render("PAUSED", True, WHITE)
-            screen.blit(t, (WIDTH//2 - t.get_width()//2, 200))
-            i = assets_loader.FONTS['ui'].render("Press [P] to Resume", True, WHITE)
-            screen.blit(i, (WIDTH//2 - i.get_width()//2, 300))
-            m = assets_loader.FONTS['body'].render("[M] Menu   [R] Restart   [Q] Quit", True, ORANGE)
-            screen.blit(m, (WIDTH//2 - m.get_width()//2, 380))
-
-        pygame.display.flip()
+            if replay.active and game_state == "PLAYING":
+                rp = assets_loader.render_text(assets_loader.FONTS['hud'], "REPLAY", ORANGE)
+                renderer.mark(screen.blit(rp, (WIDTH//2 - rp.get_width()//2, HEIGHT - 100)))
+                hint = assets_loader.render_text(assets_loader.FONTS['body'], "Press any key to skip", WHITE)
+                renderer.mark(screen.blit(hint, (WIDTH//2 - hint.get_width()//2, HEIGHT - 55)))
+
+            elif goal_timer > 0 and game_state == "PLAYING":
+                gm = assets_loader.render_text(assets_loader.FONTS['hud_big'], "GOAL!", ORANGE)
+                renderer.mark(screen.blit(gm, (WIDTH//2 - gm.get_width()//2, HEIGHT//2 - 40)))
+
+            if game_state == "PAUSED":
+                screen.blit(get_overlay("PAUSED"), (0,0))
+
+            frozen_state = freeze
+            # Taken before the profiler panel, which is drawn fresh on top of it
+            frozen_frame = renderer.snapshot() if freeze else None
+
+        if profiler:
+            renderer.mark(profiler.draw(clock.get_fps()))
+            profiler.mark('hud')
+
+        renderer.present()
+        if profiler: profiler.end()
+        if governor and governor.update(clock.get_rawtime()):
+            renderer = governor.renderer(renderer)
         clock.tick(FPS)
 
         await asyncio.sleep(0)
\ No newline at end of file
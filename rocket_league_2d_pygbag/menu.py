@@ -4,6 +4,7 @@ import pygame
 import math
 from settings import *
 import assets_loader
+from renderer import flip
 
 # --- UI ELEMENT CLASSES ---
 class Button:
@@ -24,8 +25,8 @@ class Button:
         font = assets_loader.FONTS['ui']
         
         # Draw Text with Shadow
-        shadow_surf = font.render(self.text, True, BLACK)
-        text_surf = font.render(self.text, True, color)
+        shadow_surf = assets_loader.render_text(font, self.text, BLACK)
+        text_surf = assets_loader.render_text(font, self.text, color)
         
         # Scaling
         if abs(self.scale - 1.0) > 0.01:
@@ -123,7 +124,7 @@ async def main_menu_loop(screen, clock):
             elif state == "HELP": title_text = "HOW TO PLAY"
             elif state == "DURATION": title_text = "MATCH SETUP"
             
-            t_surf = assets_loader.FONTS['title'].render(title_text, True, WHITE)
+            t_surf = assets_loader.render_text(assets_loader.FONTS['title'], title_text, WHITE)
             screen.blit(t_surf, (WIDTH//2 - t_surf.get_width()//2, 50))
 
         # --- CONTENT ---
@@ -131,22 +132,22 @@ async def main_menu_loop(screen, clock):
         if state == "MAIN":
             for btn in btns_main:
                 btn.draw(screen)
-            v_surf = assets_loader.FONTS['body'].render("v2.2 Stable", True, LIGHT_GRAY)
+            v_surf = assets_loader.render_text(assets_loader.FONTS['body'], "v2.2 Stable", LIGHT_GRAY)
             screen.blit(v_surf, (WIDTH - 120, HEIGHT - 30))
 
         elif state == "DURATION":
-            lbl = assets_loader.FONTS['ui'].render("ENTER MATCH DURATION (Seconds):", True, BLUE)
+            lbl = assets_loader.render_text(assets_loader.FONTS['ui'], "ENTER MATCH DURATION (Seconds):", BLUE)
             screen.blit(lbl, (WIDTH//2 - lbl.get_width()//2, HEIGHT//2 - 100))
             
             input_rect = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 - 40, 300, 80)
             pygame.draw.rect(screen, (0,0,0,150), input_rect, border_radius=10)
             pygame.draw.rect(screen, GREEN, input_rect, 3, border_radius=10)
             
-            #txt_surf = assets_loader.FONTS['title'].render(duration_input_text + "_", True, WHITE)
-            txt_surf = assets_loader.FONTS['title'].render(duration_input_text, True, WHITE)
+            #txt_surf = assets_loader.render_text(assets_loader.FONTS['title'], duration_input_text + "_", WHITE)
+            txt_surf = assets_loader.render_text(assets_loader.FONTS['title'], duration_input_text, WHITE)
             screen.blit(txt_surf, (input_rect.centerx - txt_surf.get_width()//2, input_rect.centery - txt_surf.get_height()//2))
             
-            inst = assets_loader.FONTS['body'].render("Press ENTER or click PLAY to Start Match", True, ORANGE)
+            inst = assets_loader.render_text(assets_loader.FONTS['body'], "Press ENTER or click PLAY to Start Match", ORANGE)
             screen.blit(inst, (WIDTH//2 - inst.get_width()//2, HEIGHT//2 + 60))
 
             btn_play.draw(screen)
@@ -188,19 +189,19 @@ async def main_menu_loop(screen, clock):
                     ball_img = pygame.transform.scale(ball_img, (64, 64))
                     screen.blit(ball_img, (draw_rect.centerx - 32, draw_rect.top + 40))
                 
-                name_surf = assets_loader.FONTS['ui'].render(mode['name'], True, WHITE)
+                name_surf = assets_loader.render_text(assets_loader.FONTS['ui'], mode['name'], WHITE)
                 screen.blit(name_surf, (draw_rect.centerx - name_surf.get_width()//2, draw_rect.top + 120))
                 
                 desc_words = mode['desc'].split(' ')
                 line1 = " ".join(desc_words[:len(desc_words)//2])
                 line2 = " ".join(desc_words[len(desc_words)//2:])
                 
-                d1 = assets_loader.FONTS['body'].render(line1, True, LIGHT_GRAY)
-                d2 = assets_loader.FONTS['body'].render(line2, True, LIGHT_GRAY)
+                d1 = assets_loader.render_text(assets_loader.FONTS['body'], line1, LIGHT_GRAY)
+                d2 = assets_loader.render_text(assets_loader.FONTS['body'], line2, LIGHT_GRAY)
                 screen.blit(d1, (draw_rect.centerx - d1.get_width()//2, draw_rect.top + 180))
                 screen.blit(d2, (draw_rect.centerx - d2.get_width()//2, draw_rect.top + 210))
 
-            #info = assets_loader.FONTS['body'].render("Click to Select", True, WHITE)
+            #info = assets_loader.render_text(assets_loader.FONTS['body'], "Click to Select", WHITE)
             #screen.blit(info, (WIDTH//2 - info.get_width()//2, HEIGHT - 150))
             
             btn_back.draw(screen)
@@ -218,11 +219,11 @@ async def main_menu_loop(screen, clock):
             ]
             for line in lines:
                 if "PLAYER 1" in line:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, BLUE)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, BLUE)
                 elif "PLAYER 2" in line:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, RED)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, RED)
                 else:
-                    surf = assets_loader.FONTS['ui_small'].render(line, True, LIGHT_GRAY)
+                    surf = assets_loader.render_text(assets_loader.FONTS['ui_small'], line, LIGHT_GRAY)
                 screen.blit(surf, (WIDTH//2 - surf.get_width()//2, y))
                 if line == "":
                     y += 30
@@ -242,7 +243,7 @@ async def main_menu_loop(screen, clock):
                 "Good luck!"
             ]
             for line in rules:
-                surf = assets_loader.FONTS['body'].render(line, True, LIGHT_GRAY)
+                surf = assets_loader.render_text(assets_loader.FONTS['body'], line, LIGHT_GRAY)
                 screen.blit(surf, (230, y))
                 y += 40
             btn_back.draw(screen)
@@ -324,7 +325,7 @@ async def main_menu_loop(screen, clock):
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     state = "MAIN"
 
-        pygame.display.flip()
+        flip(screen)
         clock.tick(60)
 
         await asyncio.sleep(0)
\ No newline at end of file
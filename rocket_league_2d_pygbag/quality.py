@@ -0,0 +1,80 @@
+# quality.py
+import assets_loader
+from settings import (FPS, ROTATION_STEPS, ROTATION_STEPS_LOW, PARTICLE_DENSITY_LOW, QUALITY_WINDOW,
+                      QUALITY_HIGH, QUALITY_LOW, QUALITY_COOLDOWN, QUALITY_RECOVER)
+from renderer import SurfaceRenderer, DirtyRectRenderer
+
+# --- ADAPTIVE QUALITY ---
+# Physics runs once per frame, so a slow machine slows the whole match down.
+# The governor keeps a rolling average of the work per frame (clock.get_rawtime:
+# the frame without the clock.tick sleep) against the frame budget. Over
+# QUALITY_HIGH of the budget it turns the next effect in QUALITY_STEPS off;
+# after QUALITY_RECOVER frames under QUALITY_LOW it turns the last one back on.
+#
+# The last step trades the full-frame redraw for dirty rects (fewer pixels
+# pushed per frame); it does nothing when a dirty or SDL2 renderer is in use.
+
+# (what, how it is stepped down) in the order they go
+QUALITY_STEPS = (('ball spin', "off"), ('rotation cache', f"{ROTATION_STEPS_LOW} angles"),
+                 ('particles', f"{PARTICLE_DENSITY_LOW:.0%}"), ('text antialiasing', "off"),
+                 ('redraw', "dirty rects"))
+
+class QualityGovernor:
+    """ Steps effects down (and back up) in QUALITY_STEPS order to hold the frame rate """
+    def __init__(self, effects):
+        self.effects = effects
+        self.budget = 1000 / FPS
+        self.samples = [0.0] * QUALITY_WINDOW   # Ring buffer of work times (ms)
+        self.total = 0.0
+        self.frame = 0
+        self.level = 0              # Steps taken down
+        self.last_change = 0
+        self.calm_since = None      # Frame the average went under QUALITY_LOW
+        self.full_redraw = None     # The SurfaceRenderer swapped out at the last step
+        self.apply()
+
+    def apply(self):
+        level = self.level
+        assets_loader.BALL_SPIN = level < 1
+        assets_loader.set_rotation_steps(ROTATION_STEPS if level < 2 else ROTATION_STEPS_LOW)
+        self.effects.density = 1.0 if level < 3 else PARTICLE_DENSITY_LOW
+        assets_loader.TEXT_ANTIALIAS = level < 4
+
+    def renderer(self, renderer):
+        """ The renderer for the current level: swaps full redraws for dirty rects at the last step """
+        if self.level >= len(QUALITY_STEPS) and type(renderer) is SurfaceRenderer:
+            self.full_redraw = renderer
+            return DirtyRectRenderer(renderer.screen)
+        if self.level < len(QUALITY_STEPS) and self.full_redraw:
+            renderer, self.full_redraw = self.full_redraw, None
+        return renderer
+
+    def update(self, work_ms):
+        """ Takes one frame's work time; returns True when the level changed """
+        i = self.frame % QUALITY_WINDOW
+        self.total += work_ms - self.samples[i]
+        self.samples[i] = work_ms
+        self.frame += 1
+        if self.frame < QUALITY_WINDOW: return False
+        average = self.total / QUALITY_WINDOW
+        if average > self.budget * QUALITY_HIGH:
+            self.calm_since = None
+            if self.level < len(QUALITY_STEPS) and self.frame - self.last_change >= QUALITY_COOLDOWN:
+                self.level += 1
+                name, low = QUALITY_STEPS[self.level - 1]
+                return self._changed(average, f"{name} -> {low}")
+        elif average < self.budget * QUALITY_LOW:
+            if self.calm_since is None: self.calm_since = self.frame
+            if self.level > 0 and self.frame - self.calm_since >= QUALITY_RECOVER:
+                self.level -= 1
+                self.calm_since = self.frame
+                return self._changed(average, f"{QUALITY_STEPS[self.level][0]} restored")
+        else:
+            self.calm_since = None
+        return False
+
+    def _changed(self, average, what):
+        self.last_change = self.frame
+        self.apply()
+        print(f"[QUALITY] level {self.level}: {what} (frame work {average:.1f} ms of {self.budget:.1f} ms)")
+        return True
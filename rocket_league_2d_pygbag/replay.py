@@ -0,0 +1,84 @@
+# replay.py
+from array import array
+from settings import FPS, REPLAY_SECONDS, REPLAY_SHOWN, REPLAY_SPEED
+
+# --- INSTANT REPLAY ---
+# Every played tick writes the cars' and the ball's state into one slot of a
+# ring buffer allocated up front (array('d'), REPLAY_SECONDS deep), so
+# recording never grows a list or builds a dict. After the GOAL! banner the
+# last REPLAY_SHOWN seconds are played back at REPLAY_SPEED, interpolating
+# between the recorded ticks, by writing the states back into the entities
+# (they sit still during the goal pause anyway). Stopping puts back the last
+# recorded state, i.e. where play froze.
+
+FIELDS = 5      # x, y, vx, vy, angle
+
+class Replay:
+    """ Ring buffer of recent entity states and their slow motion playback """
+    def __init__(self, cars, ball):
+        self.cars = cars
+        self.ball = ball
+        self.size = int(REPLAY_SECONDS * FPS)
+        self.stride = (len(cars) + 1) * FIELDS
+        self.buf = array('d', bytes(8 * self.size * self.stride))
+        self.head = 0           # Slot the next tick goes to
+        self.count = 0          # Ticks recorded (up to size)
+        self.active = False
+        self.pos = 0.0          # Playback position, in ticks from the oldest recorded
+        self.end = 0
+
+    def record(self):
+        """ Stores this tick's state (in place, nothing allocated) """
+        buf = self.buf
+        o = self.head * self.stride
+        for car in self.cars:
+            buf[o] = car.x; buf[o+1] = car.y; buf[o+2] = car.vx; buf[o+3] = car.vy
+            o += FIELDS
+        ball = self.ball
+        buf[o] = ball.x; buf[o+1] = ball.y; buf[o+2] = ball.vx; buf[o+3] = ball.vy; buf[o+4] = ball.angle
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size: self.count += 1
+
+    def clear(self):
+        """ Forgets the recording (kickoff: the next replay shouldn't reach back past it) """
+        self.count = 0
+
+    def start(self):
+        """ Starts playback of the last REPLAY_SHOWN seconds; False if there is too little recorded """
+        if self.count < 2: return False
+        self.pos = float(max(0, self.count - int(REPLAY_SHOWN * FPS)))
+        self.end = self.count - 1
+        self.active = True
+        self._apply(self.pos)
+        return True
+
+    def step(self):
+        """ Advances playback one frame; stops at the end """
+        self.pos += REPLAY_SPEED
+        if self.pos >= self.end: self.stop()
+        else: self._apply(self.pos)
+
+    def stop(self):
+        """ Ends playback (finished or skipped) and puts the frozen state back """
+        self.active = False
+        self._apply(self.end)
+
+    def _apply(self, pos):
+        i = int(pos)
+        t = pos - i
+        buf = self.buf
+        a = ((self.head - self.count + i) % self.size) * self.stride
+        b = ((self.head - self.count + min(i + 1, self.end)) % self.size) * self.stride
+        for car in self.cars:
+            car.x = buf[a] + (buf[b] - buf[a]) * t
+            car.y = buf[a+1] + (buf[b+1] - buf[a+1]) * t
+            car.vx = buf[a+2] + (buf[b+2] - buf[a+2]) * t
+            car.vy = buf[a+3] + (buf[b+3] - buf[a+3]) * t
+            a += FIELDS; b += FIELDS
+        ball = self.ball
+        ball.x = buf[a] + (buf[b] - buf[a]) * t
+        ball.y = buf[a+1] + (buf[b+1] - buf[a+1]) * t
+        ball.vx = buf[a+2] + (buf[b+2] - buf[a+2]) * t
+        ball.vy = buf[a+3] + (buf[b+3] - buf[a+3]) * t
+        turn = (buf[b+4] - buf[a+4] + 180) % 360 - 180     # Shortest way round
+        ball.angle = (buf[a+4] + turn * t) % 360